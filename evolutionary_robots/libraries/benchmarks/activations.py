@@ -0,0 +1,111 @@
+"""Docstring for activations.py
+
+This module benchmarks the activation functions of the
+neural_networks package, for batches of 1 to 10^6 inputs
+of a layer of 4 neurons. The time per call is reported
+for calculate_activation allocating its output, and with
+an out buffer, and for the expression of the previous
+versions, beta * (x - theta) with temporaries. For the fast
+approximations, the largest absolute error against the
+exact activation is reported.
+
+Usage, from the benchmarks directory:
+	python activations.py --dtype float32
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import time
+import numpy as np
+
+from neural_networks import activation_functions
+
+ACTIVATIONS = ["IdentityActivation", "LinearActivation", "StepActivation", "SigmoidActivation",
+			   "TanhActivation", "ReluActivation", "MaximumActivation", "FastSigmoidActivation",
+			   "FastTanhActivation"]
+
+# The exact activation of each approximation
+EXACT = {"FastSigmoidActivation": "SigmoidActivation", "FastTanhActivation": "TanhActivation"}
+
+# The expressions of the previous versions, allocating a temporary for each operation
+EXPRESSIONS = {
+	"LinearActivation": lambda x, beta, theta: beta * (x - theta),
+	"SigmoidActivation": lambda x, beta, theta: 1 / (1 + np.exp(-(beta * (x - theta)))),
+	"TanhActivation": lambda x, beta, theta: np.tanh(beta * (x - theta)),
+	"ReluActivation": lambda x, beta, theta: np.maximum(beta * (x - theta), 0)
+}
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000, 1000000]
+NEURONS = 4
+
+# Time a function
+def microseconds(function, iterations):
+	"""
+	Return the best time of a call of function in
+	microseconds, over 3 repetitions
+	"""
+	best = None
+	for repetition in range(3):
+		start = time.time()
+		for iteration in range(iterations):
+			function()
+		elapsed = (time.time() - start) / iterations
+		best = elapsed if best is None else min(best, elapsed)
+
+	return best * 1e6
+
+# Run the benchmark
+def run(dtype="float64", batch_sizes=BATCH_SIZES, elements=10 ** 6):
+	"""
+	Return the microseconds per call of each activation
+	function at each batch size, with and without an out
+	buffer and as the expression of the previous versions,
+	and the error of the approximations
+	"""
+	random = np.random.RandomState(0)
+	beta = random.uniform(0.5, 2, (NEURONS, )).astype(dtype)
+	theta = random.uniform(-0.5, 0.5, (NEURONS, )).astype(dtype)
+
+	report = {}
+	for name in ACTIVATIONS:
+		activation_function = getattr(activation_functions, name)(beta, theta)
+		report[name] = {"allocate": [], "out": [], "expression": [], "error": None}
+
+		for batch_size in batch_sizes:
+			x = random.uniform(-5, 5, (batch_size, NEURONS)).astype(dtype)
+			out = np.empty_like(x)
+			iterations = min(max(elements // (batch_size * NEURONS), 3), 10000)
+
+			report[name]["allocate"].append(microseconds(lambda: activation_function.calculate_activation(x), iterations))
+			report[name]["out"].append(microseconds(lambda: activation_function.calculate_activation(x, out=out),
+													iterations))
+			if(name in EXPRESSIONS):
+				report[name]["expression"].append(microseconds(lambda: EXPRESSIONS[name](x, beta, theta), iterations))
+
+		if(name in EXACT):
+			x = np.linspace(-10, 10, 100001).astype(dtype)
+			exact = getattr(activation_functions, EXACT[name])().calculate_activation(x.astype(np.float64))
+			report[name]["error"] = float(np.max(np.abs(activation_function.__class__().calculate_activation(x) - exact)))
+
+	return report
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Time per call of each activation function")
+	parser.add_argument("--dtype", default="float64", choices=["float32", "float64"])
+	arguments = parser.parse_args()
+
+	report = run(arguments.dtype)
+
+	for method in ["allocate", "out", "expression"]:
+		print("Microseconds per call, " + method)
+		print("{: <24}".format("Batch size") + "".join("{: >11}".format(batch_size) for batch_size in BATCH_SIZES))
+		for name in ACTIVATIONS:
+			if(len(report[name][method]) == 0):
+				continue
+			print("{: <24}".format(name) + "".join("{: >11.2f}".format(value) for value in report[name][method]))
+		print("")
+
+	for name in EXACT:
+		print("{: <24} {: >12.2e}".format(name + " error", report[name]["error"]))
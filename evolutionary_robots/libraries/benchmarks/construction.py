@@ -0,0 +1,82 @@
+"""Docstring for construction.py
+
+This module benchmarks the construction of an Artificial
+Neural Network, for generated networks of 10^3 to 10^5
+layers. Each network is a random directed acyclic graph,
+each layer of 2 neurons taking input from 1 or 2 earlier
+layers, with the layers without output connected to the
+hardware. The layers are passed in a random order, so the
+order of execution differs from the order of initialization.
+
+The time of the constructor is reported, from the list of
+interface.Layer objects to a network that is ready for
+the iterations, along with the time per layer.
+
+Usage, from the benchmarks directory:
+	python construction.py --max-layers 100000 --dynamic
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import time
+import numpy as np
+
+from neural_networks.ann import ArtificialNeuralNetwork
+from neural_networks.interface import Layer
+from neural_networks.activation_functions import TanhActivation
+
+LAYERS = [1000, 10000, 100000]
+
+# A random acyclic network
+def generate_layers(number_of_layers, seed=0):
+	"""
+	Generate the interface.Layer objects of a random
+	acyclic network, in a random order
+	"""
+	random = np.random.RandomState(seed)
+	number_of_inputs = max(number_of_layers // 100, 1)
+
+	output_connections = [[] for layer in range(number_of_layers)]
+	for layer in range(number_of_inputs, number_of_layers):
+		for connection in set(random.randint(0, layer, (random.randint(1, 3), ))):
+			output_connections[connection].append("layer" + str(layer))
+
+	layer_vector = []
+	for layer in range(number_of_layers):
+		sensor = "SENSOR" if layer < number_of_inputs else ""
+		outputs = output_connections[layer] if output_connections[layer] else ["MOTORS"]
+		layer_vector.append(Layer("layer" + str(layer), 2, TanhActivation(), sensor, outputs))
+
+	return [layer_vector[index] for index in random.permutation(number_of_layers)]
+
+# Run the benchmark
+def run(layers=LAYERS, type_of_network="STATIC"):
+	"""
+	Return the seconds of the construction of a network
+	of each number of layers
+	"""
+	report = {}
+	for number_of_layers in layers:
+		layer_vector = generate_layers(number_of_layers)
+
+		start = time.time()
+		ArtificialNeuralNetwork(layer_vector, type_of_network)
+		report[number_of_layers] = time.time() - start
+
+	return report
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Construction time of large networks")
+	parser.add_argument("--max-layers", type=int, default=100000)
+	parser.add_argument("--dynamic", action="store_true")
+	arguments = parser.parse_args()
+
+	layers = [number_of_layers for number_of_layers in LAYERS if number_of_layers <= arguments.max_layers]
+	report = run(layers, "DYNAMIC" if arguments.dynamic else "STATIC")
+
+	print("{: <12} {: >12} {: >18}".format("Layers", "Seconds", "Microseconds/layer"))
+	for number_of_layers in layers:
+		seconds = report[number_of_layers]
+		print("{: <12} {: >12.3f} {: >18.1f}".format(number_of_layers, seconds, seconds / number_of_layers * 1e6))
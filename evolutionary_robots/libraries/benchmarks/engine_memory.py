@@ -0,0 +1,88 @@
+"""Docstring for engine_memory.py
+
+This module benchmarks the memory of the in place
+population engine over many generations. The resident
+memory is sampled while the engine generates the next
+generations of a large population, and should stay flat
+after the first generation.
+
+Usage, from the benchmarks directory:
+	python engine_memory.py --population-size 100000 --chromosome-length 1000
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import time
+import numpy as np
+
+from genetic_algorithm.engine import PopulationEngine
+
+# Current resident memory
+def resident_memory():
+	"""
+	Return the current resident memory of the process
+	in MB, the peak resident memory where /proc is not
+	available
+	"""
+	try:
+		with open('/proc/self/statm') as statm:
+			pages = int(statm.read().split()[1])
+
+		import resource
+		return pages * resource.getpagesize() / (1024.0 * 1024.0)
+	except IOError:
+		import resource
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		if(sys.platform == "darwin"):
+			return peak / (1024.0 * 1024.0)
+
+		return peak / 1024.0
+
+# Run the benchmark
+def run(population_size=10000, chromosome_length=1000, number_of_generations=2000,
+		number_of_elites=2, samples=10):
+	"""
+	Run the engine for number_of_generations and return
+	the generation, resident memory and elapsed time at
+	samples points
+	"""
+	engine = PopulationEngine(population_size, chromosome_length, number_of_elites, 0.01)
+	engine.load(np.random.uniform(0, 1, (population_size, chromosome_length)))
+
+	# A cheap fitness, the engine is being measured
+	fitness_vector = np.empty(population_size)
+	interval = max(number_of_generations // samples, 1)
+
+	report = []
+	start = time.time()
+	for generation in range(1, number_of_generations + 1):
+		np.sum(engine.population, axis=1, out=fitness_vector)
+		engine.step(fitness_vector)
+
+		if(generation == 1 or generation % interval == 0):
+			report.append((generation, resident_memory(), time.time() - start))
+
+	return report
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Memory of the in place population engine")
+	parser.add_argument("--population-size", type=int, default=10000)
+	parser.add_argument("--chromosome-length", type=int, default=1000)
+	parser.add_argument("--generations", type=int, default=2000)
+	parser.add_argument("--tolerance", type=float, default=0.05,
+						help="allowed relative growth of memory after the first generation")
+	arguments = parser.parse_args()
+
+	report = run(arguments.population_size, arguments.chromosome_length, arguments.generations)
+
+	print("{: <12} {: >16} {: >16}".format("Generation", "Resident MB", "Seconds"))
+	for generation, memory, seconds in report:
+		print("{: <12} {: >16.1f} {: >16.2f}".format(generation, memory, seconds))
+
+	growth = report[-1][1] / report[0][1] - 1
+	print("Memory growth after the first generation: {:+.1%}".format(growth))
+	print("Generations per second: {:.2f}".format(arguments.generations / report[-1][2]))
+
+	sys.exit(1 if growth > arguments.tolerance else 0)
@@ -0,0 +1,102 @@
+"""Docstring for functions.py
+
+This module contains the standard optimization functions
+used by the benchmarks. The Genetic Algorithm generates
+chromosomes in [0, 1] and maximizes the fitness, so each
+function scales the chromosome to its usual domain and
+returns the negative of its value. The maximum fitness
+of each function is 0.
+"""
+
+import numpy as np
+
+# Scale a chromosome to a domain
+def _scale(chromosome, bound):
+	"""
+	Private function to scale the alleles from
+	[0, 1] to [-bound, bound]
+	"""
+	return (2 * np.asarray(chromosome, np.float64) - 1) * bound
+
+# Sphere Function
+def sphere(chromosome):
+	"""
+	Sphere function on [-5.12, 5.12]
+
+	Parameters
+	----------
+	chromosome: array_like
+		The alleles, ranging from 0 to 1
+
+	Returns
+	-------
+	fitness: float
+		The negative of sum(x ** 2)
+	"""
+	x = _scale(chromosome, 5.12)
+	return -np.sum(x ** 2)
+
+# Rastrigin Function
+def rastrigin(chromosome):
+	"""
+	Rastrigin function on [-5.12, 5.12]
+
+	Parameters
+	----------
+	chromosome: array_like
+		The alleles, ranging from 0 to 1
+
+	Returns
+	-------
+	fitness: float
+		The negative of 10n + sum(x ** 2 - 10cos(2 pi x))
+	"""
+	x = _scale(chromosome, 5.12)
+	return -(10 * x.shape[0] + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x)))
+
+# Rosenbrock Function
+def rosenbrock(chromosome):
+	"""
+	Rosenbrock function on [-2.048, 2.048]
+
+	Parameters
+	----------
+	chromosome: array_like
+		The alleles, ranging from 0 to 1
+
+	Returns
+	-------
+	fitness: float
+		The negative of sum(100(x[i+1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2)
+	"""
+	x = _scale(chromosome, 2.048)
+	return -np.sum(100 * (x[1:] - x[:-1] ** 2) ** 2 + (1 - x[:-1]) ** 2)
+
+# Ackley Function
+def ackley(chromosome):
+	"""
+	Ackley function on [-32.768, 32.768]
+
+	Parameters
+	----------
+	chromosome: array_like
+		The alleles, ranging from 0 to 1
+
+	Returns
+	-------
+	fitness: float
+		The negative of the Ackley function
+	"""
+	x = _scale(chromosome, 32.768)
+	n = float(x.shape[0])
+	value = (-20 * np.exp(-0.2 * np.sqrt(np.sum(x ** 2) / n)) -
+			 np.exp(np.sum(np.cos(2 * np.pi * x)) / n) + 20 + np.e)
+	return -value
+
+# The functions by name
+FUNCTIONS = {
+	"sphere": sphere,
+	"rastrigin": rastrigin,
+	"rosenbrock": rosenbrock,
+	"ackley": ackley
+}
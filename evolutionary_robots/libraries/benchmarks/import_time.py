@@ -0,0 +1,119 @@
+"""Docstring for import_time.py
+
+This module measures the import time of the modules of the
+genetic_algorithm and neural_networks packages, each in a
+new interpreter, and checks it against a budget. numpy is
+imported before the timer starts, so the time is of the
+library and the dependencies it loads. The imports are
+repeated with the bytecode written, and the best time is
+reported.
+
+The optional dependencies, matplotlib for the plots and
+graphviz for visualize, are imported at their first use.
+A module that loads one of them at import fails the check,
+whatever its time.
+
+Usage, from the benchmarks directory:
+	python import_time.py --repeat 5
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import json
+import os
+import subprocess
+
+# The budget of each module, in milliseconds
+BUDGETS = {
+	"genetic_algorithm.ga": 25,
+	"genetic_algorithm.ga_nn": 25,
+	"neural_networks.ann": 25
+}
+
+# The dependencies that are imported at their first use
+LAZY_MODULES = ["matplotlib", "graphviz", "cv2", "PyQt5"]
+
+# The script run by the new interpreter
+_SCRIPT = """
+import sys
+import json
+import time
+sys.path.insert(0, {path!r})
+import numpy
+
+start = time.time()
+import {module}
+elapsed = time.time() - start
+
+print(json.dumps({{"seconds": elapsed, "lazy_modules": [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+# The libraries directory
+_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Measure the import of a module
+def measure(module, repeat=5):
+	"""
+	Return the best import time of a module in milliseconds,
+	over repeat new interpreters, and the lazy modules that
+	its import loaded
+	"""
+	script = _SCRIPT.format(path=_PATH, module=module, lazy=LAZY_MODULES)
+
+	# The bytecode is written by the first import, as in a normal run
+	environment = dict(os.environ)
+	environment.pop("PYTHONDONTWRITEBYTECODE", None)
+
+	best = None
+	lazy_modules = []
+	for repetition in range(repeat + 1):
+		output = subprocess.check_output([sys.executable, "-c", script], env=environment,
+										 cwd=os.path.dirname(_PATH))
+		result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+		lazy_modules = result["lazy_modules"]
+
+		if(repetition > 0):
+			milliseconds = result["seconds"] * 1000
+			best = milliseconds if best is None else min(best, milliseconds)
+
+	return best, lazy_modules
+
+# Check the budgets
+def check(budgets=BUDGETS, repeat=5, report=None):
+	"""
+	Measure the import of each module and return a message
+	for each module over its budget, or that loads a lazy
+	module. The measurements are added to report, if given
+	"""
+	regressions = []
+	for module in sorted(budgets.keys()):
+		milliseconds, lazy_modules = measure(module, repeat)
+		if(report is not None):
+			report[module] = {"milliseconds": milliseconds, "lazy_modules": lazy_modules}
+
+		if(milliseconds > budgets[module]):
+			regressions.append("import {} takes {:.1f} ms, budget {} ms".format(module, milliseconds, budgets[module]))
+		if(len(lazy_modules) != 0):
+			regressions.append("import {} loads {}".format(module, ", ".join(lazy_modules)))
+
+	return regressions
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Import time of the libraries against a budget")
+	parser.add_argument("--repeat", type=int, default=5)
+	arguments = parser.parse_args()
+
+	report = {}
+	regressions = check(BUDGETS, arguments.repeat, report)
+
+	print("{: <28} {: >12} {: >12}  {}".format("Module", "Milliseconds", "Budget", "Lazy modules loaded"))
+	for module in sorted(report.keys()):
+		print("{: <28} {: >12.1f} {: >12}  {}".format(module, report[module]["milliseconds"], BUDGETS[module],
+													   ", ".join(report[module]["lazy_modules"]) or "-"))
+
+	for regression in regressions:
+		print("REGRESSION " + regression)
+
+	sys.exit(1 if len(regressions) != 0 else 0)
@@ -0,0 +1,113 @@
+"""Docstring for integrators.py
+
+This module benchmarks the integrators of the Dynamic
+Layers. A Dynamic Network, a recurrent layer of 8 neurons
+with sensor input and an output layer of 2 neurons, with
+time constants between 0.05 and 1, is simulated for a
+number of seconds with each integrator and time interval.
+The output is compared with a reference simulation of a
+very small time interval, and the largest time interval
+within the tolerance is reported for each integrator,
+along with the iterations per simulated second it needs.
+
+The legacy integrator does not depend on the time interval,
+and is not benchmarked. The network has no input layer, as
+an input layer delays the sensor input by an iteration for
+every integrator.
+
+Usage, from the benchmarks directory:
+	python integrators.py --tolerance 0.001
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import numpy as np
+
+from neural_networks.ann import ArtificialNeuralNetwork
+from neural_networks.interface import Layer
+from neural_networks.activation_functions import TanhActivation
+
+# The time intervals, each divides the sampling interval
+TIME_INTERVALS = [0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5]
+SAMPLING_INTERVAL = 0.5
+
+# A Dynamic Network with a recurrent layer
+def network(integrator, time_interval, seed=0):
+	"""
+	Generate the benchmark network, with the same
+	parameters for every integrator and time interval
+	"""
+	hiddenLayer = Layer("hiddenLayer", 8, TanhActivation(), "SENSOR", ["hiddenLayer", "outputLayer"])
+	outputLayer = Layer("outputLayer", 2, TanhActivation(), "", ["MOTORS"])
+	nn = ArtificialNeuralNetwork([hiddenLayer, outputLayer], "DYNAMIC", time_interval, integrator)
+
+	random = np.random.RandomState(seed)
+	nn.load_parameters(random.uniform(-1, 1, (nn.number_of_parameters, )))
+
+	# The time constants are the first parameters of each layer
+	parameters = nn.return_parameters_as_vector()
+	parameters["hiddenLayer"][:8] = random.uniform(0.05, 1, (8, ))
+	parameters["outputLayer"][:2] = random.uniform(0.05, 1, (2, ))
+
+	return nn
+
+# Simulate the network
+def simulate(integrator, time_interval, seconds):
+	"""
+	Return the output of the network every sampling
+	interval, for a constant sensor input
+	"""
+	nn = network(integrator, time_interval)
+	iterations = int(round(seconds / time_interval))
+	sensor_input = np.ones((iterations, 8)) * np.linspace(-1, 1, 8)
+
+	output, state = nn.rollout({"SENSOR": sensor_input})
+	sampling = int(round(SAMPLING_INTERVAL / time_interval))
+
+	return output["MOTORS"][sampling - 1::sampling]
+
+# Run the benchmark
+def run(tolerance=0.001, seconds=5.0, reference_interval=0.0001):
+	"""
+	Return the maximum error of each integrator at each
+	time interval, and the largest time interval within
+	the tolerance
+	"""
+	reference = simulate("rk4", reference_interval, seconds)
+
+	report = {}
+	for integrator in ["euler", "exponential", "rk4"]:
+		errors = []
+		for time_interval in TIME_INTERVALS:
+			with np.errstate(over="ignore", invalid="ignore"):
+				error = np.max(np.abs(simulate(integrator, time_interval, seconds) - reference))
+			errors.append(error if np.isfinite(error) else np.inf)
+
+		within = [time_interval for time_interval, error in zip(TIME_INTERVALS, errors) if error <= tolerance]
+		report[integrator] = {"errors": errors, "largest_interval": max(within) if within else None}
+
+	return report
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="The largest time interval of each integrator")
+	parser.add_argument("--tolerance", type=float, default=0.001)
+	parser.add_argument("--seconds", type=float, default=5.0)
+	arguments = parser.parse_args()
+
+	report = run(arguments.tolerance, arguments.seconds)
+
+	print("{: <12}".format("Interval") + "".join("{: >14}".format(integrator) for integrator in ["euler", "exponential", "rk4"]))
+	for index, time_interval in enumerate(TIME_INTERVALS):
+		print("{: <12}".format(time_interval) + "".join("{: >14.2e}".format(report[integrator]["errors"][index])
+													  for integrator in ["euler", "exponential", "rk4"]))
+
+	print("")
+	print("{: <12} {: >20} {: >20}".format("Integrator", "Largest interval", "Iterations/second"))
+	for integrator in ["euler", "exponential", "rk4"]:
+		largest = report[integrator]["largest_interval"]
+		if(largest is None):
+			print("{: <12} {: >20} {: >20}".format(integrator, "-", "-"))
+		else:
+			print("{: <12} {: >20} {: >20.0f}".format(integrator, largest, 1 / largest))
@@ -0,0 +1,100 @@
+"""Docstring for network_forward.py
+
+This module benchmarks a single iteration of the
+obstacle avoidance controller, a Static Neural Network
+with 8 infrared inputs and 2 motor outputs. The time
+per iteration is reported for forward_propagate, with
+dictionaries, forward_array, with positional inputs, and
+rollout, for 100 iterations in a single call.
+For a population, the time per individual is reported for
+loading each parameter vector, and for forward_population.
+
+Usage, from the benchmarks directory:
+	python network_forward.py --iterations 100000
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import time
+import numpy as np
+
+from neural_networks.ann import ArtificialNeuralNetwork
+from neural_networks.interface import Layer
+from neural_networks.activation_functions import IdentityActivation, TanhActivation
+
+# The network of obstacle_avoidance/MyAlgorithm.py
+def controller(type_of_network="STATIC"):
+	"""
+	Generate the obstacle avoidance controller
+	"""
+	inputLayer = Layer("inputLayer", 8, IdentityActivation(), "INFRARED", ["outputLayer"])
+	outputLayer = Layer("outputLayer", 2, TanhActivation(), "", ["MOTORS"])
+
+	return ArtificialNeuralNetwork([inputLayer, outputLayer], type_of_network)
+
+# Time a function
+def microseconds(function, iterations):
+	"""
+	Return the best time of a call of function in
+	microseconds, over 3 repetitions
+	"""
+	best = None
+	for repetition in range(3):
+		start = time.time()
+		for iteration in range(iterations):
+			function()
+		elapsed = (time.time() - start) / iterations
+		best = elapsed if best is None else min(best, elapsed)
+
+	return best * 1e6
+
+# Run the benchmark
+def run(iterations=10000, type_of_network="STATIC", population_size=100):
+	"""
+	Return the microseconds per iteration of
+	forward_propagate and forward_array, and per
+	individual of a population
+	"""
+	nn = controller(type_of_network)
+	infrared = np.random.uniform(0, 1, (8, ))
+	input_dict = {"INFRARED": infrared}
+
+	# The parameters of the population, the input layer has none
+	parameter_vector = [np.zeros((population_size, 0))]
+	parameter_vector.append(np.random.uniform(-1, 1, (population_size, len(nn.return_parameters_as_vector()["outputLayer"]))))
+
+	def load_each():
+		for individual in range(population_size):
+			nn.load_parameters_from_vector([parameters[individual] for parameters in parameter_vector])
+			nn.forward_propagate(input_dict)
+
+	population_iterations = max(iterations // population_size, 1)
+
+	# 100 iterations of the sensor inputs
+	trajectory = {"INFRARED": np.random.uniform(0, 1, (100, 8))}
+	rollout_iterations = max(iterations // 100, 1)
+
+	return {
+		"forward_propagate": microseconds(lambda: nn.forward_propagate(input_dict), iterations),
+		"forward_array": microseconds(lambda: nn.forward_array(infrared), iterations),
+		"rollout": microseconds(lambda: nn.rollout(trajectory), rollout_iterations) / 100,
+		"load_each": microseconds(load_each, population_iterations) / population_size,
+		"forward_population": microseconds(lambda: nn.forward_population(input_dict, parameter_vector),
+										   population_iterations) / population_size
+	}
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Iteration time of the obstacle avoidance controller")
+	parser.add_argument("--iterations", type=int, default=10000)
+	parser.add_argument("--dynamic", action="store_true", help="use a Dynamic Network")
+	parser.add_argument("--population-size", type=int, default=100)
+	arguments = parser.parse_args()
+
+	report = run(arguments.iterations, "DYNAMIC" if arguments.dynamic else "STATIC",
+				 arguments.population_size)
+
+	print("{: <20} {: >20}".format("Method", "Microseconds"))
+	for method in ["forward_propagate", "forward_array", "rollout", "load_each", "forward_population"]:
+		print("{: <20} {: >20.2f}".format(method, report[method]))
@@ -0,0 +1,386 @@
+"""Docstring for suite.py
+
+This module runs the benchmarks of the Genetic Algorithm
+library. Each benchmark runs the algorithm for a fixed
+budget of generations in a separate process, and reports
+the generations per second, evaluations per second, peak
+memory and best fitness. The results are saved as JSON
+and compared against a saved baseline. The import time of
+the libraries is checked against its budget(import_time.py).
+
+Usage, from the benchmarks directory:
+	python suite.py --save-baseline
+	python suite.py --baseline baseline.json
+"""
+
+import sys
+sys.path.append('./../')
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import tempfile
+import time
+import numpy as np
+
+from benchmarks.functions import FUNCTIONS
+from benchmarks import import_time
+
+# The metrics and whether higher values are better
+METRICS = [
+	("generations_per_second", True),
+	("evaluations_per_second", True),
+	("peak_memory_mb", False),
+	("best_fitness", True)
+]
+
+# Generate the list of benchmarks
+def benchmark_list(dimensions=(2, 10, 30)):
+	"""
+	Generate the benchmarks, each standard function at
+	each dimension and the neural network regression
+
+	Parameters
+	----------
+	dimensions(optional): tuple
+		The chromosome lengths of the standard functions
+
+	Returns
+	-------
+	benchmarks: list
+		A list of dictionaries with the name, function
+		and dimension of each benchmark
+	"""
+	benchmarks = []
+	for function in sorted(FUNCTIONS.keys()):
+		for dimension in dimensions:
+			benchmarks.append({"name": function + "-" + str(dimension),
+							   "function": function, "dimension": dimension})
+
+	# The regression of examples/ga_ann.py
+	benchmarks.append({"name": "ga_ann", "function": "ga_ann", "dimension": None})
+
+	return benchmarks
+
+# The Genetic Algorithm of examples/ga_ann.py
+def _neural_network_algorithm():
+	"""
+	Private function to generate the GeneticAlgorithmNN
+	that trains a network to output the square of its input
+	"""
+	from genetic_algorithm.ga_nn import GeneticAlgorithmNN
+	from neural_networks.ann import ArtificialNeuralNetwork
+	from neural_networks.interface import Layer
+	from neural_networks.activation_functions import IdentityActivation, SigmoidActivation, LinearActivation
+
+	inputLayer = Layer("inputLayer", 1, IdentityActivation(), "INPUT", ["hidden1Layer"])
+	hidden1Layer = Layer("hidden1Layer", 2, SigmoidActivation(), "", ["hidden2Layer"])
+	hidden2Layer = Layer("hidden2Layer", 2, SigmoidActivation(), "", ["outputLayer"])
+	outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["OUTPUT"])
+
+	nn = ArtificialNeuralNetwork([inputLayer, hidden1Layer, hidden2Layer, outputLayer], "STATIC")
+	ga = GeneticAlgorithmNN(nn)
+
+	def fitness_function(chromosome):
+		input_vector = np.random.rand()
+		actual_output_vector = input_vector * input_vector
+		output_dictionary = ga.calculate_output({"INPUT": input_vector}, chromosome)
+
+		return -1 * abs(actual_output_vector - output_dictionary["OUTPUT"])[0]
+
+	ga.fitness_function = fitness_function
+
+	return ga
+
+# Run a single benchmark
+def run_benchmark(benchmark, population_size=50, number_of_generations=50, seed=0):
+	"""
+	Run a single benchmark in the current process
+
+	Parameters
+	----------
+	benchmark: dictionary
+		A benchmark generated by benchmark_list()
+
+	population_size(optional): integer
+		The size of the population
+
+	number_of_generations(optional): integer
+		The number of generations, the budget of the benchmark
+
+	seed(optional): integer
+		The seed of the random number generator
+
+	Returns
+	-------
+	result: dictionary
+		The metrics of the benchmark
+
+	Raises
+	------
+	None
+	"""
+	from genetic_algorithm.ga import GeneticAlgorithm
+
+	np.random.seed(seed)
+
+	if(benchmark["function"] == "ga_ann"):
+		ga = _neural_network_algorithm()
+	else:
+		ga = GeneticAlgorithm(chromosome_length=benchmark["dimension"])
+		ga.fitness_function = FUNCTIONS[benchmark["function"]]
+
+	ga.population_size = population_size
+	ga.number_of_elites = 2
+	ga.number_of_generations = number_of_generations
+
+	# The generation files are not of interest
+	ga.log_folder = tempfile.mkdtemp()
+	stdout = sys.stdout
+	sys.stdout = open(os.devnull, 'w')
+
+	try:
+		start = time.time()
+		ga.run()
+		elapsed = time.time() - start
+	finally:
+		sys.stdout.close()
+		sys.stdout = stdout
+		shutil.rmtree(ga.log_folder, ignore_errors=True)
+
+	return {
+		"generations_per_second": number_of_generations / elapsed,
+		"evaluations_per_second": ga.number_of_evaluations / elapsed,
+		"peak_memory_mb": _peak_memory(),
+		"best_fitness": float(ga.best_fitness),
+		"seconds": elapsed
+	}
+
+# Peak memory of the process
+def _peak_memory():
+	"""
+	Private function to return the peak resident
+	memory of the current process in MB
+	"""
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	# Bytes on Mac, Kilobytes on Linux
+	if(sys.platform == "darwin"):
+		return peak / (1024.0 * 1024.0)
+
+	return peak / 1024.0
+
+# Target of the benchmark process
+def _benchmark_process(benchmark, settings, queue):
+	"""
+	Private function to run a benchmark and put
+	the result in the queue
+	"""
+	queue.put(run_benchmark(benchmark, **settings))
+
+# Run a benchmark in a new process
+def measure(benchmark, settings):
+	"""
+	Run a benchmark in a separate process, so that
+	the peak memory is of that benchmark alone
+
+	Parameters
+	----------
+	benchmark: dictionary
+		A benchmark generated by benchmark_list()
+
+	settings: dictionary
+		The keyword arguments of run_benchmark()
+
+	Returns
+	-------
+	result: dictionary
+		The metrics of the benchmark
+
+	Raises
+	------
+	RuntimeError
+		If the benchmark process fails
+	"""
+	queue = multiprocessing.Queue()
+	process = multiprocessing.Process(target=_benchmark_process,
+									  args=(benchmark, settings, queue))
+	process.start()
+
+	# Get the result before joining, a full queue blocks the exit
+	result = None
+	while(result is None and (process.is_alive() or not queue.empty())):
+		try:
+			result = queue.get(timeout=1)
+		except Exception:
+			pass
+
+	process.join()
+	if(result is None):
+		raise RuntimeError("The benchmark " + benchmark["name"] + " failed")
+
+	return result
+
+# Compare with a baseline
+def compare(results, baseline, tolerance=0.2, quality_tolerance=0.1):
+	"""
+	Compare the results with a baseline
+
+	Parameters
+	----------
+	results: dictionary
+		The results of each benchmark, by name
+
+	baseline: dictionary
+		The baseline results of each benchmark, by name
+
+	tolerance(optional): float
+		The allowed relative loss of throughput and
+		increase of peak memory
+
+	quality_tolerance(optional): float
+		The allowed loss of best fitness, relative to the
+		magnitude of the baseline fitness(at least 1)
+
+	Returns
+	-------
+	regressions: list
+		A message for each regression found
+
+	Raises
+	------
+	None
+	"""
+	regressions = []
+	for name in sorted(results.keys()):
+		if(name not in baseline):
+			continue
+
+		for metric, higher_is_better in METRICS:
+			value = results[name][metric]
+			reference = baseline[name][metric]
+
+			if(metric == "best_fitness"):
+				regressed = value < reference - quality_tolerance * max(abs(reference), 1.0)
+			elif(higher_is_better):
+				regressed = value < reference * (1 - tolerance)
+			else:
+				regressed = value > reference * (1 + tolerance)
+
+			if(regressed):
+				regressions.append("{}: {} is {:.4g}, baseline {:.4g}".format(
+								   name, metric, value, reference))
+
+	return regressions
+
+# Print the table of results
+def print_results(results, baseline=None):
+	"""
+	Print the metrics of each benchmark, with the
+	relative change against the baseline
+	"""
+	legend = ["Benchmark", "Generations/s", "Evaluations/s", "Peak MB", "Best Fitness"]
+	print("{: <16} {: >16} {: >16} {: >16} {: >16}".format(*legend))
+
+	for name in sorted(results.keys()):
+		row = [name]
+		for metric, _ in METRICS:
+			cell = "{:.4g}".format(results[name][metric])
+			if(baseline is None or name not in baseline):
+				pass
+			elif(metric == "best_fitness"):
+				# Fitness can be negative, the difference is clearer
+				cell = cell + " ({:+.2g})".format(results[name][metric] - baseline[name][metric])
+			elif(baseline[name][metric] != 0):
+				change = results[name][metric] / baseline[name][metric] - 1
+				cell = cell + " ({:+.0%})".format(change)
+			row.append(cell)
+
+		print("{: <16} {: >16} {: >16} {: >16} {: >16}".format(*row))
+
+# Command line interface
+def main(arguments=None):
+	"""
+	Run the benchmarks, save the results and compare
+	them with the baseline. Returns 1 if there is a
+	regression and 0 otherwise
+	"""
+	parser = argparse.ArgumentParser(description="Benchmarks of the Genetic Algorithm library")
+	parser.add_argument("--quick", action="store_true",
+						help="fewer generations and dimensions, for a quick check")
+	parser.add_argument("--filter", default="",
+						help="run only the benchmarks whose name contains this")
+	parser.add_argument("--population-size", type=int, default=50)
+	parser.add_argument("--generations", type=int, default=None)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--output", default="results.json")
+	parser.add_argument("--baseline", default="baseline.json")
+	parser.add_argument("--save-baseline", action="store_true",
+						help="save the results as the new baseline")
+	parser.add_argument("--tolerance", type=float, default=0.2)
+	parser.add_argument("--quality-tolerance", type=float, default=0.1)
+	parser.add_argument("--skip-imports", action="store_true",
+						help="do not check the import time of the libraries")
+	arguments = parser.parse_args(arguments)
+
+	dimensions = (2, 10) if arguments.quick else (2, 10, 30)
+	generations = arguments.generations
+	if(generations is None):
+		generations = 10 if arguments.quick else 50
+
+	settings = {"population_size": arguments.population_size,
+				"number_of_generations": generations,
+				"seed": arguments.seed}
+
+	results = {}
+	for benchmark in benchmark_list(dimensions):
+		if(arguments.filter not in benchmark["name"]):
+			continue
+
+		try:
+			results[benchmark["name"]] = measure(benchmark, settings)
+		except RuntimeError as error:
+			print(error)
+
+	environment = {"python": platform.python_version(), "numpy": np.__version__}
+
+	# Results are only comparable with the same settings
+	# and the same environment
+	baseline = None
+	if(os.path.exists(arguments.baseline) and not arguments.save_baseline):
+		with open(arguments.baseline) as baseline_file:
+			saved = json.load(baseline_file)
+		if(saved["settings"] != settings):
+			print("The baseline was saved with different settings, not comparing")
+		elif(saved["environment"] != environment):
+			print("The baseline was saved with Python " + saved["environment"]["python"] +
+				  " and numpy " + saved["environment"]["numpy"] + ", not comparing")
+		else:
+			baseline = saved["results"]
+
+	print_results(results, baseline)
+
+	output = {"settings": settings, "results": results, "environment": environment}
+	filename = arguments.baseline if arguments.save_baseline else arguments.output
+	with open(filename, "w") as output_file:
+		json.dump(output, output_file, indent=4, sort_keys=True)
+
+	regressions = []
+	if(baseline is not None):
+		regressions = compare(results, baseline, arguments.tolerance, arguments.quality_tolerance)
+
+	# The import time has a fixed budget, it needs no baseline
+	if(not arguments.skip_imports):
+		regressions = regressions + import_time.check()
+
+	for regression in regressions:
+		print("REGRESSION " + regression)
+
+	return 1 if len(regressions) != 0 else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
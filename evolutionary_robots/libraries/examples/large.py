@@ -37,6 +37,9 @@ nn = ArtificialNeuralNetwork(layers, "STATIC")		# Simply passing the layers 2d m
 
 nn.visualize('repr/large', True)
 
+# The 28 hidden layers are fused, and the Linear layers folded into a single step
+nn.optimize()
+
 # Input the Neural Network through a dictionary
 input_dict = {
 		"SENSOR": np.array([1.0])		# Input to Layer 0
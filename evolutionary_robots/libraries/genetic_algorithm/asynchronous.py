@@ -0,0 +1,322 @@
+"""Docstring for asynchronous.py
+
+This module implements the evaluation of a population
+with an async def fitness function on an asyncio event
+loop. Fitness functions that drive simulators spend most
+of their time waiting for service calls and sensor topics,
+so a bounded number of them are run concurrently.
+
+The module requires Python 3. It is written without the
+async/await keywords, so that the rest of the library
+still compiles on Python 2.
+"""
+
+import asyncio
+import time
+import numpy as np
+
+# The Asynchronous Evaluator class
+class AsyncEvaluator(object):
+	"""
+	The Asynchronous Evaluator Class
+	Calculates the fitness of a population with a coroutine
+	fitness function, running a bounded number of evaluations
+	concurrently. It can be used as an evaluation backend of
+	GeneticAlgorithm
+
+	...
+
+	Parameters
+	----------
+	fitness_function: function
+		An async def function taking a single chromosome and
+		returning its fitness value
+
+	concurrency(optional): integer
+		The maximum number of evaluations running at once
+
+	timeout(optional): float
+		The number of seconds a single evaluation is allowed
+		to take. None means no limit
+
+	timeout_fitness(optional): float
+		The fitness given to an evaluation that times out.
+		None raises the asyncio.TimeoutError instead
+
+	Methods
+	-------
+	evaluate(population)
+		Calculate the fitness of the population, blocking until
+		all the evaluations are complete
+
+	evaluate_async(population, loop)
+		Calculate the fitness of the population, returning a
+		future of the fitness values
+	"""
+	def __init__(self, fitness_function, concurrency=10, timeout=None,
+				 timeout_fitness=None):
+		"""
+		Initialization function of AsyncEvaluator class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.fitness_function = fitness_function
+		self.concurrency = concurrency
+		self.timeout = timeout
+		self.timeout_fitness = timeout_fitness
+
+	def evaluate(self, population):
+		"""
+		Calculate the fitness of the population on a new
+		event loop, blocking until the evaluations complete
+
+		Parameters
+		----------
+		population: array_like
+			A 2D array with one chromosome per row
+
+		Returns
+		-------
+		fitness_vector: array_like
+			The fitness value of each chromosome
+
+		Raises
+		------
+		asyncio.TimeoutError
+			If an evaluation times out and timeout_fitness is None
+		"""
+		loop = asyncio.new_event_loop()
+		try:
+			return loop.run_until_complete(self.evaluate_async(population, loop))
+		finally:
+			loop.close()
+
+	def evaluate_async(self, population, loop=None):
+		"""
+		Calculate the fitness of the population on an
+		event loop
+
+		Parameters
+		----------
+		population: array_like
+			A 2D array with one chromosome per row
+
+		loop(optional): asyncio event loop
+			The event loop on which to run the evaluations,
+			by default the current event loop
+
+		Returns
+		-------
+		future: asyncio Future
+			A future that resolves to the fitness values.
+			Cancelling it cancels the evaluations in progress
+
+		Raises
+		------
+		None
+		"""
+		if(loop is None):
+			loop = asyncio.get_event_loop()
+
+		result = loop.create_future()
+		fitness_vector = np.zeros(len(population), np.float64)
+		running = {}							# Task mapped to the index of its chromosome
+		counters = {"next": 0, "done": 0}
+
+		def launch():
+			# Keep the number of running evaluations bounded
+			while(len(running) < self.concurrency and counters["next"] < len(population)):
+				index = counters["next"]
+				counters["next"] = index + 1
+
+				coroutine = self.fitness_function(population[index])
+				if(self.timeout is not None):
+					coroutine = asyncio.wait_for(coroutine, self.timeout)
+
+				task = loop.create_task(coroutine)
+				running[task] = index
+				task.add_done_callback(finished)
+
+			if(counters["done"] == len(population) and not result.done()):
+				result.set_result(fitness_vector)
+
+		def finished(task):
+			index = running.pop(task)
+			if(result.done()):
+				return
+
+			if(task.cancelled()):
+				result.cancel()
+				return
+
+			error = task.exception()
+			if(error is None):
+				fitness_vector[index] = task.result()
+			elif(isinstance(error, asyncio.TimeoutError) and self.timeout_fitness is not None):
+				fitness_vector[index] = self.timeout_fitness
+			else:
+				result.set_exception(error)
+				return
+
+			counters["done"] = counters["done"] + 1
+			launch()
+
+		def stop(future):
+			# Cancel whatever is still running
+			for task in list(running.keys()):
+				task.cancel()
+
+		result.add_done_callback(stop)
+		launch()
+
+		return result
+
+	# Getters and Setters
+	@property
+	def concurrency(self):
+		""" The maximum number of evaluations running at once """
+		return self._concurrency
+
+	@concurrency.setter
+	def concurrency(self, concurrency):
+		if(concurrency <= 0):
+			concurrency = 10
+
+		self._concurrency = int(concurrency)
+
+
+# Function to run a GeneticAlgorithm on an event loop
+def run_genetic_algorithm(genetic_algorithm, start=0, loop=None, deadline=None,
+						  max_evaluations=None):
+	"""
+	Simulate the complete run of genetic_algorithm on an
+	event loop. Used by GeneticAlgorithm.run_async()
+
+	Parameters
+	----------
+	genetic_algorithm: GeneticAlgorithm object
+		The algorithm to run
+
+	start(optional): integer
+		The generation from which to resume
+
+	loop(optional): asyncio event loop
+		The event loop on which to run, by default the
+		current event loop
+
+	deadline(optional): float
+		The wall-clock time by which the run should stop
+
+	max_evaluations(optional): integer
+		The maximum number of fitness evaluations
+
+	Returns
+	-------
+	future: asyncio Future
+		A future that resolves to the best chromosome
+
+	Raises
+	------
+	None
+
+	Notes
+	-----
+	Coroutine fitness functions are evaluated with an
+	AsyncEvaluator, backends with an evaluate_async method
+	are used as such, and everything else is evaluated in
+	the default executor of the loop so that it does not
+	block the loop
+	"""
+	if(loop is None):
+		loop = asyncio.get_event_loop()
+
+	ga = genetic_algorithm
+	result = loop.create_future()
+	state = {"generation": None, "evaluation": None, "time": None,
+			 "indices": None, "predictions": None}
+
+	# Choose how the generations are evaluated
+	backend = ga.evaluation_backend
+	if(backend is None and asyncio.iscoroutinefunction(ga.fitness_function)):
+		backend = AsyncEvaluator(ga.fitness_function)
+
+	def evaluate(population):
+		# Every backend gets the chromosomes decoded
+		population = ga._decode_population(population)
+		if(hasattr(backend, 'evaluate_async')):
+			return backend.evaluate_async(population, loop)
+		elif(backend is not None):
+			return loop.run_in_executor(None, backend.evaluate, population)
+		else:
+			fitness_function = ga.fitness_function
+			return loop.run_in_executor(None, lambda: [fitness_function(individual)
+													   for individual in population])
+
+	def step():
+		if(result.done()):
+			return
+
+		if(state["generation"] > ga.number_of_generations):
+			result.set_result(ga._end_run())
+			return
+
+		# For statistics
+		ga.current_generation = state["generation"] - 1
+
+		# Stop at the budget
+		if(ga._budget_exhausted(deadline, max_evaluations)):
+			ga._stop_run(state["generation"])
+			result.set_result(ga._end_run())
+			return
+
+		state["time"] = time.time()
+		state["indices"], state["predictions"] = ga._screen_population(ga.population)
+		population = ga.population[state["indices"]]
+		state["evaluation"] = asyncio.ensure_future(evaluate(population), loop=loop)
+		state["evaluation"].add_done_callback(evaluated)
+
+	def evaluated(evaluation):
+		if(result.done()):
+			return
+
+		if(evaluation.cancelled()):
+			result.cancel()
+			return
+
+		try:
+			indices = state["indices"]
+			fitness_vector = ga._record_population(evaluation.result(), ga.population[indices])
+			ga.fitness_vector = ga._combine_screened(ga.population, indices, fitness_vector,
+													 state["predictions"])
+			ga.generate_statistics()
+			ga._advance_generation(state["generation"])
+			ga._record_generation_time(state["generation"], time.time() - state["time"])
+		except Exception as error:
+			result.set_exception(error)
+			return
+
+		state["generation"] = state["generation"] + 1
+		step()
+
+	def stop(future):
+		if(future.cancelled() and state["evaluation"] is not None):
+			state["evaluation"].cancel()
+
+	ga._start_run(start)
+	state["generation"] = ga.generation_start
+
+	result.add_done_callback(stop)
+	loop.call_soon(step)
+
+	return result
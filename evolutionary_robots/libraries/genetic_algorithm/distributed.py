@@ -0,0 +1,598 @@
+"""Docstring for distributed.py
+
+This module implements a lightweight coordinator/worker
+protocol to calculate the fitness of a population on
+different machines. The coordinator splits the population
+into batches of chromosomes and sends them over TCP to the
+workers that have registered with it.
+
+The coordinator can be passed to GeneticAlgorithm as an
+evaluation backend. For testing, local worker processes
+can be used as stand-ins for the remote nodes.
+"""
+
+import numpy as np
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+try:
+	import Queue as queue
+except ImportError:
+	import queue
+
+# Default key used to authenticate the connections
+DEFAULT_AUTHKEY = b'evolutionary_robots'
+
+# The Coordinator class
+class EvaluationCoordinator(object):
+	"""
+	The Evaluation Coordinator Class
+	Listens for workers, sends them batches of chromosomes
+	and collects the fitness values they return
+
+	...
+
+	Parameters
+	----------
+	address(optional): tuple
+		The (host, port) on which to listen for workers
+		A port of 0 lets the operating system choose one
+
+	authkey(optional): bytes
+		The key used to authenticate the workers
+
+	batch_size(optional): integer
+		The number of chromosomes sent to a worker at once
+
+	heartbeat_timeout(optional): float
+		The number of seconds after which a silent worker
+		is considered dead
+
+	batch_timeout(optional): float
+		The number of seconds a worker is allowed to spend on
+		a single batch. None means no limit
+
+	evaluation_timeout(optional): float
+		The number of seconds evaluate() is allowed to take
+		for a whole population. None means no limit
+
+	Attributes
+	----------
+	address: tuple
+		The (host, port) on which the coordinator listens
+
+	number_of_workers: integer
+		The number of workers currently registered
+
+	Methods
+	-------
+	start()
+		Start listening for workers
+
+	wait_for_workers(number_of_workers, timeout)
+		Block until the given number of workers have registered
+
+	evaluate(population)
+		Calculate the fitness of every chromosome of the population
+
+	stop()
+		Stop the workers and close the listener
+
+	Notes
+	-----
+	The messages exchanged are tuples:
+	worker -> coordinator: ("REGISTER", name), ("HEARTBEAT",),
+	("RESULT", batch_id, fitness_values), ("ERROR", batch_id, message)
+	coordinator -> worker: ("BATCH", batch_id, chromosomes), ("STOP",)
+
+	A batch sent to a worker that dies, stops sending heartbeats
+	or exceeds the batch timeout is put back in the queue and
+	sent to another worker. evaluate() fails if no worker is
+	connected for longer than the heartbeat timeout
+	"""
+	def __init__(self, address=('localhost', 0), authkey=DEFAULT_AUTHKEY,
+				 batch_size=5, heartbeat_timeout=10.0, batch_timeout=None,
+				 evaluation_timeout=None):
+		"""
+		Initialization function of EvaluationCoordinator class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.__address = address
+		self.__authkey = authkey
+		self.batch_size = batch_size
+		self.heartbeat_timeout = heartbeat_timeout
+		self.batch_timeout = batch_timeout
+		self.evaluation_timeout = evaluation_timeout
+
+		# Internal Attributes
+		self.__listener = None
+		self.__workers = {}						# Name of the worker mapped to the time it was last heard
+		self.__pending = queue.Queue()			# Batches waiting to be sent
+		self.__results = {}						# Batch id mapped to the fitness values
+		self.__active = set()					# Batch ids of the evaluation in progress
+		self.__errors = []						# Errors reported by the workers
+		self.__condition = threading.Condition()
+		self.__running = False
+		self.__batch_counter = 0
+
+	def start(self):
+		"""
+		Start listening for workers in a background thread
+		"""
+		self.__listener = Listener(self.__address, authkey=self.__authkey)
+		self.__address = self.__listener.address
+		self.__running = True
+
+		accept_thread = threading.Thread(target=self._accept_workers)
+		accept_thread.daemon = True
+		accept_thread.start()
+
+	def _accept_workers(self):
+		"""
+		Private function that accepts the connections of
+		workers and hands each one to a separate thread
+		"""
+		while(self.__running):
+			try:
+				connection = self.__listener.accept()
+			except (IOError, EOFError):
+				continue
+			except Exception:
+				# Authentication failures should not stop the coordinator
+				continue
+
+			if(self.__running == False):
+				connection.close()
+				break
+
+			handler_thread = threading.Thread(target=self._handle_worker, args=(connection,))
+			handler_thread.daemon = True
+			handler_thread.start()
+
+	def _handle_worker(self, connection):
+		"""
+		Private function that talks to a single worker
+
+		The worker is registered, then batches are taken from the
+		pending queue and sent to it until the coordinator stops
+		or the worker is found to be dead
+		"""
+		# The first message has to be the registration
+		if(not connection.poll(self.heartbeat_timeout)):
+			connection.close()
+			return
+
+		try:
+			message = connection.recv()
+		except (IOError, EOFError):
+			connection.close()
+			return
+
+		if(message[0] != "REGISTER"):
+			connection.close()
+			return
+
+		name = message[1]
+		with self.__condition:
+			self.__workers[name] = time.time()
+			self.__condition.notify_all()
+
+		batch = None
+		try:
+			while(self.__running):
+				# Wait for a batch, listening to heartbeats meanwhile
+				try:
+					batch = self.__pending.get(timeout=0.1)
+				except queue.Empty:
+					self._receive(connection, name, None)
+					continue
+
+				# The batches of a failed evaluation are dropped
+				with self.__condition:
+					if(batch[0] not in self.__active):
+						batch = None
+						continue
+
+				connection.send(("BATCH", batch[0], batch[2]))
+				sent_time = time.time()
+
+				# Wait for the result of the batch
+				result = None
+				while(result is None):
+					result = self._receive(connection, name, batch[0])
+					if(self.batch_timeout is not None and
+					   time.time() - sent_time > self.batch_timeout):
+						raise IOError("Batch timeout for " + name)
+
+				# The result of a dropped batch is discarded
+				with self.__condition:
+					if(batch[0] in self.__active):
+						if(result[0] == "RESULT"):
+							self.__results[batch[0]] = (batch[1], result[2])
+						else:
+							self.__errors.append(result[2])
+					self.__condition.notify_all()
+
+				batch = None
+
+		except (IOError, EOFError):
+			# The worker is dead, send its batch to someone else
+			with self.__condition:
+				if(batch is not None and batch[0] in self.__active):
+					self.__pending.put(batch)
+
+		finally:
+			with self.__condition:
+				self.__workers.pop(name, None)
+				self.__condition.notify_all()
+
+			try:
+				connection.send(("STOP", ))
+			except (IOError, EOFError):
+				pass
+			connection.close()
+
+	def _receive(self, connection, name, batch_id):
+		"""
+		Private function that reads the messages of a worker
+		for 0.1 seconds. Returns the result of batch_id, if
+		it has arrived
+
+		Raises IOError if the worker has not been heard for
+		longer than the heartbeat timeout
+		"""
+		if(connection.poll(0.1)):
+			message = connection.recv()
+
+			with self.__condition:
+				self.__workers[name] = time.time()
+
+			if(message[0] in ("RESULT", "ERROR") and message[1] == batch_id):
+				return message
+
+		else:
+			with self.__condition:
+				last_heard = self.__workers[name]
+
+			if(time.time() - last_heard > self.heartbeat_timeout):
+				raise IOError("Heartbeat timeout for " + name)
+
+		return None
+
+	def wait_for_workers(self, number_of_workers, timeout=None):
+		"""
+		Block until the given number of workers have registered
+
+		Parameters
+		----------
+		number_of_workers: integer
+			The number of workers to wait for
+
+		timeout(optional): float
+			The maximum number of seconds to wait
+
+		Returns
+		-------
+		registered: boolean
+			Whether the workers registered in time
+
+		Raises
+		------
+		None
+		"""
+		end_time = None if timeout is None else time.time() + timeout
+
+		with self.__condition:
+			while(len(self.__workers) < number_of_workers):
+				if(end_time is not None and time.time() > end_time):
+					return False
+				self.__condition.wait(0.1)
+
+		return True
+
+	def evaluate(self, population):
+		"""
+		Calculate the fitness of every chromosome of the population
+		on the registered workers
+
+		Parameters
+		----------
+		population: array_like
+			A 2D array with one chromosome per row
+
+		Returns
+		-------
+		fitness_vector: array_like
+			The fitness value of each chromosome
+
+		Raises
+		------
+		RuntimeError
+			If a worker fails to calculate the fitness of a batch,
+			no worker is connected for longer than the heartbeat
+			timeout or the evaluation timeout is exceeded. The
+			batches of the population are dropped
+		"""
+		population = np.asarray(population)
+
+		# Split the population in batches
+		batch_ids = []
+		with self.__condition:
+			self.__errors = []
+			for start in range(0, population.shape[0], self.batch_size):
+				indices = list(range(start, min(start + self.batch_size, population.shape[0])))
+				self.__batch_counter = self.__batch_counter + 1
+				batch_ids.append(self.__batch_counter)
+				self.__active.add(self.__batch_counter)
+				self.__pending.put((self.__batch_counter, indices, population[indices]))
+
+		# Wait for all the batches to return
+		start_time = time.time()
+		worker_time = start_time				# The last time a worker was connected
+		fitness_vector = np.zeros(population.shape[0], np.float64)
+		with self.__condition:
+			while(not all(batch_id in self.__results for batch_id in batch_ids)):
+				error = None
+				if(len(self.__errors) != 0):
+					error = "A worker failed to calculate the fitness: " + str(self.__errors[0])
+				elif(len(self.__workers) != 0):
+					worker_time = time.time()
+				elif(time.time() - worker_time > self.heartbeat_timeout):
+					error = "No worker is connected to calculate the fitness"
+
+				if(self.evaluation_timeout is not None and
+				   time.time() - start_time > self.evaluation_timeout):
+					error = "The fitness was not calculated within the evaluation timeout"
+
+				if(error is not None):
+					self._drop_batches(batch_ids)
+					raise RuntimeError(error)
+
+				self.__condition.wait(0.1)
+
+			for batch_id in batch_ids:
+				indices, fitness_values = self.__results.pop(batch_id)
+				fitness_vector[indices] = fitness_values
+
+			self.__active.difference_update(batch_ids)
+
+		return fitness_vector
+
+	def _drop_batches(self, batch_ids):
+		"""
+		Private function to drop the pending batches and the
+		results of a failed evaluation, so that they do not
+		leak into the next one. Called with the condition held
+		"""
+		self.__active.difference_update(batch_ids)
+		for batch_id in batch_ids:
+			self.__results.pop(batch_id, None)
+
+		# The batches of other evaluations go back in the queue
+		remaining = []
+		while(True):
+			try:
+				batch = self.__pending.get_nowait()
+			except queue.Empty:
+				break
+
+			if(batch[0] in self.__active):
+				remaining.append(batch)
+
+		for batch in remaining:
+			self.__pending.put(batch)
+
+	def stop(self):
+		"""
+		Stop the workers and close the listener
+		"""
+		if(self.__running == False):
+			return
+
+		self.__running = False
+
+		# Wake up the accepting thread
+		try:
+			Client(self.__address, authkey=self.__authkey).close()
+		except Exception:
+			pass
+
+		self.__listener.close()
+
+	# Getters and Setters
+	@property
+	def address(self):
+		""" The (host, port) on which the coordinator listens """
+		return self.__address
+
+	@property
+	def number_of_workers(self):
+		""" The number of workers currently registered """
+		with self.__condition:
+			return len(self.__workers)
+
+	@property
+	def batch_size(self):
+		""" The number of chromosomes sent to a worker at once """
+		return self._batch_size
+
+	@batch_size.setter
+	def batch_size(self, batch_size):
+		if(batch_size <= 0):
+			batch_size = 5
+
+		self._batch_size = int(batch_size)
+
+
+# The Worker class
+class EvaluationWorker(object):
+	"""
+	The Evaluation Worker Class
+	Connects to a coordinator and calculates the fitness
+	of the batches of chromosomes it receives
+
+	...
+
+	Parameters
+	----------
+	address: tuple
+		The (host, port) of the coordinator
+
+	fitness_function: function
+		The fitness function, taking a single chromosome
+		and returning its fitness value
+
+	authkey(optional): bytes
+		The key used to authenticate with the coordinator
+
+	name(optional): string
+		The name with which the worker registers
+
+	heartbeat_interval(optional): float
+		The number of seconds between two heartbeats
+
+	Methods
+	-------
+	run()
+		Register with the coordinator and serve batches until
+		the coordinator stops
+	"""
+	def __init__(self, address, fitness_function, authkey=DEFAULT_AUTHKEY,
+				 name=None, heartbeat_interval=1.0):
+		"""
+		Initialization function of EvaluationWorker class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.address = address
+		self.fitness_function = fitness_function
+		self.authkey = authkey
+		self.heartbeat_interval = heartbeat_interval
+
+		if(name is None):
+			name = multiprocessing.current_process().name + "-" + str(id(self))
+		self.name = name
+
+	def run(self):
+		"""
+		Register with the coordinator and serve batches until
+		the coordinator stops or the connection is lost
+		"""
+		connection = Client(self.address, authkey=self.authkey)
+		send_lock = threading.Lock()
+		stopped = threading.Event()
+
+		def send(message):
+			with send_lock:
+				connection.send(message)
+
+		# Heartbeats are sent from a separate thread,
+		# so that long evaluations are not taken as dead workers
+		def heartbeat():
+			while(not stopped.wait(self.heartbeat_interval)):
+				try:
+					send(("HEARTBEAT", ))
+				except (IOError, EOFError):
+					break
+
+		send(("REGISTER", self.name))
+		heartbeat_thread = threading.Thread(target=heartbeat)
+		heartbeat_thread.daemon = True
+		heartbeat_thread.start()
+
+		try:
+			while(True):
+				message = connection.recv()
+
+				if(message[0] == "STOP"):
+					break
+
+				batch_id, chromosomes = message[1], message[2]
+				try:
+					fitness_values = [self.fitness_function(chromosome) for chromosome in chromosomes]
+				except Exception as error:
+					send(("ERROR", batch_id, repr(error)))
+					continue
+
+				send(("RESULT", batch_id, fitness_values))
+
+		except (IOError, EOFError):
+			pass
+
+		finally:
+			stopped.set()
+			connection.close()
+
+
+# Function run in each local worker process
+def _run_worker(address, fitness_function, authkey, heartbeat_interval):
+	"""
+	Private function to run a worker in a process
+	"""
+	EvaluationWorker(address, fitness_function, authkey, None, heartbeat_interval).run()
+
+def start_local_workers(address, fitness_function, number_of_workers,
+						authkey=DEFAULT_AUTHKEY, heartbeat_interval=1.0):
+	"""
+	Start worker processes on the local machine
+
+	Parameters
+	----------
+	address: tuple
+		The (host, port) of the coordinator
+
+	fitness_function: function
+		The fitness function used by the workers
+
+	number_of_workers: integer
+		The number of processes to start
+
+	authkey(optional): bytes
+		The key used to authenticate with the coordinator
+
+	heartbeat_interval(optional): float
+		The number of seconds between two heartbeats
+
+	Returns
+	-------
+	processes: array_like
+		The list of started multiprocessing.Process objects
+
+	Raises
+	------
+	None
+	"""
+	processes = []
+	for _ in range(number_of_workers):
+		process = multiprocessing.Process(target=_run_worker,
+						args=(address, fitness_function, authkey, heartbeat_interval))
+		process.daemon = True
+		process.start()
+		processes.append(process)
+
+	return processes
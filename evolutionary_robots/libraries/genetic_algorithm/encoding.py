@@ -0,0 +1,317 @@
+"""Docstring for encoding.py
+
+This module implements the encodings of the chromosomes
+of the Genetic Algorithm. An encoding decides how the genes
+are stored, generated, crossed over and mutated, and how a
+stored chromosome is decoded before it is passed to the
+fitness function.
+
+The encodings are
+Real: genes in [0, 1] stored as float64, the default
+Binary: bits packed 8 to a byte with numpy.packbits
+Integer: integers in a bounded range, stored in the
+smallest integer type that fits, decoded to int64
+"""
+
+import numpy as np
+
+# The base Encoding class
+class Encoding(object):
+	"""
+	The Encoding Class
+	The base class of the encodings, with a single point
+	crossover that works gene by gene
+
+	...
+
+	Methods
+	-------
+	generate(population_size, chromosome_length)
+		Generate a random population
+
+	crossover(mums, dads, cross_position)
+		Cross over pairs of chromosomes
+
+	mutate(population, chromosome_length, mutation_probability)
+		Mutate a population in place
+
+	decode(chromosome, chromosome_length)
+		Convert a stored chromosome to the form passed
+		to the fitness function
+
+	convert(population)
+		Convert a loaded population to the stored type
+
+	storage_length(chromosome_length)
+		The number of stored columns of a chromosome
+
+	chromosome_length(storage_length)
+		The number of genes of a stored chromosome
+	"""
+	# Cross over pairs of chromosomes
+	def crossover(self, mums, dads, cross_position):
+		"""
+		Single point crossover of pairs of chromosomes
+
+		Parameters
+		----------
+		mums, dads: array_like
+			2D arrays of stored chromosomes, the parents
+			of each pair in the same row
+
+		cross_position: array_like
+			The gene of each pair from which the alleles
+			are exchanged
+
+		Returns
+		-------
+		sons, daughters: array_like
+			The son takes the genes of the mum up to the
+			cross position and the genes of the dad after it,
+			the daughter the other way round
+
+		Raises
+		------
+		None
+		"""
+		after = np.arange(mums.shape[1])[np.newaxis, :] >= np.asarray(cross_position)[:, np.newaxis]
+
+		sons = np.where(after, dads, mums)
+		daughters = np.where(after, mums, dads)
+
+		return sons, daughters
+
+	# Positions of the mutated genes
+	def _mutation_positions(self, population, chromosome_length, mutation_probability):
+		"""
+		Private function to draw the row and the gene of
+		each mutation. The number of mutations is binomial,
+		and only the mutated genes are drawn
+		"""
+		number_of_genes = population.shape[0] * chromosome_length
+		number_of_mutations = np.random.binomial(number_of_genes, mutation_probability)
+		position = np.random.randint(0, max(number_of_genes, 1), number_of_mutations)
+
+		return position // chromosome_length, position % chromosome_length
+
+	# Decode a chromosome
+	def decode(self, chromosome, chromosome_length):
+		"""
+		Convert a stored chromosome of chromosome_length
+		genes to the form passed to the fitness function.
+		Overridden to change it
+		"""
+		return chromosome
+
+	# Convert a loaded population
+	def convert(self, population):
+		"""
+		Convert a population loaded from a file to the
+		stored type
+		"""
+		return np.asarray(population, self.dtype)
+
+	# Stored length of a chromosome
+	def storage_length(self, chromosome_length):
+		"""
+		The number of stored columns of a chromosome
+		of chromosome_length genes
+		"""
+		return chromosome_length
+
+	# Genes of a stored chromosome
+	def chromosome_length(self, storage_length):
+		"""
+		The number of genes of a stored chromosome of
+		storage_length columns
+		"""
+		return storage_length
+
+
+# The Real Encoding class
+class RealEncoding(Encoding):
+	"""
+	The Real Encoding Class
+	Genes are real numbers in [0, 1], stored as float64.
+	A mutated gene is drawn again uniformly from [0, 1]
+	"""
+	dtype = np.float64
+
+	def generate(self, population_size, chromosome_length):
+		"""
+		Generate a random population of shape
+		(population_size, chromosome_length)
+		"""
+		return np.random.uniform(0, 1, (population_size, chromosome_length))
+
+	def mutate(self, population, chromosome_length, mutation_probability):
+		"""
+		Mutate each gene of population with probability
+		mutation_probability, in place
+		"""
+		row, gene = self._mutation_positions(population, chromosome_length, mutation_probability)
+		population[row, gene] = np.random.uniform(0, 1, row.shape[0])
+
+
+# The Integer Encoding class
+class IntegerEncoding(Encoding):
+	"""
+	The Integer Encoding Class
+	Genes are integers from low to high(both inclusive),
+	stored in the smallest integer type that fits them and
+	decoded to 64 bit integers for the fitness function.
+	A mutated gene is drawn again uniformly from the range
+
+	...
+
+	Parameters
+	----------
+	low(optional): integer
+		The smallest value of a gene
+
+	high(optional): integer
+		The largest value of a gene
+
+	Raises
+	------
+	ValueError
+		If high is smaller than low
+	"""
+	def __init__(self, low=0, high=1):
+		"""
+		Initialization function of IntegerEncoding class
+		"""
+		if(high < low):
+			raise ValueError("The high value should not be smaller than the low value")
+
+		self.low = int(low)
+		self.high = int(high)
+
+		# The smallest type that holds the range
+		if(self.low >= 0):
+			types = [np.uint8, np.uint16, np.uint32, np.uint64]
+		else:
+			types = [np.int8, np.int16, np.int32, np.int64]
+
+		self.dtype = [dtype for dtype in types
+					  if np.iinfo(dtype).min <= self.low and self.high <= np.iinfo(dtype).max][0]
+
+	def generate(self, population_size, chromosome_length):
+		"""
+		Generate a random population of shape
+		(population_size, chromosome_length)
+		"""
+		return np.random.randint(self.low, self.high + 1, (population_size, chromosome_length),
+								 dtype=self.dtype)
+
+	def decode(self, chromosome, chromosome_length):
+		"""
+		Convert a stored chromosome to 64 bit integers, so that
+		the arithmetic of the fitness function does not wrap
+		around in the stored type
+		"""
+		if(self.high > np.iinfo(np.int64).max):
+			return np.asarray(chromosome, np.uint64)
+
+		return np.asarray(chromosome, np.int64)
+
+	def mutate(self, population, chromosome_length, mutation_probability):
+		"""
+		Mutate each gene of population with probability
+		mutation_probability, in place
+		"""
+		row, gene = self._mutation_positions(population, chromosome_length, mutation_probability)
+		population[row, gene] = np.random.randint(self.low, self.high + 1, row.shape[0],
+												  dtype=self.dtype)
+
+	def convert(self, population):
+		"""
+		Convert a population loaded from a file to the
+		stored type, rounding the values
+		"""
+		return np.rint(population).astype(self.dtype)
+
+
+# The Binary Encoding class
+class BinaryEncoding(Encoding):
+	"""
+	The Binary Encoding Class
+	Genes are bits, packed 8 to a byte(most significant
+	bit first, as numpy.packbits) so that a chromosome of
+	10^6 bits takes 125 KB. The bits after the last gene
+	of the last byte are always 0. Crossover and mutation
+	work on the packed bytes, and a mutation flips a bit
+
+	decode() unpacks a chromosome to an array of 0s and 1s,
+	override it to pass the packed bytes instead
+	"""
+	dtype = np.uint8
+
+	def generate(self, population_size, chromosome_length):
+		"""
+		Generate a random population of shape
+		(population_size, ceil(chromosome_length / 8))
+		"""
+		population = np.random.randint(0, 256, (population_size, self.storage_length(chromosome_length)),
+									   dtype=np.uint8)
+
+		# The padding bits are 0
+		remainder = chromosome_length % 8
+		if(remainder != 0):
+			population[:, -1] &= np.uint8((0xFF << (8 - remainder)) & 0xFF)
+
+		return population
+
+	def crossover(self, mums, dads, cross_position):
+		"""
+		Single point crossover at bit positions, on the
+		packed bytes
+		"""
+		cross_position = np.asarray(cross_position)
+		byte = cross_position // 8
+		bit = cross_position % 8
+
+		# The mask selects the bits of the mum, the bytes
+		# before the cross position completely and the
+		# leading bits of the byte at the cross position
+		columns = np.arange(mums.shape[1])[np.newaxis, :]
+		mask = np.where(columns < byte[:, np.newaxis], 0xFF, 0).astype(np.uint8)
+		mask[np.arange(mums.shape[0]), byte] = (np.left_shift(0xFF, 8 - bit) & 0xFF).astype(np.uint8)
+
+		inverse = np.invert(mask)
+		sons = (mums & mask) | (dads & inverse)
+		daughters = (dads & mask) | (mums & inverse)
+
+		return sons, daughters
+
+	def mutate(self, population, chromosome_length, mutation_probability):
+		"""
+		Flip each bit of population with probability
+		mutation_probability, in place
+		"""
+		row, bit = self._mutation_positions(population, chromosome_length, mutation_probability)
+		flip = np.right_shift(0x80, bit % 8).astype(np.uint8)
+
+		# A bit drawn twice is flipped twice
+		np.bitwise_xor.at(population, (row, bit // 8), flip)
+
+	def decode(self, chromosome, chromosome_length):
+		"""
+		Unpack a chromosome to an array of chromosome_length
+		0s and 1s
+		"""
+		return np.unpackbits(np.asarray(chromosome, np.uint8))[:chromosome_length]
+
+	def storage_length(self, chromosome_length):
+		"""
+		The number of bytes of a chromosome of
+		chromosome_length bits
+		"""
+		return (chromosome_length + 7) // 8
+
+	def chromosome_length(self, storage_length):
+		"""
+		The number of bits of a chromosome of
+		storage_length bytes
+		"""
+		return storage_length * 8
@@ -0,0 +1,272 @@
+"""Docstring for engine.py
+
+This module implements a population engine that
+generates the next generation of a Genetic Algorithm
+without allocating new populations. Two buffers of the
+size of the population are allocated once, and the
+operators write the next generation from one buffer into
+the other, after which they are swapped.
+"""
+
+import numpy as np
+
+# The Population Engine class
+class PopulationEngine(object):
+	"""
+	The Population Engine Class
+	Selection, crossover and mutation that work in place
+	on two preallocated population buffers. Used by
+	GeneticAlgorithm when in_place is set
+
+	...
+
+	Parameters
+	----------
+	population_size: integer
+		The number of chromosomes in the population
+
+	chromosome_length: integer
+		The length of each chromosome
+
+	number_of_elites(optional): integer
+		The number of best chromosomes carried over to the
+		next generation unchanged
+
+	mutation_probability(optional): float
+		The probability of mutation of each allele
+
+	Attributes
+	----------
+	population: array_like
+		The current population, a view of one of the buffers.
+		It is overwritten two generations later, copy it to
+		keep it
+
+	Methods
+	-------
+	load(population)
+		Copy a population into the current buffer
+
+	step(fitness_vector)
+		Generate the next generation from the current one
+
+	Notes
+	-----
+	After construction, no array of the size of the population
+	is allocated. The operators only allocate vectors with one
+	element per chromosome(or per mutation)
+	"""
+	def __init__(self, population_size, chromosome_length, number_of_elites=0,
+				 mutation_probability=0.01):
+		"""
+		Initialization function of PopulationEngine class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		ValueError
+			If the number of offspring is not even
+		"""
+		if((population_size - number_of_elites) % 2 == 1):
+			raise ValueError("The population size and the number of elites should have the same parity")
+
+		self.__population_size = population_size
+		self.__chromosome_length = chromosome_length
+		self.number_of_elites = number_of_elites
+		self.mutation_probability = mutation_probability
+
+		# The two populations
+		self.__buffers = [np.empty((population_size, chromosome_length), np.float64),
+						  np.empty((population_size, chromosome_length), np.float64)]
+		self.__current = 0
+
+		# Scratch space of the crossover
+		half = population_size // 2
+		self.__mask = np.empty((half, chromosome_length), np.bool_)
+		self.__swap = np.empty((half, chromosome_length), np.float64)
+		self.__columns = np.arange(chromosome_length)[np.newaxis, :]
+
+		# Scratch space of the selection
+		self.__probabilities = np.empty(population_size, np.float64)
+
+	# Load a population
+	def load(self, population):
+		"""
+		Copy a population into the current buffer
+
+		Parameters
+		----------
+		population: array_like
+			A 2D array of shape (population_size, chromosome_length)
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		ValueError
+			If the shape of the population does not match
+		"""
+		population = np.asarray(population)
+		if(population.shape != self.population.shape):
+			raise ValueError("The population should have the shape " + str(self.population.shape))
+
+		np.copyto(self.population, population)
+
+	# Generate the next generation
+	def step(self, fitness_vector, evaluated=None):
+		"""
+		Generate the next generation from the current
+		population and its fitness, and make it the
+		current population
+
+		Parameters
+		----------
+		fitness_vector: array_like
+			The fitness of each chromosome of the current
+			population
+
+		evaluated(optional): array_like
+			A boolean mask of the chromosomes whose fitness
+			was evaluated, the elites are chosen from them. By
+			default all of them were
+
+		Returns
+		-------
+		population: array_like
+			The new current population
+
+		Raises
+		------
+		None
+		"""
+		current = self.__buffers[self.__current]
+		following = self.__buffers[1 - self.__current]
+
+		number_of_offspring = self.__population_size - self.number_of_elites
+
+		# The elites go to the end of the next generation
+		elite_index = None
+		if(self.number_of_elites != 0):
+			elite_fitness = fitness_vector
+			if(evaluated is not None):
+				elite_fitness = np.where(evaluated, fitness_vector, -np.inf)
+			elite_index = np.argpartition(elite_fitness, -self.number_of_elites)[-self.number_of_elites:]
+			np.take(current, elite_index, axis=0, out=following[number_of_offspring:], mode='clip')
+
+		selection = self._selection(fitness_vector, elite_index, number_of_offspring)
+		self._crossover(current, following, selection, number_of_offspring)
+		self._mutation(following, number_of_offspring)
+
+		self.__current = 1 - self.__current
+
+		return self.population
+
+	def _selection(self, fitness_vector, elite_index, number_of_offspring):
+		"""
+		Private function for roulette selection of the
+		parents, the elites are not selected
+		"""
+		probabilities = self.__probabilities
+		np.copyto(probabilities, fitness_vector)
+
+		# Normalize the fitness values to lie between 0 and 1
+		minimum = probabilities.min()
+		np.subtract(probabilities, minimum, out=probabilities)
+		if(elite_index is not None):
+			probabilities[elite_index] = 0
+
+		# Roulette on the cumulative sum
+		np.cumsum(probabilities, out=probabilities)
+		total = probabilities[-1]
+		if(not np.isfinite(total) or total <= 0):
+			# Without a usable fitness, uniform over the same candidates
+			probabilities.fill(1)
+			if(elite_index is not None):
+				probabilities[elite_index] = 0
+			np.cumsum(probabilities, out=probabilities)
+			total = probabilities[-1]
+
+		selection = np.searchsorted(probabilities, np.random.uniform(0, total, number_of_offspring),
+									side='right')
+
+		return np.minimum(selection, self.__population_size - 1, out=selection)
+
+	def _crossover(self, current, following, selection, number_of_offspring):
+		"""
+		Private function for single point crossover of the
+		selected parents into the next generation
+		"""
+		pairs = number_of_offspring // 2
+		if(pairs == 0):
+			return
+
+		# Sons in the even rows and daughters in the odd rows
+		son = following[0:number_of_offspring:2]
+		daughter = following[1:number_of_offspring:2]
+		np.take(current, selection[0::2], axis=0, out=son, mode='clip')
+		np.take(current, selection[1::2], axis=0, out=daughter, mode='clip')
+
+		if(self.__chromosome_length < 2):
+			return
+
+		# Exchange the alleles after the cross positions
+		cross_position = np.random.randint(1, self.__chromosome_length, pairs)
+		mask = self.__mask[:pairs]
+		swap = self.__swap[:pairs]
+		np.greater_equal(self.__columns, cross_position[:, np.newaxis], out=mask)
+
+		np.copyto(swap, son)
+		np.copyto(son, daughter, where=mask)
+		np.copyto(daughter, swap, where=mask)
+
+	def _mutation(self, following, number_of_offspring):
+		"""
+		Private function to mutate the offspring, only
+		the mutated alleles are touched
+		"""
+		alleles = following[:number_of_offspring].reshape(-1)
+
+		# Positions are drawn with replacement, a position drawn
+		# twice is a single mutation
+		number_of_mutations = np.random.binomial(alleles.shape[0], self.mutation_probability)
+		if(number_of_mutations != 0):
+			position = np.random.randint(0, alleles.shape[0], number_of_mutations)
+			alleles[position] = np.random.uniform(0, 1, number_of_mutations)
+
+	# Getters and Setters
+	@property
+	def population(self):
+		""" The current population """
+		return self.__buffers[self.__current]
+
+	@property
+	def population_size(self):
+		""" The number of chromosomes in the population """
+		return self.__population_size
+
+	@property
+	def chromosome_length(self):
+		""" The length of each chromosome """
+		return self.__chromosome_length
+
+	@property
+	def number_of_elites(self):
+		""" The number of elites in each generation """
+		return self._number_of_elites
+
+	@number_of_elites.setter
+	def number_of_elites(self, number_of_elites):
+		if((self.__population_size - number_of_elites) % 2 == 1 or number_of_elites < 0):
+			raise ValueError("The population size and the number of elites should have the same parity")
+
+		self._number_of_elites = number_of_elites
@@ -7,10 +7,23 @@ is required to design the fitness function.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 import warnings
 import multiprocessing
+import time
+
+# Checks for async def fitness functions
+def _is_coroutine_function(function):
+	"""
+	Private function to check whether function is a
+	coroutine function. Always False without asyncio
+	"""
+	try:
+		import asyncio
+	except ImportError:
+		return False
+
+	return asyncio.iscoroutinefunction(function)
 
 # The Genetic Algorithm class
 class GeneticAlgorithm(object):
@@ -44,7 +57,9 @@ class GeneticAlgorithm(object):
 	fitness_function: function
 		The fitness function according to which the
 		fitness of individuals are calculated
-	
+
+		On Python 3 it can be an async def function as well
+
 	population_size: integer
 		The size of the population of the Genetic Algorithm
 		
@@ -64,12 +79,45 @@ class GeneticAlgorithm(object):
 	replay_number: integer
 		An integer specifying the interval through which
 		generations should be saved.
-		
+
+	evaluation_backend: object
+		An object with an evaluate(population) method that
+		calculates the fitness of the population, for instance
+		a distributed.EvaluationCoordinator. None by default
+
+	surrogate: object
+		A surrogate model, for instance a
+		surrogate.KNNSurrogate, that pre-screens the
+		population so that only the most promising
+		chromosomes are evaluated. None by default
+
+	plotter: object
+		An object with an update(generation, max_fitness,
+		avg_fitness, min_fitness) method, for instance a
+		plotter.FitnessPlotter, that is given the statistics
+		of every generation. None by default
+
+	in_place: boolean
+		Whether the generations are generated in place, in
+		two preallocated population buffers(engine.PopulationEngine),
+		instead of allocating a new population every generation.
+		False by default
+
+	encoding: Encoding object
+		The encoding of the chromosomes, that generates,
+		crosses over, mutates and decodes them. One of
+		encoding.RealEncoding(default), encoding.BinaryEncoding
+		and encoding.IntegerEncoding
+
 	Methods
 	-------
 	run()
 		Simulate the complete run of the Genetic Algorithm
-	
+
+	run_async()
+		Simulate the complete run of the Genetic Algorithm
+		on an asyncio event loop(Python 3)
+
 	plot_fitness()
 		Function to plot the max, min and average fitness v/s
 		the generation
@@ -154,10 +202,23 @@ class GeneticAlgorithm(object):
 		# Other adjustable constants
 		self.replay_number = 25
 		self.log_folder = './log'
+		self.evaluation_backend = None
+		self.surrogate = None
+		self.plotter = None
+		self.in_place = False
+		
+		# Real genes in [0, 1] by default
+		from genetic_algorithm.encoding import RealEncoding
+		self.encoding = RealEncoding()
 		
 		# Some constants
 		self.__minimum_crossover_length = 1		# Always 1
 		self.__do_crossover = True
+		self.__engine = None
+		
+		# The chromosomes of the generation that were evaluated,
+		# None when all of them were
+		self.__evaluated = None
 		
 		# Settings to adjust some non required warnings
 		np.seterr(divide='ignore', invalid='ignore')
@@ -168,15 +229,20 @@ class GeneticAlgorithm(object):
 		Generates a new random population according to
 		the size of population and the chromsome length
 		"""
-		# Using the range
-		self.population = np.random.uniform(0, 1, 
-						  (self.population_size, self.chromosome_length))
+		# Using the range of the encoding
+		self.population = self.encoding.generate(self.population_size, self.chromosome_length)
 		
 		# Initialize the plots and the BEST individual
 		self.best_chromosome = None
 		self.best_fitness = float('-inf')
 		self.best_generation = None
-		
+
+		# Counters for the budget of the run
+		self.number_of_evaluations = 0
+		self.generation_times = []
+		self.generation_evaluations = []
+		self.time_to_completion = None
+
 		# Lists to be saved
 		self.best_chromosomes = []
 		self.generations = []
@@ -202,33 +268,144 @@ class GeneticAlgorithm(object):
 		
 		# Fitness calculated according to fitness function
 		# defined by the user
-		fitness = self.fitness_function(chromosome)
-		
+		fitness = self.fitness_function(self.encoding.decode(chromosome, self.chromosome_length))
+
+		return self._record_fitness(fitness, chromosome)
+
+	# Keeps track of the best individual
+	def _record_fitness(self, fitness, chromosome):
+		"""
+		Private function to update the best fitness
+		and best chromosome with a calculated fitness
+		"""
+		self.number_of_evaluations = self.number_of_evaluations + 1
+
 		# Determine the best fitness
 		# And when it occured the first time
 		if(fitness != self.best_fitness):
 			self.best_fitness = max(self.best_fitness, fitness)
 			if(fitness == self.best_fitness):
-				self.best_chromosome = chromosome
+				# A copy, the population may be overwritten
+				self.best_chromosome = np.array(chromosome)
 				self.best_generation = self.current_generation
-			
+
 		return fitness
+
+	# Calculates the fitness of a group of chromosomes
+	def _evaluate_population(self, population):
+		"""
+		Private function to calculate the fitness of the
+		chromosomes of population, using the evaluation
+		backend if one is set
+		"""
+		# Coroutine fitness functions are evaluated on an event loop
+		backend = self.evaluation_backend
+		if(backend is None and _is_coroutine_function(self.fitness_function)):
+			from genetic_algorithm.asynchronous import AsyncEvaluator
+			backend = AsyncEvaluator(self.fitness_function)
+
+		# Without a backend, the chromosomes are evaluated one by one
+		if(backend is None):
+			fitness_vector = [self.calculate_fitness(individual) for individual in population]
+
+			# Numpy conversion, to maintain defaut settings
+			return np.array(fitness_vector, np.float64)
+
+		# The backend gets the chromosomes decoded, as the fitness function does
+		fitness_vector = self._record_population(backend.evaluate(self._decode_population(population)),
+												 population)
+
+		# Backends that evaluate an individual more than once report so
+		if(hasattr(backend, 'last_evaluations')):
+			self.number_of_evaluations = self.number_of_evaluations + backend.last_evaluations - len(population)
+
+		return fitness_vector
+
+	# Keeps track of the best individual of a group
+	def _record_population(self, fitness_vector, population):
+		"""
+		Private function to update the best fitness and best
+		chromosome with the fitness values of a group of
+		chromosomes
+		"""
+		fitness_vector = [self._record_fitness(fitness, individual)
+						  for fitness, individual in zip(fitness_vector, population)]
+
+		# Numpy conversion, to maintain defaut settings
+		return np.array(fitness_vector, np.float64)
+
+	# Decodes a group of chromosomes
+	def _decode_population(self, population):
+		"""
+		Private function to decode the chromosomes of
+		population with the encoding, one per row, as they
+		are passed to the fitness function
+		"""
+		genes = [self.encoding.decode(chromosome, self.chromosome_length) for chromosome in population]
+		if(len(genes) == 0):
+			return np.zeros((0, self.chromosome_length))
+
+		return np.array(genes)
+
+	# Pre-screen a population with the surrogate
+	def _screen_population(self, population):
+		"""
+		Private function to select the chromosomes of
+		population that are to be evaluated. Returns their
+		indices and the predicted fitness of the population
+		"""
+		# Everyone is evaluated until the surrogate is trained
+		# A slice does not copy the population
+		if(self.surrogate is None or not self.surrogate.trained):
+			return slice(None), None
+			
+		predictions = self.surrogate.predict(self._decode_population(population))
+		
+		# The elites are appended at the end by crossover
+		elites = np.arange(len(population) - self.number_of_elites, len(population))
+		
+		return self.surrogate.screen(predictions, elites), predictions
+		
+	# Merge the evaluated and the predicted fitness
+	def _combine_screened(self, population, indices, fitness_vector, predictions):
+		"""
+		Private function to train the surrogate on the
+		evaluated chromosomes and fill in the predicted
+		fitness of the chromosomes that were not evaluated.
+		The predicted fitness is only used for the selection
+		"""
+		self.__evaluated = None
+		if(self.surrogate is None):
+			return fitness_vector
+			
+		if(predictions is not None):
+			self.surrogate.record_correlation(self.current_generation, predictions[indices],
+											  fitness_vector, len(population))
+			
+			predictions = np.array(predictions, np.float64)
+			predictions[indices] = fitness_vector
+			fitness_vector = predictions
+			
+			self.__evaluated = np.zeros(len(population), bool)
+			self.__evaluated[indices] = True
+			
+		self.surrogate.add_samples(self._decode_population(population[indices]), fitness_vector[indices])
+		
+		return fitness_vector
 		
 	# Generate the fitness value of the current population
 	def determine_fitness(self):
 		"""
 		Calculates the fitness of the entire population
 		"""
-		# Fitness vector stores the fitness of the current population
-		self.fitness_vector = []
-		
-		# Iterate over the population
-		for individual in self.population:
-			self.fitness_vector.append(self.calculate_fitness(individual))
-		
-		# Numpy conversion, to maintain defaut settings
-		self.fitness_vector = np.array(self.fitness_vector, np.float64)
+		# Only the chromosomes that pass the surrogate are evaluated
+		indices, predictions = self._screen_population(self.population)
+		fitness_vector = self._evaluate_population(self.population[indices])
 		
+		# Fitness vector stores the fitness of the current population
+		self.fitness_vector = self._combine_screened(self.population, indices,
+													 fitness_vector, predictions)
+
 		# Work on the statistics
 		self.generate_statistics()
 		
@@ -237,20 +414,28 @@ class GeneticAlgorithm(object):
 		"""
 		Generates and prints the relevant statistics
 		"""
+		# The statistics are of the evaluated chromosomes, a
+		# predicted fitness of the surrogate is not reported
+		fitness_vector = self.fitness_vector
+		population = self.population
+		if(self.__evaluated is not None):
+			fitness_vector = fitness_vector[self.__evaluated]
+			population = population[self.__evaluated]
+		
 		# Get some statistics and print
-		min_fitness = self.fitness_vector.min()
-		max_fitness = self.fitness_vector.max()
-		sum_fitness = np.sum(self.fitness_vector)
+		min_fitness = fitness_vector.min()
+		max_fitness = fitness_vector.max()
+		avg_fitness = np.sum(fitness_vector) / len(fitness_vector)
 		
 		# Append to best chromsomes
-		self.best_chromosomes.append(self.population[
-		                      np.where(self.fitness_vector == np.amax(self.fitness_vector))
+		self.best_chromosomes.append(population[
+		                      np.where(fitness_vector == np.amax(fitness_vector))
 		                      ][0])
 		
 		# Append to statistics: Generation, Max Fitness, Average Fitness,
 		# Min Fitness and Best Chromosome of the generation
 		self.__statistics.append([self.current_generation, max_fitness, 
-								  sum_fitness / self.population_size, min_fitness])
+								  avg_fitness, min_fitness])
 		
 		print("{: <10} {: >20} {: >20} {: >20}".format(*self.__statistics[
 		 										self.current_generation - self.generation_start + 1
@@ -259,12 +444,25 @@ class GeneticAlgorithm(object):
 		# Append to plots
 		self.min_fitness.append(min_fitness)
 		self.max_fitness.append(max_fitness)
-		self.avg_fitness.append(sum_fitness / self.population_size)
+		self.avg_fitness.append(avg_fitness)
+		
+		# Hand over to the plotter
+		if(self.plotter is not None):
+			self.plotter.update(self.current_generation + 1, max_fitness,
+								avg_fitness, min_fitness)
+		
+		# The population engine selects on the fitness itself
+		if(self.in_place):
+			return
 		
 		# Remove the elites from the calculation
 		if(self.number_of_elites != 0):
-			# Paritition the list and get the best individuals(number_of_elites)
-			elite_index = np.argpartition(self.fitness_vector, -self.number_of_elites)[-self.number_of_elites:]
+			# Paritition the list and get the best individuals(number_of_elites),
+			# of the evaluated chromosomes
+			elite_fitness = self.fitness_vector
+			if(self.__evaluated is not None):
+				elite_fitness = np.where(self.__evaluated, self.fitness_vector, -np.inf)
+			elite_index = np.argpartition(elite_fitness, -self.number_of_elites)[-self.number_of_elites:]
 			# Get the chromosomes of elites
 			self.elites = self.population[elite_index]
 			# Delete the elites from current population
@@ -311,26 +509,22 @@ class GeneticAlgorithm(object):
 		if(self.__do_crossover == False):
 			return
 		
-		# New population
-		new_population = []
 		# Based on the roullete selection, we crossover mum and dad
-		for index in range(0, self.population_size - self.number_of_elites, 2):
-			mum = self.population[self.roullete_selection[index]]
-			dad = self.population[self.roullete_selection[index + 1]]
-			
-			cross_position = np.random.randint(self.__minimum_crossover_length, 
-											   self.chromosome_length)
-			
-			# Cross over
-			son = np.concatenate([mum[:cross_position], dad[cross_position:]])
-			daughter = np.concatenate([dad[:cross_position], mum[cross_position:]])
-			
-			# Append to new population
-			new_population.append(son); new_population.append(daughter)
-			
+		effective_population = self.population_size - self.number_of_elites
+		mums = self.population[self.roullete_selection[0:effective_population:2]]
+		dads = self.population[self.roullete_selection[1:effective_population:2]]
+		
+		cross_position = np.random.randint(self.__minimum_crossover_length, 
+										   self.chromosome_length, mums.shape[0])
+		
+		# Cross over, all the pairs together
+		sons, daughters = self.encoding.crossover(mums, dads, cross_position)
+		
 		# The offsprings are the new population now
 		# Along with the elites
-		self.population = np.array(new_population)
+		self.population = np.empty((2 * sons.shape[0], sons.shape[1]), sons.dtype)
+		self.population[0::2] = sons
+		self.population[1::2] = daughters
 		try:
 			self.population = np.concatenate([self.population, self.elites])
 		except AttributeError:
@@ -342,16 +536,11 @@ class GeneticAlgorithm(object):
 		Mutate the alleles of a generation according
 		to the probability of mutation
 		"""
-		# Iterate over all the elements
-		for row in range(self.population.shape[0] - self.number_of_elites):
-			for column in range(self.population.shape[1]):
-				# Mutate or not
-				mutate = np.random.choice(2, 1, p = [1 - self.mutation_probability, 
-													 self.mutation_probability
-													])
-				if(mutate[0] == 1):
-					# Mutate
-					self.population[row, column] = np.random.uniform(0, 1)
+		# The elites are not mutated
+		offspring = self.population[:self.population.shape[0] - self.number_of_elites]
+		
+		# Only the mutated alleles are drawn
+		self.encoding.mutate(offspring, self.chromosome_length, self.mutation_probability)
 				
 	# Plotting Function
 	def plot_fitness(self, filename, show=False):
@@ -359,9 +548,17 @@ class GeneticAlgorithm(object):
 		Plots the Fitness statistics of a population
 		as a function of generation
 		"""
+		# matplotlib is imported at the first plot, the workers
+		# and headless runs that do not plot never load it
+		import matplotlib.pyplot as plt
+		
 		# Generate the range of Generations
 		generations = range(self.generation_start, self.current_generation + 2)
 		
+		# A new figure, so that the lines of previous
+		# calls are not drawn again
+		figure = plt.figure()
+		
 		# Plot Max Fitness
 		plt.plot(generations, self.max_fitness, label="MAX")
 		
@@ -384,6 +581,8 @@ class GeneticAlgorithm(object):
 		if(show == True):
 			plt.show()
 		
+		plt.close(figure)
+		
 	# Function to save statistics
 	def save_statistics(self, filename):
 		"""
@@ -423,11 +622,16 @@ class GeneticAlgorithm(object):
 		# Convert to numpy array
 		chromosome = np.array(chromosome)
 		
+		# Integer and binary chromosomes are saved as integers
+		fmt = "%.10f"
+		if(np.issubdtype(chromosome.dtype, np.integer)):
+			fmt = "%d"
+		
 		# Save the chromosome to a txt file
 		if(header == None):
-			np.savetxt(filename + '.txt', chromosome, fmt="%.10f", delimiter=' , ')
+			np.savetxt(filename + '.txt', chromosome, fmt=fmt, delimiter=' , ')
 		else:
-			np.savetxt(filename + '.txt', chromosome, fmt="%.10f", delimiter=' , ', header=header)
+			np.savetxt(filename + '.txt', chromosome, fmt=fmt, delimiter=' , ', header=header)
 			
 	# Function to load the chromosomes of a
 	# generation and the parameters
@@ -475,12 +679,13 @@ class GeneticAlgorithm(object):
 		filename = self.log_folder + '/generation' + str(start)
 		
 		# Load the file
-		self.population = self.load_chromosome(filename)
+		self.population = self.encoding.convert(self.load_chromosome(filename))
 		self.generations[0] = self.population
 		
 		# Make the parameters same
 		self.population_size = self.population.shape[0]
-		self.chromosome_length = self.population.shape[1]
+		if(self.encoding.storage_length(self.chromosome_length) != self.population.shape[1]):
+			self.chromosome_length = self.encoding.chromosome_length(self.population.shape[1])
 		self.generation_start = start + 1
 		
 		# Load the best chromosome and fitness as well!
@@ -502,18 +707,23 @@ class GeneticAlgorithm(object):
 			pass
 	
 	# Run the complete Genetic Algorithm
-	def run(self, start=0):
+	def run(self, start=0, deadline=None, max_evaluations=None):
 		"""
 		Simulate the complete run of the algorithm
 		
 		Parameters
 		----------
-		filename(optional): string
-			A filename specifying from what parameters
-			or generation to start the algorithm
-			
-			The filename should be the same as generated
+		start(optional): integer
+			The generation from which to resume. The
+			generation file should be the same as generated
 			by the algorithm.
+			
+		deadline(optional): float
+			The wall-clock time, as returned by time.time(),
+			by which the run should stop
+			
+		max_evaluations(optional): integer
+			The maximum number of fitness evaluations
 		
 		Returns
 		-------
@@ -524,6 +734,85 @@ class GeneticAlgorithm(object):
 		Raises
 		------
 		None
+		
+		Notes
+		-----
+		The budget is checked between generations. A generation
+		is not started if it would exceed max_evaluations, or if
+		its projected duration(the average duration of the
+		generations so far) would end after the deadline. The
+		population is then saved as a checkpoint to resume from
+		and the best chromosome so far is returned
+		"""
+		self._start_run(start)
+		
+		# Keep going through generations with selection,
+		# crossover and mutation
+		for generation in range(self.generation_start, self.number_of_generations + 1):
+			# For statistics
+			self.current_generation = generation - 1
+			
+			# Stop at the budget
+			if(self._budget_exhausted(deadline, max_evaluations)):
+				self._stop_run(generation)
+				break
+			
+			generation_time = time.time()
+			
+			# Determine the fitness of all the individuals
+			self.determine_fitness()
+			
+			# Generate the next generation
+			self._advance_generation(generation)
+			
+			self._record_generation_time(generation, time.time() - generation_time)
+		
+		return self._end_run()
+		
+	# Run the complete Genetic Algorithm
+	# on an asyncio event loop
+	def run_async(self, start=0, loop=None, deadline=None, max_evaluations=None):
+		"""
+		Simulate the complete run of the algorithm on
+		an asyncio event loop
+		
+		Parameters
+		----------
+		start(optional): integer
+			The generation from which to resume
+			
+		deadline(optional): float
+			The wall-clock time by which the run should stop
+			
+		max_evaluations(optional): integer
+			The maximum number of fitness evaluations
+			
+		loop(optional): asyncio event loop
+			The event loop on which to run, by default
+			the current event loop
+		
+		Returns
+		-------
+		future: asyncio Future
+			A future that resolves to the best chromosome,
+			await it from a coroutine. Cancelling it cancels
+			the evaluations in progress
+			
+		Raises
+		------
+		ImportError
+			If asyncio is not available(Python 2)
+		"""
+		from genetic_algorithm.asynchronous import run_genetic_algorithm
+		
+		return run_genetic_algorithm(self, start, loop, deadline, max_evaluations)
+		
+	# Prepare the variables for a run
+	def _start_run(self, start):
+		"""
+		Private function to generate the population,
+		print the legend and load the generation to
+		start from
 		"""
 		# Make a directory if it does not exist
 		if not os.path.exists(self.log_folder):
@@ -545,17 +834,16 @@ class GeneticAlgorithm(object):
 		if(start != 0):
 			self.load_generation(start)
 			
-		delete_process = None
-		
-		# Keep going through generations with selection,
-		# crossover and mutation
-		for generation in range(self.generation_start, self.number_of_generations + 1):
-			# For statistics
-			self.current_generation = generation - 1
-			
-			# Determine the fitness of all the individuals
-			self.determine_fitness()
-			
+	# Generate the next generation
+	def _advance_generation(self, generation):
+		"""
+		Private function to select, crossover and mutate
+		the evaluated population and save the result
+		"""
+		if(self.in_place):
+			# Selection, crossover and mutation in place
+			self.population = self._population_engine().step(self.fitness_vector, self.__evaluated)
+		else:
 			# Select the individuals for crossover
 			self.selection()
 			
@@ -567,24 +855,134 @@ class GeneticAlgorithm(object):
 			
 			# Append to generations
 			self.generations.append(self.population)
+		
+		# Save the current generation
+		self.save_handler()
+		
+		# Delete the previous one
+		# In a sepearate process
+		if(generation % self.replay_number != 2):
+			delete_process = multiprocessing.Process(target=self.remove_chromosome,
+							 args=(self.log_folder + '/generation' + str(self.current_generation-1),))
+							 			
+			delete_process.start()
 			
-			# Save the current generation
-			self.save_handler()
-			
-			# Delete the previous one
-			# In a sepearate process
-			if(generation % self.replay_number != 2):
-				delete_process = multiprocessing.Process(target=self.remove_chromosome,
-								 args=(self.log_folder + '/generation' + str(self.current_generation-1),))
-								 			
-				delete_process.start()
+	# The engine for in place generations
+	def _population_engine(self):
+		"""
+		Private function to return the population engine,
+		allocating it when the population does not fit
+		"""
+		from genetic_algorithm.engine import PopulationEngine
+		from genetic_algorithm.encoding import RealEncoding
+		
+		# The buffers hold real genes
+		if(not isinstance(self.encoding, RealEncoding)):
+			raise ValueError("Generations can only be generated in place with the real encoding")
 		
+		engine = self.__engine
+		if(engine is None or engine.population.shape != self.population.shape or
+		   engine.number_of_elites != self.number_of_elites):
+			engine = PopulationEngine(self.population.shape[0], self.population.shape[1],
+									  self.number_of_elites, self.mutation_probability)
+			self.__engine = engine
+		
+		# A population that is not in the buffers, the first one
+		if(self.population is not engine.population):
+			engine.load(self.population)
+		
+		engine.mutation_probability = self.mutation_probability
+		
+		return engine
+		
+	# Finish a run
+	def _end_run(self):
+		"""
+		Private function to print the best fitness
+		and return the best chromosome
+		"""
 		# Print the best fitness and return the chromosome
 		print("The best fitness value acheived is: " + str(self.best_fitness))
 		print("Found in generation # " + str(self.best_generation))
-		
+
 		return self.best_chromosome
-	
+
+	# Check the budget of the run
+	def _budget_exhausted(self, deadline, max_evaluations):
+		"""
+		Private function to check whether the next generation
+		can be completed within the deadline and the maximum
+		number of evaluations. A backend with an evaluation_budget
+		is limited to the evaluations that are left
+		"""
+		remaining_evaluations = None
+		if(max_evaluations is not None):
+			remaining_evaluations = max_evaluations - self.number_of_evaluations
+
+		# Backends that evaluate an individual more than once stop at the budget
+		if(hasattr(self.evaluation_backend, 'evaluation_budget')):
+			self.evaluation_backend.evaluation_budget = remaining_evaluations
+
+		# The next generation needs as many evaluations as the last one,
+		# and at least one for each individual
+		if(remaining_evaluations is not None):
+			generation_cost = self.population_size
+			if(len(self.generation_evaluations) != 0):
+				generation_cost = max(generation_cost, self.generation_evaluations[-1])
+
+			if(generation_cost > remaining_evaluations):
+				return True
+
+		if(deadline is not None):
+			# Projected from the generations measured so far
+			generation_cost = 0
+			if(len(self.generation_times) != 0):
+				generation_cost = np.mean(self.generation_times)
+
+			if(time.time() + generation_cost > deadline):
+				return True
+
+		return False
+
+	# Keep the time taken by the generations
+	def _record_generation_time(self, generation, generation_time):
+		"""
+		Private function to save the time and the evaluations
+		taken by a generation and project the time to complete
+		the run
+		"""
+		self.generation_times.append(generation_time)
+		self.generation_evaluations.append(self.number_of_evaluations - sum(self.generation_evaluations))
+
+		remaining_generations = self.number_of_generations - generation
+		self.time_to_completion = remaining_generations * np.mean(self.generation_times)
+
+	# Stop the run before it is complete
+	def _stop_run(self, generation):
+		"""
+		Private function to save a checkpoint and report
+		when the budget of the run is exhausted
+		"""
+		# The population of this generation is not evaluated yet,
+		# resuming from generation - 1 starts with it
+		self.save_chromosome(self.population,
+							 self.log_folder + '/generation' + str(generation - 1),
+							 header='Generation #' + str(generation - 1))
+
+		try:
+			self.save_statistics(self.log_folder + '/stats')
+			self.save_chromosome(self.best_chromosomes, self.log_folder + '/best_chromosomes')
+			self.save_chromosome(np.array([self.best_chromosome]),
+								 self.log_folder + '/current_best',
+								 header="Found in generation #" + str(self.best_generation))
+		except (AttributeError, TypeError):
+			pass
+
+		print("The budget is exhausted after " + str(self.number_of_evaluations) + " evaluations")
+		if(self.time_to_completion is not None):
+			print("Projected time to complete the run: " + str(self.time_to_completion) + " seconds")
+		print("Resume from generation # " + str(generation - 1))
+
 	# Function that is run to save
 	# the current generation
 	def save_handler(self):
@@ -598,9 +996,19 @@ class GeneticAlgorithm(object):
 			self.save_chromosome(self.best_chromosomes, self.log_folder + '/best_chromosomes')
 		except AttributeError:
 			pass
+			
+		# Save how well the surrogate ranks the population
+		if(self.surrogate is not None):
+			self.surrogate.save_report(self.log_folder + '/surrogate')
 		
 		# Save the current generation chromosomes
-		self.save_chromosome(self.generations[self.current_generation - self.generation_start], 
+		# In place, only the current population is kept
+		if(self.in_place):
+			population = self.population
+		else:
+			population = self.generations[self.current_generation - self.generation_start]
+		
+		self.save_chromosome(population, 
 							 self.log_folder + '/generation' + str(self.current_generation), 
 							 header='Generation #' + str(self.current_generation))
 		
@@ -716,7 +1124,90 @@ class GeneticAlgorithm(object):
 	@log_folder.setter
 	def log_folder(self, path):
 		self._log_folder = path
-			
+
+	@property
+	def evaluation_backend(self):
+		"""
+		Attribute to specify the backend that calculates
+		the fitness of the population
+
+		The backend is required to have a method evaluate,
+		that takes a 2D array of chromosomes and returns
+		their fitness values. None evaluates the chromosomes
+		one by one with the fitness function
+		"""
+		return self._evaluation_backend
+
+	@evaluation_backend.setter
+	def evaluation_backend(self, backend):
+		if(backend is not None and not hasattr(backend, 'evaluate')):
+			raise TypeError("The evaluation backend needs to contain a method evaluate")
+
+		self._evaluation_backend = backend
+
+	@property
+	def surrogate(self):
+		"""
+		Attribute to specify the surrogate model that
+		pre-screens the population
+
+		The surrogate is required to have the methods
+		predict, screen, add_samples, record_correlation
+		and save_report and the attribute trained, like
+		surrogate.KNNSurrogate. The chromosomes that are
+		not evaluated get their predicted fitness, and do
+		not count as evaluations or as the best chromosome
+		"""
+		return self._surrogate
+
+	@surrogate.setter
+	def surrogate(self, surrogate):
+		if(surrogate is not None and not (hasattr(surrogate, 'predict') and
+										   hasattr(surrogate, 'screen'))):
+			raise TypeError("The surrogate needs to contain the methods predict and screen")
+
+		self._surrogate = surrogate
+
+	@property
+	def plotter(self):
+		"""
+		Attribute to specify the plotter that is given
+		the statistics of every generation
+
+		The plotter is required to have a method update,
+		that takes the generation, the maximum, average and
+		minimum fitness. It should return quickly, as it
+		is called from the training loop
+		"""
+		return self._plotter
+
+	@plotter.setter
+	def plotter(self, plotter):
+		if(plotter is not None and not hasattr(plotter, 'update')):
+			raise TypeError("The plotter needs to contain a method update")
+
+		self._plotter = plotter
+
+	@property
+	def encoding(self):
+		"""
+		Attribute to specify the encoding of the chromosomes
+
+		The fitness function, an evaluation backend and a
+		surrogate get the chromosomes decoded by
+		encoding.decode(). The best chromosome and the saved
+		generations are not decoded
+		"""
+		return self._encoding
+
+	@encoding.setter
+	def encoding(self, encoding):
+		for method in ['generate', 'crossover', 'mutate', 'decode']:
+			if(not hasattr(encoding, method)):
+				raise TypeError("The encoding needs to contain a method " + method)
+
+		self._encoding = encoding
+
 	@property
 	def fitness_function(self):
 		""" Attribute for the fitness function 
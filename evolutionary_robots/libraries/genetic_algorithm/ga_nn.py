@@ -42,6 +42,10 @@ class GeneticAlgorithmNN(GeneticAlgorithm):
 		To calculate the output of the Neural Network
 		according to the chromosome and the input
 		
+	calculate_output_population(input_dictionary, population)
+		To calculate the output of the Neural Network
+		according to each chromosome of a population
+		
 	convert_chromosome(chromosome):
 		Function to make the chromosome ready for
 		use with neural network
@@ -147,16 +151,55 @@ class GeneticAlgorithmNN(GeneticAlgorithm):
 		None
 		"""
 		
-		chromosome_list = self.convert_chromosome(chromosome)
-		self.neural_network.load_parameters_from_vector(chromosome_list)
+		# The chromosome is in the layout of the parameter buffer
+		self.neural_network.load_parameters(self._interpolate_range(chromosome))
 		output = self.neural_network.forward_propagate(input_dictionary)
 		
 		return output
 		
+	def calculate_output_population(self, input_dictionary, population):
+		"""
+		Function to calculate the output of the
+		Neural Network for each chromosome of a
+		population, in a single call
+		
+		Parameters
+		----------
+		input_dictionary: dictionary
+			Dictionary specfying the input to various
+			sensors, the same for each chromosome.
+			Arrays of dimensions (B, n) are a batch
+			
+		population: array-like
+			A 2D array specifying a chromosome in
+			each row, as passed to calculate_output
+			
+		Returns
+		-------
+		output: dictionary
+			Dictionary specifying the outputs, with
+			the output of each chromosome in a row
+			
+		Raises
+		------
+		None
+		
+		Notes
+		-----
+		Each layer evaluates all the chromosomes with
+		a single batched matrix product. The chromosomes
+		are not loaded in the network
+		"""
+		chromosome_list = self.convert_chromosome(np.asarray(population))
+		output = self.neural_network.forward_population(input_dictionary, chromosome_list)
+		
+		return output
+		
 	def convert_chromosome(self, chromosome):
 		"""
 		Function to make the chromosome ready for
-		use with neural network
+		use with neural network. A population is
+		converted column wise
 		"""
 		# Load the parameters and calculate the output
 		chromosome = self._interpolate_range(chromosome)
@@ -165,7 +208,7 @@ class GeneticAlgorithmNN(GeneticAlgorithm):
 		chromosome_list = []
 		dimension_index = 0
 		for dimension in self.dimension_vector:
-			chromosome_list.append(chromosome[dimension_index : dimension_index + dimension])
+			chromosome_list.append(chromosome[..., dimension_index : dimension_index + dimension])
 			dimension_index = dimension_index + dimension
 			
 		return chromosome_list
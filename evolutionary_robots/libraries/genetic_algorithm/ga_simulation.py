@@ -6,7 +6,6 @@ Academy Template simulation
 """
 
 import numpy as np
-from copy import deepcopy
 from genetic_algorithm.ga_nn import GeneticAlgorithmNN
 
 class GeneticAlgorithmGazebo(GeneticAlgorithmNN):
@@ -40,7 +39,8 @@ class GeneticAlgorithmGazebo(GeneticAlgorithmNN):
 		require to change too much.
 		
 		Takes in a list of paramters and converts
-		it to the required neural network
+		it to the required neural network, a replica
+		of neural_network that is reused in place
 		
 	Rest of the attributes are the same
 	
@@ -142,9 +142,13 @@ class GeneticAlgorithmGazebo(GeneticAlgorithmNN):
 		except ValueError:
 			raise ValueError("Pass individual and index")
 			
-		ready_individual = self.convert_chromosome(individual)
-		self.neural_network.load_parameters_from_vector(ready_individual)
-		self._test_network[index] = deepcopy(self.neural_network)
+		# A replica is generated once and reused for each individual
+		if(self._test_network[index] is None):
+			self._test_network[index] = self.neural_network.replicate()
+		else:
+			self._test_network[index].reset()
+			
+		self._test_network[index].load_parameters(self._interpolate_range(individual))
 		
 	@property
 	def evaluation_steps(self):
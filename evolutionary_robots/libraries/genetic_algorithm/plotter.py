@@ -0,0 +1,352 @@
+"""Docstring for plotter.py
+
+This module implements a fitness plotter that renders
+on the Agg backend in a background thread. The training
+thread only hands over the statistics of each generation,
+and the rendered image is kept in memory so that a GUI
+can display it without reading a file. While the new
+points fit in the axes, only their segments are drawn
+over the previous image.
+"""
+
+import threading
+import time
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# The Fitness Plotter class
+class FitnessPlotter(object):
+	"""
+	The Fitness Plotter Class
+	Plots the maximum, average and minimum fitness against
+	the generation, in a background thread
+
+	...
+
+	Parameters
+	----------
+	max_fps(optional): float
+		The maximum number of times per second the plot
+		is rendered
+
+	size(optional): tuple
+		The (width, height) of the image in pixels
+
+	dpi(optional): integer
+		The dots per inch of the figure
+
+	Attributes
+	----------
+	image: array_like
+		The latest rendered image, an RGB array of shape
+		(height, width, 3). None before the first render
+
+	frame_number: integer
+		The number of times the plot has been rendered
+
+	full_draws: integer
+		The number of renders that drew the complete figure,
+		when the axes are rescaled. The other renders only
+		draw the segments of the new points
+
+	Methods
+	-------
+	start()
+		Start the rendering thread
+
+	stop()
+		Render the remaining points and stop the thread
+
+	update(generation, max_fitness, avg_fitness, min_fitness)
+		Add the statistics of a generation to the plot
+
+	render()
+		Render the plot with the points added so far
+
+	save(filename)
+		Save the latest rendered image to a png file
+	"""
+	def __init__(self, max_fps=2, size=(400, 391), dpi=100):
+		"""
+		Initialization function of FitnessPlotter class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.max_fps = max_fps
+		self.frame_number = 0
+		self.full_draws = 0
+
+		# The figure is not attached to pyplot, so the
+		# plots of different runs do not mix
+		self.__figure = Figure(figsize=(float(size[0]) / dpi, float(size[1]) / dpi), dpi=dpi)
+		self.__canvas = FigureCanvasAgg(self.__figure)
+		self.__axes = self.__figure.add_subplot(111)
+		self.__axes.set_xlabel('Generations')
+		self.__axes.set_ylabel('Fitness Value')
+		self.__axes.set_title("Fitness Plot")
+
+		self.__lines = [self.__axes.plot([], [], label=label)[0]
+						for label in ["MAX", "MIN", "AVERAGE"]]
+		self.__legend = self.__axes.legend()
+
+		# The new segments of the lines, left out of the complete draws
+		self.__segments = [self.__axes.plot([], [], color=line.get_color(), animated=True)[0]
+						   for line in self.__lines]
+		self.__drawn = False
+
+		# Data of the lines and the points not drawn yet
+		self.__data = np.zeros((0, 4))
+		self.__pending = []
+		self.__image = None
+
+		self.__lock = threading.Lock()
+		self.__new_points = threading.Event()
+		self.__running = False
+		self.__thread = None
+
+	# Start the thread
+	def start(self):
+		"""
+		Start the thread that renders the plot whenever
+		new points are added
+
+		Parameters
+		----------
+		None
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		if(self.__running):
+			return
+
+		self.__running = True
+		self.__thread = threading.Thread(target=self._render_loop)
+		self.__thread.daemon = True
+		self.__thread.start()
+
+	# Stop the thread
+	def stop(self):
+		"""
+		Stop the rendering thread, after rendering the
+		points that are pending
+
+		Parameters
+		----------
+		None
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		if(not self.__running):
+			return
+
+		self.__running = False
+		self.__new_points.set()
+		self.__thread.join()
+		self.__thread = None
+
+	# Add the statistics of a generation
+	def update(self, generation, max_fitness, avg_fitness, min_fitness):
+		"""
+		Add the statistics of a generation. Only stores
+		the values, so it is cheap to call from the
+		training thread
+
+		Parameters
+		----------
+		generation: integer
+			The generation number
+
+		max_fitness, avg_fitness, min_fitness: float
+			The statistics of the generation
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		with self.__lock:
+			self.__pending.append([generation, max_fitness, min_fitness, avg_fitness])
+
+		self.__new_points.set()
+
+	# Render the plot
+	def render(self):
+		"""
+		Render the plot with the points added so far,
+		and publish the image
+
+		Parameters
+		----------
+		None
+
+		Returns
+		-------
+		image: array_like
+			The rendered RGB image, the latest one if no
+			points were added since
+
+		Raises
+		------
+		None
+		"""
+		with self.__lock:
+			pending = self.__pending
+			self.__pending = []
+
+			# Nothing new to draw, the latest image stands
+			if(len(pending) == 0 and self.__drawn):
+				return self.__image
+
+		# Only the new points are added to the existing lines
+		points = np.array(pending, np.float64).reshape(-1, 4)
+		previous = self.__data[-1:]
+		self.__data = np.concatenate([self.__data, points])
+		for column, line in enumerate(self.__lines):
+			line.set_data(self.__data[:, 0], self.__data[:, column + 1])
+
+		if(self.__drawn and self._within_limits(points)):
+			# Draw the new segments over the previous image, and
+			# the legend over them
+			segments = np.concatenate([previous, points])
+			for column, segment in enumerate(self.__segments):
+				segment.set_data(segments[:, 0], segments[:, column + 1])
+				self.__axes.draw_artist(segment)
+			self.__axes.draw_artist(self.__legend)
+		else:
+			if(len(self.__data) != 0):
+				self._rescale()
+
+			self.__canvas.draw()
+			self.__drawn = True
+			self.full_draws = self.full_draws + 1
+
+		# Copy the RGB channels out of the Agg buffer
+		width, height = self.__canvas.get_width_height()
+		buffer = np.frombuffer(self.__canvas.buffer_rgba(), np.uint8)
+		image = buffer.reshape(height, width, 4)[:, :, :3].copy()
+
+		with self.__lock:
+			self.__image = image
+			self.frame_number = self.frame_number + 1
+
+		return image
+
+	# Save the image
+	def save(self, filename):
+		"""
+		Save the plot to a png file
+
+		Parameters
+		----------
+		filename: string
+			The name of the file, without extension
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.__figure.savefig(filename + '.png')
+
+	# Check the points against the axes
+	def _within_limits(self, points):
+		"""
+		Private function to check whether the points lie
+		within the current limits of the axes
+		"""
+		x_low, x_high = self.__axes.get_xlim()
+		y_low, y_high = self.__axes.get_ylim()
+		values = points[:, 1:]
+
+		return (points[:, 0].min() >= x_low and points[:, 0].max() <= x_high and
+				values.min() >= y_low and values.max() <= y_high)
+
+	# Set the limits of the axes
+	def _rescale(self):
+		"""
+		Private function to fit the limits of the axes to
+		the data, with room for the next points so that
+		they are drawn without a complete draw
+		"""
+		generations = self.__data[:, 0]
+		values = self.__data[:, 1:]
+
+		span = max(generations.max() - generations.min(), 1)
+		self.__axes.set_xlim(generations.min(), generations.min() + 2 * span)
+
+		low, high = values.min(), values.max()
+		margin = 0.25 * (high - low) if high > low else 0.25 * max(abs(high), 1)
+		self.__axes.set_ylim(low - margin, high + margin)
+
+	# The loop of the rendering thread
+	def _render_loop(self):
+		"""
+		Private function that renders the plot whenever
+		there are new points, at most max_fps times a second
+		"""
+		last_render = 0
+		while(self.__running):
+			self.__new_points.wait()
+			self.__new_points.clear()
+
+			# Throttle, the points that arrive meanwhile
+			# are drawn together
+			delay = last_render + 1.0 / self.max_fps - time.time()
+			if(delay > 0 and self.__running):
+				time.sleep(delay)
+
+			self.render()
+			last_render = time.time()
+
+		# Whatever arrived while stopping
+		if(len(self.__pending) != 0):
+			self.render()
+
+	# Getters and Setters
+	@property
+	def image(self):
+		""" The latest rendered RGB image """
+		with self.__lock:
+			return self.__image
+
+	@property
+	def max_fps(self):
+		""" The maximum number of renders per second """
+		return self._max_fps
+
+	@max_fps.setter
+	def max_fps(self, max_fps):
+		if(max_fps <= 0):
+			max_fps = 2
+
+		self._max_fps = float(max_fps)
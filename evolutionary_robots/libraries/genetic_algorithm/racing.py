@@ -0,0 +1,243 @@
+"""Docstring for racing.py
+
+This module implements a racing evaluation scheduler
+for stochastic fitness functions. Instead of averaging
+the same number of evaluations for every individual,
+extra evaluations are only given to the individuals
+whose confidence intervals overlap the boundary between
+the elites and the rest of the population.
+"""
+
+import numpy as np
+
+# The Racing Evaluator class
+class RacingEvaluator(object):
+	"""
+	The Racing Evaluator Class
+	Calculates the fitness of a population with a noisy
+	fitness function, re-evaluating only the individuals
+	whose rank is uncertain. It can be used as an evaluation
+	backend of GeneticAlgorithm
+
+	...
+
+	Parameters
+	----------
+	fitness_function(optional): function
+		The noisy fitness function, taking a single chromosome
+		and returning its fitness value
+
+	backend(optional): object
+		An evaluation backend(with an evaluate(population) method)
+		used instead of the fitness function, for instance
+		a distributed.EvaluationCoordinator
+
+	number_of_elites(optional): integer
+		The number of individuals considered to be elites
+
+	initial_evaluations(optional): integer
+		The number of evaluations given to every individual
+
+	maximum_evaluations(optional): integer
+		The maximum number of evaluations of an individual
+
+	z_score(optional): float
+		The half width of the confidence intervals, in
+		standard errors. 1.96 is roughly 95% confidence
+
+	Attributes
+	----------
+	evaluation_budget: integer
+		The maximum number of evaluations of the next
+		population, None for no limit. GeneticAlgorithm.run
+		sets it to the evaluations left of max_evaluations
+
+	mean: array_like
+		The running mean of the fitness of each individual
+		of the last population
+
+	variance: array_like
+		The running sample variance of the fitness of each
+		individual of the last population
+
+	evaluations: array_like
+		The number of evaluations of each individual of the
+		last population
+
+	last_evaluations: integer
+		The number of evaluations spent on the last population
+
+	evaluations_used: integer
+		The total number of evaluations spent
+
+	evaluations_saved: integer
+		The total number of evaluations saved compared to
+		evaluating every individual maximum_evaluations times
+
+	Methods
+	-------
+	evaluate(population)
+		Calculate the mean fitness of the population
+	"""
+	def __init__(self, fitness_function=None, backend=None, number_of_elites=1,
+				 initial_evaluations=2, maximum_evaluations=10, z_score=1.96):
+		"""
+		Initialization function of RacingEvaluator class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		ValueError
+			If neither a fitness function nor a backend is given
+		"""
+		if(fitness_function is None and backend is None):
+			raise ValueError("A fitness function or a backend is required for racing")
+
+		self.fitness_function = fitness_function
+		self.backend = backend
+		self.number_of_elites = number_of_elites
+		self.initial_evaluations = initial_evaluations
+		self.maximum_evaluations = maximum_evaluations
+		self.z_score = z_score
+
+		self.evaluation_budget = None
+		self.evaluations_used = 0
+		self.evaluations_saved = 0
+		self.last_evaluations = 0
+
+	def _sample(self, chromosomes):
+		"""
+		Private function to evaluate each chromosome once
+		"""
+		if(self.backend is not None):
+			return np.asarray(self.backend.evaluate(chromosomes), np.float64)
+
+		return np.array([self.fitness_function(chromosome) for chromosome in chromosomes], np.float64)
+
+	def _update(self, indices, samples):
+		"""
+		Private function to update the running mean and
+		variance with new samples(Welford's algorithm)
+		"""
+		self.evaluations[indices] = self.evaluations[indices] + 1
+		delta = samples - self.mean[indices]
+		self.mean[indices] = self.mean[indices] + delta / self.evaluations[indices]
+		self.__squares[indices] = self.__squares[indices] + delta * (samples - self.mean[indices])
+
+		self.last_evaluations = self.last_evaluations + len(indices)
+
+	def evaluate(self, population):
+		"""
+		Calculate the mean fitness of the population, racing
+		the individuals around the elite boundary
+
+		Parameters
+		----------
+		population: array_like
+			A 2D array with one chromosome per row
+
+		Returns
+		-------
+		fitness_vector: array_like
+			The mean fitness value of each chromosome
+
+		Raises
+		------
+		None
+
+		Notes
+		-----
+		Every individual is evaluated initial_evaluations times.
+		Then, while any confidence interval
+		mean +- z_score * standard_error contains the boundary
+		between the number_of_elites best means and the rest,
+		those individuals are evaluated once more, up to
+		maximum_evaluations times each. With an evaluation_budget,
+		the initial evaluations are reduced to the rounds that
+		fit(at least one) and the race stops when the next
+		round does not fit
+		"""
+		population = np.asarray(population)
+		size = population.shape[0]
+
+		self.mean = np.zeros(size, np.float64)
+		self.evaluations = np.zeros(size, np.int64)
+		self.__squares = np.zeros(size, np.float64)
+		self.last_evaluations = 0
+
+		# Everyone gets the initial evaluations that fit the budget
+		initial_evaluations = self.initial_evaluations
+		if(self.evaluation_budget is not None):
+			initial_evaluations = min(initial_evaluations, max(self.evaluation_budget // max(size, 1), 1))
+
+		everyone = np.arange(size)
+		for _ in range(initial_evaluations):
+			self._update(everyone, self._sample(population))
+
+		# Race the individuals whose rank is not certain
+		number_of_elites = min(self.number_of_elites, size - 1)
+		while(number_of_elites > 0):
+			# The boundary lies between the last elite and the next one
+			order = np.sort(self.mean)[::-1]
+			boundary = (order[number_of_elites - 1] + order[number_of_elites]) / 2
+
+			standard_error = np.sqrt(self.variance / self.evaluations)
+			uncertain = np.abs(self.mean - boundary) <= self.z_score * standard_error
+			uncertain = np.nonzero(uncertain & (self.evaluations < self.maximum_evaluations))[0]
+
+			if(len(uncertain) == 0):
+				break
+
+			if(self.evaluation_budget is not None and
+			   self.last_evaluations + len(uncertain) > self.evaluation_budget):
+				break
+
+			self._update(uncertain, self._sample(population[uncertain]))
+
+		self.evaluations_used = self.evaluations_used + self.last_evaluations
+		self.evaluations_saved = self.evaluations_saved + size * self.maximum_evaluations - self.last_evaluations
+
+		return self.mean.copy()
+
+	# Getters and Setters
+	@property
+	def variance(self):
+		""" The running sample variance of each individual """
+		return self.__squares / np.maximum(self.evaluations - 1, 1)
+
+	@property
+	def initial_evaluations(self):
+		""" The number of evaluations given to every individual
+			At least 2, to estimate the variance
+		"""
+		return self._initial_evaluations
+
+	@initial_evaluations.setter
+	def initial_evaluations(self, evaluations):
+		self._initial_evaluations = max(int(evaluations), 2)
+
+	@property
+	def maximum_evaluations(self):
+		""" The maximum number of evaluations of an individual """
+		return self._maximum_evaluations
+
+	@maximum_evaluations.setter
+	def maximum_evaluations(self, evaluations):
+		self._maximum_evaluations = max(int(evaluations), self.initial_evaluations)
+
+	@property
+	def number_of_elites(self):
+		""" The number of individuals considered to be elites """
+		return self._number_of_elites
+
+	@number_of_elites.setter
+	def number_of_elites(self, number_of_elites):
+		self._number_of_elites = max(int(number_of_elites), 1)
@@ -0,0 +1,378 @@
+"""Docstring for surrogate.py
+
+This module implements a surrogate model for pre-screening
+the offspring of a Genetic Algorithm. A cheap regression
+model is fitted on the chromosomes evaluated so far, and
+only the offspring it ranks as the most promising are
+sent for the expensive evaluation.
+"""
+
+import numpy as np
+
+# The k Nearest Neighbours Surrogate class
+class KNNSurrogate(object):
+	"""
+	The k Nearest Neighbours Surrogate Class
+	Predicts the fitness of a chromosome as the distance
+	weighted average fitness of the nearest evaluated
+	chromosomes. It can be used as the surrogate of
+	GeneticAlgorithm
+
+	...
+
+	Parameters
+	----------
+	number_of_neighbours(optional): integer
+		The number of nearest evaluated chromosomes used
+		for a prediction
+
+	fraction(optional): float
+		The fraction of the population, ranked by predicted
+		fitness, that is sent for true evaluation
+
+	retrain_interval(optional): integer
+		The number of generations after which the model is
+		fitted again on the chromosomes evaluated so far
+
+	maximum_samples(optional): integer
+		The maximum number of evaluated chromosomes kept,
+		the oldest are dropped first. None keeps all of them
+
+	Attributes
+	----------
+	trained: boolean
+		Whether the model has been fitted yet
+
+	number_of_samples: integer
+		The number of evaluated chromosomes the model is
+		fitted on
+
+	rank_correlations: list
+		The Spearman rank correlation between the predicted
+		and the true fitness of the evaluated chromosomes,
+		for each generation that was screened
+
+	evaluations_saved: integer
+		The total number of chromosomes that were not
+		evaluated
+
+	Methods
+	-------
+	add_samples(chromosomes, fitness_vector)
+		Add evaluated chromosomes and retrain if required
+
+	train()
+		Fit the model on the evaluated chromosomes
+
+	predict(chromosomes)
+		Predict the fitness of the chromosomes
+
+	screen(predictions, protected)
+		Select the chromosomes to be evaluated
+
+	record_correlation(generation, predictions, fitness_vector)
+		Compare the predictions with the true fitness
+
+	save_report(filename)
+		Save the screening statistics to a file
+	"""
+	def __init__(self, number_of_neighbours=5, fraction=0.5, retrain_interval=1,
+				 maximum_samples=None):
+		"""
+		Initialization function of KNNSurrogate class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.number_of_neighbours = number_of_neighbours
+		self.fraction = fraction
+		self.retrain_interval = retrain_interval
+		self.maximum_samples = maximum_samples
+
+		self.rank_correlations = []
+		self.evaluations_saved = 0
+
+		# Evaluated chromosomes and the fitted model
+		self.__chromosomes = []
+		self.__fitness = []
+		self.__updates = 0
+		self.__inputs = None
+		self.__targets = None
+		self.__report = []
+
+	# Add new evaluated chromosomes
+	def add_samples(self, chromosomes, fitness_vector):
+		"""
+		Add evaluated chromosomes to the samples of
+		the model, retraining the model every
+		retrain_interval calls
+
+		Parameters
+		----------
+		chromosomes: array_like
+			A 2D array with one chromosome per row
+
+		fitness_vector: array_like
+			The true fitness of each chromosome
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.__chromosomes.append(np.array(chromosomes, np.float64, ndmin=2))
+		self.__fitness.append(np.array(fitness_vector, np.float64, ndmin=1))
+		self.__updates = self.__updates + 1
+
+		if(not self.trained or self.__updates % self.retrain_interval == 0):
+			self.train()
+
+	# Fit the model
+	def train(self):
+		"""
+		Fit the model on the chromosomes evaluated so far
+
+		Parameters
+		----------
+		None
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		if(len(self.__chromosomes) == 0):
+			return
+
+		# Join the samples once, so that they are not
+		# joined again for every prediction
+		inputs = np.concatenate(self.__chromosomes)
+		targets = np.concatenate(self.__fitness)
+
+		if(self.maximum_samples is not None):
+			inputs = inputs[-self.maximum_samples:]
+			targets = targets[-self.maximum_samples:]
+
+		self.__chromosomes = [inputs]
+		self.__fitness = [targets]
+
+		self.__inputs = inputs
+		self.__targets = targets
+		self.__squared_norms = np.sum(inputs ** 2, axis=1)
+
+	# Predict the fitness
+	def predict(self, chromosomes):
+		"""
+		Predict the fitness of chromosomes
+
+		Parameters
+		----------
+		chromosomes: array_like
+			A 2D array with one chromosome per row
+
+		Returns
+		-------
+		predictions: array_like
+			The predicted fitness of each chromosome
+
+		Raises
+		------
+		ValueError
+			If the model has not been trained yet
+		"""
+		if(not self.trained):
+			raise ValueError("The surrogate needs to be trained before prediction")
+
+		chromosomes = np.array(chromosomes, np.float64, ndmin=2)
+
+		# Squared distances of every chromosome to every sample
+		distances = (np.sum(chromosomes ** 2, axis=1)[:, np.newaxis] +
+					 self.__squared_norms[np.newaxis, :] -
+					 2 * np.dot(chromosomes, self.__inputs.T))
+		distances = np.sqrt(np.maximum(distances, 0))
+
+		# Nearest neighbours
+		number_of_neighbours = min(self.number_of_neighbours, self.number_of_samples)
+		neighbours = np.argpartition(distances, number_of_neighbours - 1,
+									 axis=1)[:, :number_of_neighbours]
+		rows = np.arange(chromosomes.shape[0])[:, np.newaxis]
+
+		# Inverse distance weighting, an exact match
+		# dominates the others
+		weights = 1.0 / (distances[rows, neighbours] + 1e-12)
+		predictions = np.sum(weights * self.__targets[neighbours], axis=1) / np.sum(weights, axis=1)
+
+		return predictions
+
+	# Select the chromosomes to be evaluated
+	def screen(self, predictions, protected=None):
+		"""
+		Select the chromosomes that are sent for
+		true evaluation
+
+		Parameters
+		----------
+		predictions: array_like
+			The predicted fitness of the population
+
+		protected(optional): array_like
+			Indices of chromosomes that are always evaluated,
+			for instance the elites
+
+		Returns
+		-------
+		indices: array_like
+			The sorted indices of the chromosomes to evaluate
+
+		Raises
+		------
+		None
+		"""
+		predictions = np.asarray(predictions)
+		number_to_evaluate = int(np.ceil(self.fraction * len(predictions)))
+
+		# The most promising according to the model
+		promising = np.argsort(predictions)[::-1][:number_to_evaluate]
+
+		if(protected is not None):
+			promising = np.union1d(promising, protected)
+
+		indices = np.unique(promising).astype(np.int64)
+		self.evaluations_saved = self.evaluations_saved + len(predictions) - len(indices)
+
+		return indices
+
+	# Compare the predictions with the true values
+	def record_correlation(self, generation, predictions, fitness_vector, population_size=None):
+		"""
+		Record the Spearman rank correlation between the
+		predicted and the true fitness of the evaluated
+		chromosomes
+
+		Parameters
+		----------
+		generation: integer
+			The generation of the chromosomes
+
+		predictions: array_like
+			The predicted fitness of the evaluated chromosomes
+
+		fitness_vector: array_like
+			The true fitness of the evaluated chromosomes
+
+		population_size(optional): integer
+			The size of the population that was screened
+
+		Returns
+		-------
+		correlation: float
+			The rank correlation, nan if it is not defined
+
+		Raises
+		------
+		None
+		"""
+		predictions = np.asarray(predictions, np.float64)
+		fitness_vector = np.asarray(fitness_vector, np.float64)
+
+		correlation = np.nan
+		if(len(predictions) > 1):
+			predicted_ranks = np.argsort(np.argsort(predictions))
+			true_ranks = np.argsort(np.argsort(fitness_vector))
+			if(np.std(predictions) > 0 and np.std(fitness_vector) > 0):
+				correlation = np.corrcoef(predicted_ranks, true_ranks)[0, 1]
+
+		self.rank_correlations.append(correlation)
+
+		if(population_size is None):
+			population_size = len(predictions)
+		self.__report.append([generation, len(predictions),
+							  population_size - len(predictions), correlation])
+
+		return correlation
+
+	# Save the report
+	def save_report(self, filename):
+		"""
+		Function to save the generation, the number of
+		evaluated and skipped chromosomes and the rank
+		correlation of every screened generation
+
+		Parameters
+		----------
+		filename: string
+			The name of the file, without extension
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		legend = ["Generation", "Evaluated", "Skipped", "Rank Correlation"]
+		header = "{: <10} {: >10} {: >10} {: >20}".format(*legend)
+		fmt = '%-10d', '%10d', '%10d', '%20.10f'
+		np.savetxt(filename + '.txt', np.array(self.__report, ndmin=2).reshape(-1, 4),
+				   fmt=fmt, header=header)
+
+	# Getters and Setters
+	@property
+	def trained(self):
+		""" Whether the model has been fitted yet """
+		return self.__inputs is not None
+
+	@property
+	def number_of_samples(self):
+		""" The number of samples the model is fitted on """
+		if(self.__inputs is None):
+			return 0
+
+		return self.__inputs.shape[0]
+
+	@property
+	def number_of_neighbours(self):
+		""" The number of neighbours used for a prediction """
+		return self._number_of_neighbours
+
+	@number_of_neighbours.setter
+	def number_of_neighbours(self, number_of_neighbours):
+		self._number_of_neighbours = max(int(number_of_neighbours), 1)
+
+	@property
+	def fraction(self):
+		""" The fraction of the population that is evaluated """
+		return self._fraction
+
+	@fraction.setter
+	def fraction(self, fraction):
+		if(fraction <= 0 or fraction > 1):
+			raise ValueError("The fraction should lie in (0, 1]")
+
+		self._fraction = fraction
+
+	@property
+	def retrain_interval(self):
+		""" The number of generations between retraining """
+		return self._retrain_interval
+
+	@retrain_interval.setter
+	def retrain_interval(self, interval):
+		self._retrain_interval = max(int(interval), 1)
@@ -0,0 +1,478 @@
+"""Docstring for sweep.py
+
+This module implements a hyperparameter sweep of the
+Genetic Algorithm. Configurations of the settings of the
+algorithm are generated from a grid or at random, and
+run with several seeds on a number of processes, each
+in its own log folder. Successive halving stops the poor
+configurations early and continues the good ones from
+their saved generations.
+"""
+
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import numpy as np
+
+try:
+	import Queue as queue
+except ImportError:
+	import queue
+
+from genetic_algorithm.ga import GeneticAlgorithm
+
+# Run a trial in a separate process
+def _run_trial(trial, results):
+	"""
+	Private function that runs the Genetic Algorithm of a
+	trial for its budget of generations, and puts the
+	statistics in the results queue
+	"""
+	try:
+		np.random.seed(trial["seed"] + trial["start"])
+
+		ga = trial["algorithm"]()
+
+		# The number of elites depends on the population size
+		settings = trial["settings"]
+		if("population_size" in settings):
+			ga.population_size = settings["population_size"]
+		for name in sorted(settings.keys()):
+			setattr(ga, name, settings[name])
+
+		ga.fitness_function = trial["fitness_function"]
+		ga.log_folder = trial["log_folder"]
+		ga.number_of_generations = trial["number_of_generations"]
+
+		if not os.path.exists(ga.log_folder):
+			os.makedirs(ga.log_folder)
+
+		# Generations before the last stop at the budget,
+		# saving the generation to continue from
+		max_evaluations = None
+		if(trial["start"] + trial["budget"] < trial["number_of_generations"]):
+			max_evaluations = trial["budget"] * ga.population_size
+
+		# The printed statistics go to the folder of the trial
+		stdout = sys.stdout
+		sys.stdout = open(os.path.join(ga.log_folder, 'output.txt'), 'a')
+		try:
+			start = time.time()
+			ga.run(start=trial["start"], max_evaluations=max_evaluations)
+			seconds = time.time() - start
+		finally:
+			sys.stdout.close()
+			sys.stdout = stdout
+
+		results.put({"key": trial["key"], "max_fitness": [float(value) for value in ga.max_fitness],
+					 "avg_fitness": [float(value) for value in ga.avg_fitness],
+					 "min_fitness": [float(value) for value in ga.min_fitness],
+					 "evaluations": ga.number_of_evaluations, "seconds": seconds})
+	except Exception:
+		results.put({"key": trial["key"], "error": traceback.format_exc()})
+
+# The Sweep class
+class Sweep(object):
+	"""
+	The Sweep Class
+	Runs configurations of the settings of a Genetic
+	Algorithm with several seeds, on several processes
+
+	...
+
+	Parameters
+	----------
+	fitness_function: function
+		The fitness function of the algorithm
+
+	algorithm(optional): class or function
+		Called without arguments to create the algorithm
+		of each trial, GeneticAlgorithm by default. For
+		GeneticAlgorithmNN pass a function that creates it
+		with its network
+
+	number_of_generations(optional): integer
+		The number of generations of a complete trial
+
+	seeds(optional): list
+		The seeds each configuration is run with
+
+	processes(optional): integer
+		The number of trials run at the same time, the
+		number of CPUs by default
+
+	log_folder(optional): string
+		The folder of the sweep. Each trial logs to
+		log_folder/configuration<index>/seed<seed>
+
+	Attributes
+	----------
+	results: list
+		A dictionary for each trial with the configuration
+		index, seed, settings, generations run, best fitness,
+		final average fitness, anytime fitness(the average of
+		the best fitness so far over the generations),
+		evaluations and seconds
+
+	Methods
+	-------
+	grid(parameters)
+		Generate the configurations of a grid search
+
+	random(parameters, number_of_samples, seed)
+		Generate the configurations of a random search
+
+	run(configurations)
+		Run every configuration for all the generations
+
+	successive_halving(configurations, minimum_generations, eta)
+		Run the configurations, keeping the best 1/eta of
+		them after each budget of generations
+
+	best_configuration()
+		The settings with the best average best fitness
+
+	save_results(filename)
+		Save the results table to a file
+	"""
+	def __init__(self, fitness_function, algorithm=GeneticAlgorithm, number_of_generations=10,
+				 seeds=(0,), processes=None, log_folder='./sweep'):
+		"""
+		Initialization function of Sweep class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.fitness_function = fitness_function
+		self.algorithm = algorithm
+		self.number_of_generations = number_of_generations
+		self.seeds = list(seeds)
+		self.processes = processes
+		self.log_folder = log_folder
+
+		self.results = []
+		self.__configurations = []
+		self.__trials = {}
+
+	# Configurations of a grid search
+	def grid(self, parameters):
+		"""
+		Generate every combination of the values of the
+		parameters
+
+		Parameters
+		----------
+		parameters: dictionary
+			The list of values of each setting, for
+			example {"population_size": [50, 100]}
+
+		Returns
+		-------
+		configurations: list
+			A dictionary of settings for each combination
+
+		Raises
+		------
+		None
+		"""
+		names = sorted(parameters.keys())
+		return [dict(zip(names, values))
+				for values in itertools.product(*[parameters[name] for name in names])]
+
+	# Configurations of a random search
+	def random(self, parameters, number_of_samples=10, seed=0):
+		"""
+		Generate random configurations of the parameters
+
+		Parameters
+		----------
+		parameters: dictionary
+			For each setting, either a list of values to
+			choose from, or a (low, high) tuple to draw from
+			uniformly. Integers are drawn if both are integers
+
+		number_of_samples(optional): integer
+			The number of configurations
+
+		seed(optional): integer
+			The seed of the random configurations
+
+		Returns
+		-------
+		configurations: list
+			A dictionary of settings for each sample
+
+		Raises
+		------
+		None
+		"""
+		random_state = np.random.RandomState(seed)
+		configurations = []
+		for _ in range(number_of_samples):
+			configuration = {}
+			for name in sorted(parameters.keys()):
+				values = parameters[name]
+				if(isinstance(values, tuple)):
+					low, high = values
+					if(isinstance(low, int) and isinstance(high, int)):
+						configuration[name] = int(random_state.randint(low, high + 1))
+					else:
+						configuration[name] = float(random_state.uniform(low, high))
+				else:
+					configuration[name] = values[random_state.randint(len(values))]
+
+			configurations.append(configuration)
+
+		return configurations
+
+	# Run every configuration completely
+	def run(self, configurations):
+		"""
+		Run every configuration with every seed for all
+		the generations
+
+		Parameters
+		----------
+		configurations: list
+			The dictionaries of settings to run
+
+		Returns
+		-------
+		results: list
+			The results table
+
+		Raises
+		------
+		RuntimeError
+			If a trial fails
+		"""
+		return self.successive_halving(configurations, self.number_of_generations)
+
+	# Run with successive halving
+	def successive_halving(self, configurations, minimum_generations=1, eta=3):
+		"""
+		Run every configuration for minimum_generations,
+		then continue the best 1/eta of them for eta times
+		as many generations, until number_of_generations
+
+		Parameters
+		----------
+		configurations: list
+			The dictionaries of settings to run
+
+		minimum_generations(optional): integer
+			The generations of the first budget
+
+		eta(optional): integer
+			The factor by which the configurations are
+			reduced and the budget is increased
+
+		Returns
+		-------
+		results: list
+			The results table, stopped configurations have
+			fewer generations
+
+		Raises
+		------
+		RuntimeError
+			If a trial fails
+		"""
+		self.__configurations = list(configurations)
+		self.__trials = {}
+
+		alive = list(range(len(self.__configurations)))
+		generations = 0
+		budget = max(int(minimum_generations), 1)
+		while(True):
+			budget = min(budget, self.number_of_generations)
+			self._run_budget(alive, generations, budget - generations)
+			generations = budget
+
+			if(generations >= self.number_of_generations):
+				break
+
+			# Keep the best configurations
+			scores = [self._score(index) for index in alive]
+			order = np.argsort(scores)[::-1]
+			keep = max(int(np.ceil(len(alive) / float(eta))), 1)
+			alive = [alive[position] for position in sorted(order[:keep])]
+
+			budget = budget * eta
+
+		self.results = self._table()
+
+		return self.results
+
+	# Run a budget of generations
+	def _run_budget(self, indices, start, budget):
+		"""
+		Private function to run the trials of the configurations
+		in indices from generation start for budget generations,
+		at most processes at a time
+		"""
+		pending = []
+		for index in indices:
+			for seed in self.seeds:
+				pending.append({
+					"key": (index, seed), "algorithm": self.algorithm,
+					"fitness_function": self.fitness_function,
+					"settings": self.__configurations[index], "seed": seed,
+					"start": start, "budget": budget,
+					"number_of_generations": self.number_of_generations,
+					"log_folder": os.path.join(self.log_folder, 'configuration' + str(index),
+											   'seed' + str(seed))
+				})
+
+		processes = self.processes
+		if(processes is None):
+			processes = multiprocessing.cpu_count()
+
+		# Not a Pool, the algorithm starts processes of its own
+		# and the processes of a Pool can not
+		results = multiprocessing.Queue()
+		running = {}
+		errors = []
+		while(len(pending) != 0 or len(running) != 0):
+			while(len(pending) != 0 and len(running) < processes):
+				trial = pending.pop(0)
+				process = multiprocessing.Process(target=_run_trial, args=(trial, results))
+				process.start()
+				running[trial["key"]] = process
+
+			try:
+				result = results.get(timeout=1)
+			except queue.Empty:
+				# A process that died without a result
+				for key, process in list(running.items()):
+					if(not process.is_alive() and process.exitcode != 0):
+						errors.append("Trial " + str(key) + " exited with " + str(process.exitcode))
+						del running[key]
+				continue
+
+			running.pop(result["key"]).join()
+			if("error" in result):
+				errors.append("Trial " + str(result["key"]) + " failed\n" + result["error"])
+			else:
+				self._record(result, start + budget)
+
+		if(len(errors) != 0):
+			raise RuntimeError("\n".join(errors))
+
+	# Keep the statistics of a trial
+	def _record(self, result, generations):
+		"""
+		Private function to join the statistics of a trial
+		with the ones of its previous budgets
+		"""
+		trial = self.__trials.setdefault(result["key"], {
+			"max_fitness": [], "avg_fitness": [], "min_fitness": [],
+			"evaluations": 0, "seconds": 0.0})
+
+		for statistic in ["max_fitness", "avg_fitness", "min_fitness"]:
+			trial[statistic] = trial[statistic] + result[statistic]
+		trial["evaluations"] = trial["evaluations"] + result["evaluations"]
+		trial["seconds"] = trial["seconds"] + result["seconds"]
+		trial["generations"] = generations
+
+	# Score of a configuration
+	def _score(self, index):
+		"""
+		Private function to return the best fitness of a
+		configuration, averaged over the seeds
+		"""
+		return np.mean([max(self.__trials[(index, seed)]["max_fitness"]) for seed in self.seeds])
+
+	# Generate the table of results
+	def _table(self):
+		"""
+		Private function to generate a row for each trial
+		"""
+		table = []
+		for (index, seed) in sorted(self.__trials.keys()):
+			trial = self.__trials[(index, seed)]
+			best_so_far = np.maximum.accumulate(trial["max_fitness"])
+			table.append({
+				"configuration": index, "seed": seed,
+				"settings": self.__configurations[index],
+				"generations": trial["generations"],
+				"best_fitness": float(best_so_far[-1]),
+				"final_average_fitness": trial["avg_fitness"][-1],
+				"anytime_fitness": float(np.mean(best_so_far)),
+				"max_fitness": trial["max_fitness"],
+				"evaluations": trial["evaluations"],
+				"seconds": trial["seconds"]
+			})
+
+		return table
+
+	# The best configuration
+	def best_configuration(self):
+		"""
+		Return the settings of the configuration with the best
+		best fitness averaged over the seeds, among the ones run
+		for all the generations
+		"""
+		complete = sorted(set([row["configuration"] for row in self.results
+							   if row["generations"] == self.number_of_generations]))
+		scores = [self._score(index) for index in complete]
+
+		return self.__configurations[complete[int(np.argmax(scores))]]
+
+	# Save the results
+	def save_results(self, filename):
+		"""
+		Function to save the results table to a txt file
+
+		Parameters
+		----------
+		filename: string
+			The name of the file, without extension
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		legend = ["Configuration", "Seed", "Generations", "Best Fitness",
+				  "Final Average", "Anytime Fitness", "Seconds", "Settings"]
+		row_format = "{: <14} {: >6} {: >12} {: >20} {: >20} {: >20} {: >10}   {}"
+
+		with open(filename + '.txt', 'w') as results_file:
+			results_file.write("# " + row_format.format(*legend) + "\n")
+			for row in self.results:
+				settings = ", ".join([name + "=" + str(row["settings"][name])
+									  for name in sorted(row["settings"].keys())])
+				results_file.write("  " + row_format.format(
+					row["configuration"], row["seed"], row["generations"],
+					"%.10f" % row["best_fitness"], "%.10f" % row["final_average_fitness"],
+					"%.10f" % row["anytime_fitness"], "%.2f" % row["seconds"], settings) + "\n")
+
+	# Getters and Setters
+	@property
+	def processes(self):
+		""" The number of trials run at the same time """
+		return self._processes
+
+	@processes.setter
+	def processes(self, processes):
+		if(processes is not None and processes <= 0):
+			processes = None
+
+		self._processes = processes
@@ -11,6 +11,7 @@ activation functions are present in this library
 - Hyperbolic Tangent Activation
 - ReLU Activation
 - Maximum Value Activation
+- Fast Sigmoid and Hyperbolic Tangent Activation, rational approximations
 
 References
 https://www.geeksforgeeks.org/activation-functions/
@@ -22,11 +23,89 @@ To generate your own activation function, inherit from the Activation
 Function class and put the function calculation procedure inside
 the calculate_activation() method
 
+The activation functions of this library take an optional out buffer,
+that may be the input itself, and calculate the activation with in
+place ufuncs. Set supports_out to True for an activation function of
+your own that does too
+
 """
 
 # Import the numpy module
 import numpy as np
 
+# The [7/6] Pade approximant of tanh, clipped where it reaches 1. The
+# coefficients of the polynomials of x ** 2, of the highest power first
+_TANH_NUMERATOR = (1.0, 378.0, 17325.0, 135135.0)
+_TANH_DENOMINATOR = (28.0, 3150.0, 62370.0, 135135.0)
+_TANH_CLIP = 4.971786858527768
+
+# The largest absolute error of the approximations
+FAST_TANH_ERROR = 1e-4
+FAST_SIGMOID_ERROR = 5e-5
+
+def _output_buffer(out, x, *parameters):
+	"""
+	Private function to return the out buffer, or a new buffer
+	of the broadcast shape and floating point type of x and the
+	parameters. The shape is that of x, unless the parameters
+	broadcast it(those of a population)
+	"""
+	if(out is None):
+		x = np.asarray(x)
+		shape = x.shape
+		for parameter in parameters:
+			if(parameter.shape != shape[len(shape) - parameter.ndim:]):
+				shape = np.broadcast(x, *parameters).shape
+				break
+
+		# The type of x, even a scalar, is kept. Parameters of a single
+		# value only upcast it to a different kind, as numpy scalars do
+		dtype = np.result_type(np.promote_types(np.float16, x.dtype), *parameters)
+		out = np.empty(shape, dtype=dtype)
+
+	return out
+
+def _affine(x, beta, theta, out):
+	"""
+	Private function to calculate beta * (x - theta) into
+	the out buffer, without temporaries
+	"""
+	out = _output_buffer(out, x, beta, theta)
+	np.subtract(x, theta, out)
+	np.multiply(out, beta, out)
+
+	return out
+
+def _rational_tanh(out):
+	"""
+	Private function to approximate the tanh of out in place,
+	within FAST_TANH_ERROR
+	"""
+	np.clip(out, -_TANH_CLIP, _TANH_CLIP, out)
+	square = np.multiply(out, out)
+
+	# The polynomials of the square, by Horner's method
+	numerator = _polynomial(square, _TANH_NUMERATOR)
+	denominator = _polynomial(square, _TANH_DENOMINATOR)
+
+	out *= numerator
+	out /= denominator
+
+	return out
+
+def _polynomial(x, coefficients):
+	"""
+	Private function to evaluate the polynomial of x with the
+	coefficients of the highest power first
+	"""
+	result = np.multiply(x, coefficients[0])
+	result += coefficients[1]
+	for coefficient in coefficients[2:]:
+		result *= x
+		result += coefficient
+
+	return result
+
 
 class ActivationFunction(object):
 	"""
@@ -52,13 +131,19 @@ class ActivationFunction(object):
 		
 	* An array can be used for beta and theta, 
 	  if we want different activation for different neuron
+	  
+	supports_out : boolean
+		Whether calculate_activation takes an out buffer
 
 	Methods
 	-------
-	calculate_activation(input_vector)
-	    Calculate the activation of an input vector
+	calculate_activation(input_vector, out)
+	    Calculate the activation of an input vector, into the
+	    out buffer if it is given(it may be the input vector)
 	    
 	"""  
+	supports_out = False
+	
 	def __init__(self, beta = 1, theta = 0):
 		"""
 		Initialization function of ActivationFunction class		
@@ -87,7 +172,7 @@ class ActivationFunction(object):
 		
 	@beta.setter
 	def beta(self, beta):
-		self._beta = np.array(beta)
+		self._beta = np.asarray(beta)
 		
 	@property
 	def theta(self):
@@ -96,9 +181,9 @@ class ActivationFunction(object):
 		
 	@theta.setter
 	def theta(self, theta):
-		self._theta = np.array(theta)
+		self._theta = np.asarray(theta)
 		
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		# Different implementation of different functions
 		pass
 
@@ -107,120 +192,165 @@ class ActivationFunction(object):
 class IdentityActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 	
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" Returns the input as it is """
 		
-		# Calculate the argument
-		argument = x
-		
-		return argument
+		# Without a buffer the input itself
+		if(out is None or out is x):
+			return x
+			
+		np.copyto(out, x)
+		return out
 
 # The linear activation class
 class LinearActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" https://en.wikipedia.org/wiki/Identity_function """
 		
-		# Calculate the argument of the function
-		argument = self.beta * (x - self.theta)
-		
-		# Return as it is
-		return argument
+		# Calculate the argument of the function, as it is
+		return _affine(x, self.beta, self.theta, out)
 
 # The step activation class
 class StepActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" https://en.wikipedia.org/wiki/Heaviside_step_function """
 		
-		# The parameter beta is of no use, hence recalculate the argument
-		argument = x - self.theta
-
-		# Replace all the elements greater than or equal to 0
-		argument[argument >= 0] = 1
+		# The parameter beta is of no use, hence calculate the argument
+		out = _output_buffer(out, x, self.theta)
+		np.subtract(x, self.theta, out)
 
-		# Replace all the elements less than 0
-		argument[argument < self.theta] = 0
+		# 1 for the elements greater than or equal to 0, 0 for the others
+		np.greater_equal(out, 0, out)
 		
-		return argument
+		return out
 		
 # The sigmoidal activation class
 class SigmoidActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" https://en.wikipedia.org/wiki/Logistic_function """
 		
 		# Calculate the argument of the function
-		argument = self.beta * (x - self.theta)
+		out = _affine(x, self.beta, self.theta, out)
 		
-		# According to the formula
-		z = 1 / (1 + np.exp(-argument))
+		# According to the formula, 1 / (1 + exp(-argument))
+		np.negative(out, out)
+		np.exp(out, out)
+		np.add(out, 1, out)
+		np.reciprocal(out, out)
 		
-		return z
+		return out
 	
 # Hyperbolic Tangent activation class
 class TanhActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" https://en.wikipedia.org/wiki/Hyperbolic_function#Hyperbolic_tangent """
 		
 		# Calculate the argument of the function
-		argument = self.beta * (x - self.theta)
+		out = _affine(x, self.beta, self.theta, out)
 		
 		# According to the formula
-		z = np.tanh(argument)
+		np.tanh(out, out)
 		
-		return z
+		return out
 	
 # Rectified linear unit activation class
 class ReluActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" https://en.wikipedia.org/wiki/Rectifier_(neural_networks) """
 		
 		# Calculate the argument of the function
-		argument = self.beta * (x - self.theta)
+		out = _affine(x, self.beta, self.theta, out)
 		
-		# Replace all elements less than 0
-		argument[argument < 0] = 0
-		
-		# The others remain as such!
+		# Replace all elements less than 0, the others remain as such!
+		np.maximum(out, 0, out)
 
-		return argument
+		return out
 		
 # Maximum activation class
 class MaximumActivation(ActivationFunction):
 	# Inherit the docstring of parent class
 	__doc__ = ActivationFunction.__doc__
+	supports_out = True
 
-	def calculate_activation(self, x):
+	def calculate_activation(self, x, out=None):
 		""" 
 		Finds the maximum element from the input vector.
 		Beta and Theta parameters are not used in this activation
 		
+		For a batch of input vectors, the maximum is of each vector
 		"""
 	
-		# Get the maximum element from x
-		maximum = np.max(x)
+		# Get the maximum element from x, along the last axis
+		# so that each vector of a batch is separate
+		maximum = np.max(x, axis=-1, keepdims=True)
+		
+		# Make the maximum equal to 1 and others equal to zero,
+		# of the same floating point type as the input
+		out = _output_buffer(out, x)
+		np.equal(x, maximum, out)
+		
+		return out
+		
+# Fast Hyperbolic Tangent activation class
+class FastTanhActivation(TanhActivation):
+	"""
+	Hyperbolic Tangent activation with a rational approximation,
+	the [7/6] Pade approximant of tanh, clipped to 1 beyond
+	|argument| = 4.97. The absolute error is below FAST_TANH_ERROR(1e-4),
+	for float32 and float64
+	
+	Whether it is faster than np.tanh depends on the numpy
+	build, benchmarks/activations.py compares them
+	"""
+	
+	def calculate_activation(self, x, out=None):
+		""" A rational approximation of tanh(beta * (x - theta)) """
 		
-		# Make others equal to zero
-		x[x != maximum] = 0
+		# Calculate the argument of the function
+		out = _affine(x, self.beta, self.theta, out)
 		
-		# Make the maximum equal to 1
-		x[x == maximum] = 1
+		return _rational_tanh(out)
 		
-		return x
+# Fast sigmoidal activation class
+class FastSigmoidActivation(SigmoidActivation):
+	"""
+	Sigmoid activation with a rational approximation, from
+	sigmoid(a) = (1 + tanh(a / 2)) / 2 and the approximation of
+	FastTanhActivation. The absolute error is below
+	FAST_SIGMOID_ERROR(5e-5), for float32 and float64
+	"""
+	
+	def calculate_activation(self, x, out=None):
+		""" A rational approximation of the sigmoid of beta * (x - theta) """
 		
-
-
+		# Calculate the half of the argument of the function
+		out = _affine(x, self.beta, self.theta, out)
+		np.multiply(out, 0.5, out)
+		
+		_rational_tanh(out)
+		np.multiply(out, 0.5, out)
+		np.add(out, 0.5, out)
+		
+		return out
@@ -9,14 +9,24 @@ in each layer and a variable activation function
 
 import numpy as np
 import pickle
-from graphviz import Digraph
-from layers import StaticLayer, DynamicLayer
+import json
+import os
+import heapq
+from layers import StaticLayer, DynamicLayer, INTEGRATORS
+from plan import ExecutionPlan
+from codegen import generate_module
+from profiler import NetworkProfile
+from interface import Layer
+import activation_functions
 from datetime import datetime
-from copy import deepcopy
+from copy import copy, deepcopy
 
 # Library used to genrate warnings
 import warnings
 
+# The version of the format of save_parameters_to_file
+FORMAT_VERSION = 1
+
 class ArtificialNeuralNetwork(object):
 	"""
 	The Artificial Neural Network Class
@@ -48,6 +58,15 @@ class ArtificialNeuralNetwork(object):
 		
 		*Useful especially for networks with Dynamic Layers
 		
+	integrator(optional): string
+		The integrator of the Dynamic Layers, "legacy", "euler",
+		"exponential" or "rk4". Specified in layers.DynamicLayer
+		
+	dtype(optional): data-type
+		The floating point type of the parameters, states and
+		outputs, float64 by default. float32 halves the memory
+		of the batched and population iterations
+		
 	Attributes
 	----------
 	number_of_layers: integer
@@ -58,23 +77,74 @@ class ArtificialNeuralNetwork(object):
 		
 		*Useful for networks with Dynamic Layers
 		
+	integrator: string
+		The integrator of the Dynamic Layers
+		
+	dtype: data-type
+		The floating point type of the network
+		
+	optimized: boolean
+		Whether the iterations use the optimized plan
+		
+	profiling: boolean
+		Whether the layers are profiled in the iterations, False
+		by default. Setting it starts a new profile
+		
+	profile: profiler.NetworkProfile
+		The time, calls, estimated FLOPs and bytes allocated of each
+		layer while profiling, None otherwise
+		
 	output_matrix: dictionary
 		Shows the output of each layer in the previous iteration of 
 		the network
 		
+	sensor_names: list
+		The names of the sensors, in the order of the arguments
+		of forward_array()
+		
+	hardware_names: list
+		The names of the hardware layers, in the order of the
+		outputs of forward_array()
+		
+	state: array_like
+		The output of every layer in the previous iteration, in
+		the order of execution, that a rollout starts from. For
+		the integrators other than legacy, it is followed by the
+		state of the neurons
+		
 	number_of_parameters: integer
 		The number of trainable parameters of the Neural
 		Network
 		
+	parameters: array_like
+		The trainable parameters of the Neural Network, in the
+		layout of a chromosome. The parameters of the layers
+		are views of it
+		
+	topology: dictionary
+		The description of the Neural Network that is saved
+		with its parameters
+		
 	Methods
 	-------
 	forward_propagate(input_dict)
 		Calculate the output of the Neural Network for one iteration
 		
+	forward_array(*sensor_inputs)
+		Calculate the output of the Neural Network for one iteration,
+		with positional inputs and outputs
+		
+	forward_population(input_dict, parameter_vector)
+		Calculate the output of the Neural Network for one iteration,
+		for each parameter vector of a population
+		
+	rollout(input_dict, state, keep_trajectory)
+		Calculate the output of the Neural Network for T iterations
+		
 	save_parameters_to_file(file_name)
 		Save the parameters of the Neural Network to a file
 		
-	load_weights_from_file(file_name)
+	load_weights_from_file(file_name, mmap_mode, allow_pickle)
 		Load the parameters of the Neural Network from a file
 		
 	return_parameters_as_vector()
@@ -82,9 +152,28 @@ class ArtificialNeuralNetwork(object):
 		
 	load_parameters_from_vector(parmeter_vector)
 		Load the parameters of the Neural Network from a vector
+		
+	load_parameters(parameter_vector)
+		Load the parameters of the Neural Network from a flat vector
+		
+	replicate()
+		Return a network of the same topology with its own parameters
+		and state
+		
+	reset()
+		Reset the state of the Neural Network to zero
+		
+	optimize()
+		Fuse and fold the layers of a Static Network for the iterations
+		
+	export_module(file_name)
+		Generate a standalone Python module of the network
+		
+	visualize(file_name, show, profile)
+		Visualize the computational graph, annotated with the profile
 	"""
 	
-	def __init__(self, layer_vector, type_of_network, time_interval=0.01):
+	def __init__(self, layer_vector, type_of_network, time_interval=0.01, integrator="legacy", dtype=np.float64):
 		"""
 		Initialization function of ArtificialNeuralNetwork class		
 		...
@@ -99,14 +188,26 @@ class ArtificialNeuralNetwork(object):
 		
 		Raises
 		------
-		None
+		ValueError
+			If the integrator is not known, or the dtype is not
+			a floating point type
 	
 		"""
+		if(integrator not in INTEGRATORS):
+			raise ValueError("The integrator should be one of " + ", ".join(INTEGRATORS))
+			
+		if(not np.issubdtype(dtype, np.floating)):
+			raise ValueError("The dtype should be a floating point type")
+			
 		# Class declarations
 		self.__number_of_layers = len(layer_vector)
 		self.type_of_network = type_of_network			# A setter function works behind the scenes
 		self._order_of_initialization = [layer for layer in layer_vector]
 		self.__time_interval = time_interval
+		self.__integrator = integrator
+		self.__dtype = np.dtype(dtype)
+		self.__optimized = False
+		self.__profile = None
 		
 		# Internal Attributes
 		self.__input_connections = {}		# To store the input connections of various layers
@@ -122,7 +223,9 @@ class ArtificialNeuralNetwork(object):
 		# Construct the layers and the execution graph
 		self._order_of_execution = []
 		self._construct_layers(layer_vector)
+		self._share_parameters()
 		self._construct_graph()
+		self._compile_plan()
 			
 	
 	# Function to construct the layers given the inputs
@@ -191,12 +294,12 @@ class ArtificialNeuralNetwork(object):
 				# Output dimensions
 				output_dimension = layer[1]
 				
-				# Activation Function
-				activation_function = layer[2]
+				# Activation Function, a copy as the network keeps its parameters
+				activation_function = copy(layer[2])
 				
 				# Generate the layer
 				self.__layer_map[layer[0]] = StaticLayer(input_dimension, output_dimension,
-														 activation_function, layer[0])
+														 activation_function, layer[0], self.__dtype)
 				
 			# Dynamic Layer
 			elif(self.__type_of_network == "DYNAMIC"):
@@ -214,26 +317,117 @@ class ArtificialNeuralNetwork(object):
 				# Output dimensions
 				output_dimension = layer[1]
 				
-				# Collect the activation function
-				activation_function = layer[2]
+				# Collect the activation function, a copy as the network keeps its parameters
+				activation_function = copy(layer[2])
 				
 				# Generate the layer
-				if(layer[0] in self.__input_layers):
+				if(layer[0] not in self.__input_connections):
 					self.__layer_map[layer[0]] = StaticLayer(input_dimension, output_dimension, 
-															 activation_function, layer[0])
+															 activation_function, layer[0], self.__dtype)
 				else:
 					self.__layer_map[layer[0]] = DynamicLayer(input_dimension, output_dimension, 
 															  activation_function, self.__time_interval, 
-															  np.ones((output_dimension, )), layer[0])
+															  np.ones((output_dimension, )), layer[0], self.__integrator,
+															  self.__dtype)
 				
 		# Generate the output layers variable
-		layer_keys = self.__output_connections.keys()
 		for layers in self.__input_connections.keys():
 			# Is it a hardware layer?
-			if layers not in layer_keys:
+			if layers not in self.__output_connections:
 				# If it is, then push to output layers
 				self.__output_layers.append(layers)
 				
+	# Keep the parameters of all the layers in one buffer
+	def _share_parameters(self, buffer=None):
+		"""
+		Private function to store the parameters and gains of
+		all the layers in a single contiguous buffer
+		
+		...
+		
+		Parameters
+		----------
+		buffer(optional): array_like
+			A buffer of the correct size to use, whose values
+			replace those of the layers. By default a new buffer
+			is allocated with the current values of the layers
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			If the buffer is not of the correct size or dtype
+		
+		Notes
+		-----
+		The trainable parameters are at the start of the buffer, in
+		the order of initialization(the layout of the chromosome),
+		followed by the gains of every layer and the parameters of
+		the input layers. The layers are given views of it
+		"""
+		layers = [self.__layer_map[layer[0]] for layer in self._order_of_initialization]
+		input_layers = set(self.__input_layers)
+		trainable = [layer[0] not in input_layers for layer in self._order_of_initialization]
+		
+		number_of_parameters = 0
+		number_of_gains = 0
+		number_of_inputs = 0
+		for layer, is_trainable in zip(layers, trainable):
+			if(is_trainable):
+				number_of_parameters = number_of_parameters + len(layer.return_parameters())
+			else:
+				number_of_inputs = number_of_inputs + len(layer.return_parameters())
+			number_of_gains = number_of_gains + len(layer.gain)
+			
+		size = number_of_parameters + number_of_gains + number_of_inputs
+		if(buffer is None):
+			self.__buffer = np.zeros((size, ), dtype=self.__dtype)
+			copy_values = True
+		elif(np.shape(buffer) != (size, )):
+			raise ValueError("The parameter buffer should have " + str(size) + " elements")
+		elif(buffer.dtype != self.__dtype):
+			raise ValueError("The parameter buffer should be of dtype " + self.__dtype.name)
+		else:
+			self.__buffer = buffer
+			copy_values = False
+			
+		self.__parameters = self.__buffer[:number_of_parameters]
+		
+		parameter_index = 0
+		gain_index = number_of_parameters
+		input_index = number_of_parameters + number_of_gains
+		for layer, is_trainable in zip(layers, trainable):
+			# The parameters of the input layers are not trainable
+			length = len(layer.return_parameters())
+			if(is_trainable):
+				parameter_vector = self.__buffer[parameter_index:parameter_index + length]
+				parameter_index = parameter_index + length
+			else:
+				parameter_vector = self.__buffer[input_index:input_index + length]
+				input_index = input_index + length
+				
+			gain = self.__buffer[gain_index:gain_index + len(layer.gain)]
+			gain_index = gain_index + len(layer.gain)
+			
+			if(copy_values):
+				parameter_vector[:] = layer.return_parameters()
+				gain[:] = layer.gain
+			
+			layer.share_parameters(parameter_vector, gain)
+			
+	# Copies and pickles do not keep views
+	def __setstate__(self, state):
+		"""
+		Restore the state of the network and share the
+		parameter buffer with the layers again
+		"""
+		self.__dict__.update(state)
+		self._share_parameters()
+		self._optimize_plan()
+		
 	# Generate the computational graph
 	def _construct_graph(self):
 		"""
@@ -252,83 +446,81 @@ class ArtificialNeuralNetwork(object):
 		
 		Raises
 		------
-		Exception:
+		ValueError
 			There should be no recurrent connections in Static
-			Neural Networks
+			Neural Networks, the layers of a cycle are reported
 		
 		Notes
 		-----
-		Algorithm:
-		1. Iterate the layers through order of initialization
-		2. For input layers the input is taken from sensor input only, 
-		   input_vector is taken as zero
-		3. For other layers the input is taken as a concatenation of 
-		   vectors from output matrix(if static) or state matrix(if dynamic)
-		4. If the output matrix gives a key error, we keep the current layer 
-		   in an error queue
-		5. The error queue is iterated again and again to reduce it's size to 0
-		6. If the error queue is not reducing in size, then the network is not
-		   correct(only in case of Static, Dynamic will not give any such problem)
-		"""
-		error_queue = []			# Saves the objects of which are yet to be generated
-		error_index = 0				# To store the index of layer that is currently to be generated
+		Algorithm, a topological sort(Kahn's algorithm):
+		1. Count the inputs of each layer from other layers, the input
+		   layers take input from sensors only and have none
+		2. The layers whose inputs are all generated are ready, and kept
+		   in a heap by their position in the order of initialization
+		3. The first ready layer is generated next, and the count of the
+		   layers it outputs to is reduced, which makes them ready at zero
+		4. If some layers are never ready, the network is not correct(only
+		   in case of Static, Dynamic takes its input from the previous
+		   iteration and is generated in the order of initialization)
+		
+		The order of execution is the same as the repeated walk over
+		the order of initialization, in O((V + E) log V) time
+		"""
 		self.__output_matrix = {}
 		
-		# Initialization
-		error_queue = [layer[0] for layer in self._order_of_initialization]
-		prev_length = len(error_queue)
-		
-		while(len(error_queue) != 0):
-			# The layer to work on
-			layer = error_queue[error_index]
-		
-			# Generate the input vector
-			input_vector = np.array([])
+		if(self.__type_of_network == "DYNAMIC"):
+			order_of_execution = [layer[0] for layer in self._order_of_initialization]
+		else:
+			position = {}
+			pending = {}
+			for index, layer in enumerate(self._order_of_initialization):
+				position[layer[0]] = index
+				pending[layer[0]] = len(self.__input_connections.get(layer[0], []))
 			
-			# Get the input from other layers
-			# If the layer is an input layer, then we have to pass a
-			# constant vector of zero
-			if(layer in self.__input_layers):
-				input_vector = np.zeros((self.__neuron_map[layer],))
-				
-			# If the layer is not an input layer, then it needs to concatenate it's inputs
-			else:
-				# An error flag
-				error_flag = False
+			# The input layers are ready from the start
+			ready = [index for index, layer in enumerate(self._order_of_initialization) if pending[layer[0]] == 0]
+			heapq.heapify(ready)
+			
+			order_of_execution = []
+			while(len(ready) != 0):
+				layer = self._order_of_initialization[heapq.heappop(ready)][0]
+				order_of_execution.append(layer)
 				
-				for connection in self.__input_connections[layer]:
-					# An additional check for delay
-					if(self.__type_of_network == "DYNAMIC"):
-						# If the network is DYNAMIC then the input is taken from state matrix
-						input_vector = self.__state_matrix[connection]
-					else:
-						# If the network is STATIC then the input is taken from output matrix
-						# A try except block if we try accessing an element of output matrix that is
-						# not yet declared
-						try:
-							input_vector = self.__output_matrix[connection]
-						except KeyError:
-							error_flag = True
-							break
+				# The hardware layers are not counted
+				for output in self.__output_connections[layer]:
+					if(output in pending):
+						pending[output] = pending[output] - 1
+						if(pending[output] == 0):
+							heapq.heappush(ready, position[output])
 							
-				# The proceeding steps can only be performed if
-				# the flag has not been raised
-				if(error_flag == True):
-					error_index = (error_index + 1) % len(error_queue)
-					if(error_index == 0):
-						# The error_index has completed one round
-						exception_string = "The Static Neural Network seems to contain some recurrent connections"
-						assert prev_length != len(self.error_queue), exception_string
-						prev_length = len(self.error_queue)
-					
-					continue
-					
-			# If all the above steps complete perfectly,
-			# make an entry to output matrix
+			if(len(order_of_execution) != len(self._order_of_initialization)):
+				cycle = self._find_cycle(pending)
+				raise ValueError("The Static Neural Network contains recurrent connections: " + " -> ".join(cycle))
+				
+		# Make an entry to output matrix for each layer
+		for layer in order_of_execution:
 			self.__output_matrix[layer] = np.zeros((self.__neuron_map[layer],))
-			self._order_of_execution.append(layer)
-			error_queue.pop(error_index)
-			error_index = 0
+			
+		self._order_of_execution = order_of_execution
+		
+	def _find_cycle(self, pending):
+		"""
+		Private function to find a cycle among the layers that
+		were not generated, those with inputs pending. Each of
+		them takes input from another such layer, so walking the
+		inputs back reaches a layer twice
+		"""
+		layer = next(layer[0] for layer in self._order_of_initialization if pending[layer[0]] > 0)
+		path = []
+		visited = {}
+		while(layer not in visited):
+			visited[layer] = len(path)
+			path.append(layer)
+			layer = next(connection for connection in self.__input_connections[layer] if pending[connection] > 0)
+			
+		# The cycle in the direction of the connections
+		cycle = path[visited[layer]:][::-1]
+		return cycle + [cycle[0]]
 				
 							
 	# The function to calculate the output
@@ -342,6 +534,8 @@ class ArtificialNeuralNetwork(object):
 			Specify the input values of each layer according to the index
 			Along with the associative sensor values
 			
+			A batch of B inputs is specified with arrays of dimensions (B, n)
+			
 		Returns
 		-------
 		output_dict: dictionary
@@ -350,107 +544,332 @@ class ArtificialNeuralNetwork(object):
 			
 			They are generally supposed to be hardware layers
 			
+			For a batch, each output is of dimensions (B, n)
+			
 		Raises
 		------
-		Exception
-			Make sure the layers that provide output to the same hardware layer 
-			have the same dimensions
+		ValueError
+			If the sensor inputs have different batch dimensions
 		
 		Notes
 		-----
 		Get the sensor input from the input dictionary passed by the user
-		And feed the dictionary to the tensorflow session
+		and execute the plan compiled after the construction of the graph.
+		Sensors missing from the dictionary are taken as zeros, and sensors
+		without a batch dimension are used for every sample of a batch.
 		
-		"""
-		# Iterate through the layers
-
-		sensor_input = {}
-		output = {}
-		
-		for layer in self._order_of_initialization:
-			# Get the sensor input
-			try:
-				sensor_input[layer[0]] = input_dict[layer[3]]
-			except KeyError:
-				sensor_input[layer[0]] = np.zeros((self.__neuron_map[layer[0]], ))
-
-		# Calculate the output according to order of execution
-		if(self.__type_of_network == "STATIC"):
-			for layer in self._order_of_execution:
-				input_vector = np.array([])
-				
-				if(layer in self.__input_layers):
-					input_vector = np.zeros((self.__neuron_map[layer]))
-					self.__output_matrix[layer] = self.__layer_map[layer].forward_propagate(
-												  input_vector, sensor_input[layer])
-				else:
-					# A small bottleneck
-					for connection in self.__input_connections[layer]:
-						input_vector = np.concatenate([input_vector, self.__output_matrix[connection]])
-					self.__output_matrix[layer] = self.__layer_map[layer].forward_propagate(
-												  input_vector, sensor_input[layer])
-												  
-												  
-		else:
-			for layer in self._order_of_execution:
-				input_vector = np.array([])
-				
-				if(layer in self.__input_layers):
-					input_vector = np.zeros((self.__neuron_map[layer]))
-					self.__output_matrix[layer] = self.__layer_map[layer].forward_propagate(
-												  input_vector, sensor_input[layer])
-				else:
-					# A small bottleneck
-					for connection in self.__input_connections[layer]:
-						input_vector = np.concatenate([input_vector, self.__state_matrix[connection]])
-						
-					self.__output_matrix[layer] = self.__layer_map[layer].forward_propagate(
-												  input_vector, sensor_input[layer])
-												  
+		Dynamic Networks keep a separate state for each sample of a batch,
+		a change of the batch size starts the state from zero
 		
-		output = self.__output_matrix
-		for layer in self.__output_matrix.keys():
-			self.__state_matrix[layer] = self.__output_matrix[layer]
+		"""
+		# Arrange the sensor inputs in the order of the plan
+		sensor_inputs = [input_dict.get(sensor) for sensor in self.__plan.sensors]
+		hardware_outputs = self.__plan.execute(sensor_inputs)
 		
 		# Return the output_dict
 		output_dict = {}
-		for layer in self.__output_layers:
-			output_vector = None
-			# Collect all the hardware stuff
-			for connection in self.__input_connections[layer]:
-				try:
-					if output_vector == None:
-						output_vector = np.array(output[connection])
-					else:
-						output_vector = np.sum(output_vector, output[connection])
-				except:
-					raise RuntimeError("There is something wrong with the configuration of " + layer)
-					
-			output_dict[layer] = output_vector
+		for layer, output_vector in zip(self.__plan.hardware, hardware_outputs):
+			output_dict[layer] = np.array(output_vector)
+			
+		return output_dict
+		
+	# The function to calculate the output from positional inputs
+	def forward_array(self, *sensor_inputs):
+		"""
+		Generate the output of the Neural Network in a single iteration,
+		without dictionaries
+		
+		Parameters
+		----------
+		*sensor_inputs: array_like
+			The input of each sensor, in the order of sensor_names,
+			of dimensions (n, ) or (B, n) for a batch
+			
+		Returns
+		-------
+		hardware_outputs: list
+			The output of each hardware layer, in the order of
+			hardware_names
+			
+		Raises
+		------
+		ValueError
+			If the number of sensor inputs is not correct, or they
+			have different batch dimensions
+		
+		Notes
+		-----
+		The outputs are views of the buffers of the network, and
+		are overwritten by the next iteration. Copy them to keep them
+		"""
+		return self.__plan.execute(sensor_inputs)
+		
+	# The function to calculate the output for a number of iterations
+	def rollout(self, input_dict, state=None, keep_trajectory=True):
+		"""
+		Generate the output of the Neural Network for T iterations
+		
+		Parameters
+		----------
+		input_dict: dictionary
+			The input of each sensor for each iteration, keyed by the
+			name of the sensor, of dimensions (T, n) or (T, B, n) for
+			a batch. A single array for a network with one sensor
+			
+		state(optional): array_like
+			The state to start from, in the format of the state
+			attribute. By default the state of the previous iteration
+			is kept
+			
+		keep_trajectory(optional): boolean
+			Return the outputs of every iteration, or only of the
+			last iteration, to keep the memory low for long rollouts
+			
+		Returns
+		-------
+		output_dict: dictionary
+			The output of the hardware layers, each of dimensions
+			(T, m) or (T, B, m), or (m, ) or (B, m) without the
+			trajectory
+			
+		state: array_like
+			The state after the last iteration, to continue the
+			rollout from
+			
+		Raises
+		------
+		ValueError
+			If the sensor inputs do not have the same number of
+			iterations, or the state is not of the correct dimensions
+			
+		Notes
+		-----
+		The iterations run in a loop over the buffers of the execution
+		plan, without dictionaries. This is the same as calling
+		forward_propagate T times
+		"""
+		if(not isinstance(input_dict, dict)):
+			if(len(self.__plan.sensors) != 1):
+				raise ValueError("Specify the inputs of the sensors in a dictionary")
+			input_dict = {self.__plan.sensors[0]: input_dict}
+			
+		sensor_inputs = [input_dict.get(sensor) for sensor in self.__plan.sensors]
+		hardware_outputs = self.__plan.rollout(sensor_inputs, state, keep_trajectory)
+		
+		output_dict = dict(zip(self.__plan.hardware, hardware_outputs))
+			
+		return output_dict, self.state
+		
+	# The function to calculate the output of a population
+	def forward_population(self, input_dict, parameter_vector):
+		"""
+		Generate the output of the Neural Network in a single iteration,
+		for each parameter vector of a population, without loading them
+		
+		Parameters
+		----------
+		input_dict: dictionary
+			Specify the input values of each layer according to the index
+			Along with the associative sensor values. The inputs are the
+			same for each individual, and can be a batch
+			
+		parameter_vector: array_like
+			The format of load_parameters_from_vector, with a matrix of
+			dimensions (P, number_of_parameters_of_layer) for each layer,
+			one row for each of the P individuals
+			
+		Returns
+		-------
+		output_dict: dictionary
+			Dictionary specifying the output of the hardware layers, each
+			of dimensions (P, n), or (P, B, n) for a batch of inputs
+			
+		Raises
+		------
+		ValueError
+			If the layers have parameters of different populations
+		
+		Notes
+		-----
+		Each layer evaluates all the individuals with a single batched
+		matrix product. The parameters loaded in the network are not
+		changed. For Dynamic Networks, the state of each individual is
+		kept while the population size stays the same
+		"""
+		# Arrange the parameters in the order of execution
+		parameters = [None] * len(self._order_of_execution)
+		input_layers = set(self.__input_layers)
+		for index in range(len(self._order_of_initialization)):
+			layer_name = self._order_of_initialization[index][0]
+			
+			if(layer_name not in input_layers):
+				parameters[self.__plan.layer_index[layer_name]] = parameter_vector[index]
+		
+		sensor_inputs = [input_dict.get(sensor) for sensor in self.__plan.sensors]
+		hardware_outputs = self.__plan.execute(sensor_inputs, parameters)
+		
+		output_dict = {}
+		for layer, output_vector in zip(self.__plan.hardware, hardware_outputs):
+			output_dict[layer] = np.array(output_vector)
 			
 		return output_dict
 		
+	# Compile the execution plan
+	def _compile_plan(self):
+		"""
+		Private function to compile the computational graph
+		into an execution plan
+		
+		...
+		
+		Parameters
+		----------
+		None
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			Make sure the layers that provide output to the same hardware layer 
+			have the same dimensions
+			
+		Notes
+		-----
+		The plan keeps references to the layer objects, it is
+		compiled again when the layers are replaced
+		"""
+		self.__plan = ExecutionPlan(self.__layer_map, self._order_of_initialization,
+									self._order_of_execution, self.__input_connections,
+									self.__input_layers, self.__output_layers,
+									self.__type_of_network, self.__integrator, self.__time_interval,
+									self.__dtype)
+		self._optimize_plan()
+		
+		if(self.__profile is not None):
+			self.__plan.profile(self.__profile)
+		
+	# Optimize the plan with the parameter buffer
+	def _optimize_plan(self):
+		"""
+		Private function to generate the optimized program of
+		the plan, for the current layers and parameter buffer
+		"""
+		if(self.__optimized is True):
+			self.__plan.optimize(self.__buffer)
+		
 	# Function to save the layer parameters
 	def save_parameters_to_file(self, file_name):
 		"""
 		Save the parameters of the Neural Network
 		
-		Using pickle, the list of layers is stored
+		Parameters
+		----------
+		file_name: string
+			The path of the file. A name ending in .npy is saved
+			as a raw array, with the topology in a .json file of
+			the same name, otherwise a .npz archive is saved(the
+			extension is appended if missing)
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		None
+		
+		Notes
+		-----
+		The file keeps the topology of the network, a JSON
+		description with the format version, and the parameter
+		buffer as a flat array. It is loaded without pickle, and
+		the raw format can be memory mapped
 		"""
-		# Use pickle to save the layer_map
-		with open(file_name, 'wb') as f:
-			pickle.dump(self.__layer_map, f)
+		topology = json.dumps(self.topology)
+		
+		if(file_name.endswith(".npy")):
+			np.save(file_name, self.__buffer)
+			with open(file_name[:-len(".npy")] + ".json", 'w') as f:
+				f.write(topology)
+		else:
+			np.savez(file_name, topology=np.array(topology), parameters=self.__buffer)
 			
 	# Function to load the layer parameters
-	def load_weights_from_file(self, file_name):
-		""" Load the parameters of the Neural Network """
-		# Use pickle to load the layer_map
-		with open(file_name, 'rb') as f:
-			layer_map = pickle.load(f)
-			
-			# Load the dictionary
-			self.__layer_map = layer_map
-	
+	def load_weights_from_file(self, file_name, mmap_mode=None, allow_pickle=False):
+		"""
+		Load the parameters of the Neural Network from a file
+		
+		Parameters
+		----------
+		file_name: string
+			The path of a file saved by save_parameters_to_file
+			
+		mmap_mode(optional): string
+			The mmap_mode of numpy.load, for a raw .npy file. The
+			network then uses the memory mapped array as its
+			parameter buffer, instead of a copy. Use "c" to change
+			the parameters in memory only, and "r+" to write them
+			to the file
+			
+		allow_pickle(optional): boolean
+			Allow the pickled files of the previous versions. Only
+			for trusted files, pickle can execute arbitrary code
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			If the file is not of this network, is of a newer
+			format version, or is a pickle and allow_pickle is False
+			
+		Notes
+		-----
+		The parameters are copied into the existing buffer, the
+		layers and the execution plan are not constructed again.
+		They are converted to the dtype of the network, a memory
+		mapped file has to be of the same dtype
+		"""
+		if(allow_pickle is True and _file_format(file_name) == "pickle"):
+			# Use pickle to load the layer_map
+			with open(file_name, 'rb') as f:
+				layer_map = pickle.load(f)
+				
+				# Load the dictionary
+				self.__layer_map = layer_map
+				
+			# The buffer and the plan refer to the previous layers
+			self._share_parameters()
+			self._compile_plan()
+			return
+			
+		topology, buffer = _read_network_file(file_name, mmap_mode)
+		self._load_buffer(topology, buffer, mmap_mode is not None)
+		
+	# Load a parameter buffer read from a file
+	def _load_buffer(self, topology, buffer, share):
+		"""
+		Private function to load the parameter buffer of a file,
+		after checking that the file is of the same topology.
+		The buffer is copied, or used by the network if share
+		is True
+		"""
+		expected = self.topology
+		for key in expected.keys():
+			if(key not in ("format_version", "dtype") and topology.get(key) != expected[key]):
+				raise ValueError("The file is of a different network, " + key + " does not match")
+				
+		if(share is True):
+			self._share_parameters(buffer)
+			self._optimize_plan()
+		else:
+			np.copyto(self.__buffer, buffer)
+			
 	# Function to return the parameters in the form of a vector		
 	def return_parameters_as_vector(self):
 		"""
@@ -479,12 +898,13 @@ class ArtificialNeuralNetwork(object):
 		# Determine an individual layer's weight matrix in row major form and then it's bias
 		# Then concatenate it with the previous output vector
 		output_dict = {}
+		input_layers = set(self.__input_layers)
 	
 		for index in range(len(self._order_of_initialization)):
 			# For further use
 			layer_name = self._order_of_initialization[index][0]
 			
-			if(layer_name not  in self.__input_layers):
+			if(layer_name not in input_layers):
 				# Layer present as hidden
 				output_dict[layer_name] = self.__layer_map[layer_name].return_parameters()
 				
@@ -513,16 +933,18 @@ class ArtificialNeuralNetwork(object):
 		------			
 		Warning
 			If the user specifies parameters greater than required
+			
+		Notes
+		-----
+		Each list is copied into the parameter buffer of the network
 		"""
-		# Convert to numpy array
-		parameter_vector = np.array(parameter_vector)
-		
 		# Load the parameters layer by layer
+		input_layers = set(self.__input_layers)
 		for index in range(len(self._order_of_initialization)):
 			# For further use
 			layer_name = self._order_of_initialization[index][0]
 			
-			if(layer_name not in self.__input_layers):
+			if(layer_name not in input_layers):
 				# Layer present as hidden
 				self.__layer_map[layer_name].update_parameters(parameter_vector[index])
 					
@@ -530,8 +952,184 @@ class ArtificialNeuralNetwork(object):
 		if(len(parameter_vector) > self.__number_of_layers):
 			warnings.warn("The parameter vector consists of elements greater than required")
 			
+	# Function to load the parameters from a flat vector
+	def load_parameters(self, parameter_vector):
+		"""
+		Load the parameters of the network from a flat vector
+		
+		Parameters
+		----------
+		parameter_vector: array_like
+			A vector of number_of_parameters elements, the parameters
+			of each layer(except the input layers) concatenated in the
+			order of initialization. This is the layout of a chromosome
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			If the number of parameters is not correct
+			
+		Notes
+		-----
+		The vector is copied into the parameter buffer of the network
+		with a single copy, the layers see it through their views
+		"""
+		if(np.shape(parameter_vector) != self.__parameters.shape):
+			raise ValueError("The parameter vector should have " + str(self.__parameters.shape[0]) + " elements")
+			
+		np.copyto(self.__parameters, parameter_vector)
+		
+	# A network of the same topology with its own buffers
+	def replicate(self):
+		"""
+		Return a replica of the Neural Network
+		
+		Parameters
+		----------
+		None
+		
+		Returns
+		-------
+		replica: ArtificialNeuralNetwork
+			A network of the same topology, with a copy of the
+			parameters and a zero state
+			
+		Raises
+		------
+		None
+		
+		Notes
+		-----
+		The replica shares the topology, the connections and the
+		execution plan of the network, and owns only its layers,
+		parameter buffer and state buffers. This is much cheaper
+		than a deepcopy. A replica is reused by loading new
+		parameters with load_parameters and calling reset. The
+		replica is not profiled
+		"""
+		replica = ArtificialNeuralNetwork.__new__(type(self))
+		replica.__dict__.update(self.__dict__)
+		
+		replica.__layer_map = dict((name, layer.replicate()) for name, layer in self.__layer_map.items())
+		replica._share_parameters()
+		replica.__plan = self.__plan.replicate(replica.__layer_map)
+		replica.__profile = None
+		replica._optimize_plan()
+		
+		return replica
+		
+	# Start from a zero state
+	def reset(self):
+		"""
+		Reset the state of the Neural Network to zero, the
+		outputs of the previous iteration are cleared
+		
+		Parameters
+		----------
+		None
+		
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		None
+		"""
+		for layer in self.__layer_map.values():
+			layer.reset()
+			
+		self.__plan.reset()
+		
+	# Optimize the iterations of a Static Network
+	def optimize(self):
+		"""
+		Optimize the execution plan of a Static Network
+		
+		Parameters
+		----------
+		None
+		
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			If the network is a Dynamic Network
+			
+		Notes
+		-----
+		The layers that do not reach a hardware layer are dropped,
+		sibling layers with the same input and activation function
+		are evaluated with a single block matrix, and chains of
+		Linear and Identity layers are folded into one affine map.
+		
+		The parameters keep the layout of each layer, so loading
+		parameters and chromosomes is not affected. The blocks are
+		generated again when the parameters change. The output_matrix
+		of the folded and dropped layers is not calculated, and
+		forward_population evaluates every layer
+		"""
+		if(self.__type_of_network != "STATIC"):
+			raise ValueError("Only a Static Network can be optimized")
+			
+		self.__optimized = True
+		self._optimize_plan()
+		
+	# Export the network as a standalone module
+	def export_module(self, file_name):
+		"""
+		Generate a standalone Python module of the network,
+		that depends only on numpy
+		
+		Parameters
+		----------
+		file_name: string
+			The path of the module, the .py extension is appended
+			if missing
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueError
+			If a layer has an activation function that is not
+			of activation_functions.py
+			
+		Notes
+		-----
+		The module embeds the current parameters, the changes
+		made to the network later are not exported. Its Network
+		class has a forward method that takes the sensor inputs
+		in the order of sensor_names and returns the outputs in
+		the order of hardware_names, like forward_array, with a
+		statement for each layer instead of the execution plan.
+		The state of a Dynamic Network starts from zero, it is
+		kept by each Network object and cleared by its reset
+		"""
+		sensor_map = dict((layer[0], layer[3]) for layer in self._order_of_initialization)
+		layers = [(layer, self.__layer_map[layer]) for layer in self._order_of_execution]
+		
+		source = generate_module(layers, self.__input_connections, self.__input_layers, sensor_map,
+								 self.__plan.sensors, self.__plan.hardware, self.__type_of_network,
+								 self.__integrator, self.__time_interval, self.__dtype)
+		
+		if(not file_name.endswith(".py")):
+			file_name = file_name + ".py"
+			
+		with open(file_name, "w") as module_file:
+			module_file.write(source)
+		
 	# Function to visualize the network
-	def visualize(self, file_name, show=False):
+	def visualize(self, file_name, show=False, profile=False):
 		"""
 		Visualize the computational graph of the network
 		
@@ -543,13 +1141,19 @@ class ArtificialNeuralNetwork(object):
 		show(optional): boolean
 			This specifies whether we want to view the network or not
 			
+		profile(optional): boolean
+			Annotate each layer with its time and FLOPs per iteration,
+			shaded by its share of the time
+			
 		Returns
 		-------
 		None
 		
 		Raises
 		------			
-		None
+		ValueError
+			If the profile is annotated for a network that is not
+			profiled
 		
 		Notes
 		-----
@@ -559,7 +1163,28 @@ class ArtificialNeuralNetwork(object):
 		
 		We generate 3 clusters: Sensor, Layers and Hardware
 		Then provide connections between them
+		
+		graphviz is imported at the first call, it is not
+		required to construct and run a network
 		"""
+		from graphviz import Digraph
+		
+		# The profile of each layer, the layers of a block share its profile
+		statistics = {}
+		if(profile is True):
+			if(self.__profile is None):
+				raise ValueError("The network is not profiled, set profiling to True first")
+				
+			for name, layer_profile in self.__profile.layers.items():
+				if(layer_profile.calls == 0):
+					continue
+					
+				for layer in ([name] if name in self.__layer_map else name.split("+")):
+					statistics[layer] = (name, layer_profile)
+					
+			total = self.__profile.seconds
+			iterations = float(max(self.__profile.iterations, 1))
+		
 		ann = Digraph('ANN', filename=file_name + '.gv')
 		ann.node_attr['shape'] = 'box'
 		ann.graph_attr['rankdir'] = 'LR'
@@ -584,7 +1209,18 @@ class ArtificialNeuralNetwork(object):
 			
 			# Add the edges within the node cluster
 			for layer in self._order_of_initialization:
-				cluster.node(layer[0], label=layer[0])
+				if(layer[0] in statistics):
+					name, layer_profile = statistics[layer[0]]
+					share = layer_profile.seconds / total if total > 0 else 0.0
+					label = layer[0] + "\n{:.1f} us/iter ({:.0%})\n{:.0f} FLOPs/iter".format(
+							layer_profile.seconds * 1e6 / iterations, share, layer_profile.flops / iterations)
+					if(name != layer[0]):
+						label = label + "\nblock " + name
+						
+					# White for no time, red for all of it
+					cluster.node(layer[0], label=label, fillcolor="0.000 {:.3f} 1.000".format(share))
+				else:
+					cluster.node(layer[0], label=layer[0])
 				for output in layer[4]:
 					if(output not in self.__output_layers):
 						cluster.edge(layer[0], output)
@@ -649,16 +1285,34 @@ class ArtificialNeuralNetwork(object):
 	def number_of_parameters(self):
 		"""The number of trainable parameters of the network
 		"""
+		return self.__parameters.shape[0]
 		
-		length = 0
-		# Loop through the various layers and add
-		# their respective length of parameter vector
-		for index in range(len(self._order_of_initialization)):
-			layer_name = self._order_of_initialization[index][0]
-			if(layer_name not  in self.__input_layers):
-				length = length + len(self.__layer_map[layer_name].return_parameters())
-				
-		return length
+	@property
+	def parameters(self):
+		"""The trainable parameters of the network
+			A view of the parameter buffer, in the layout of a chromosome
+		"""
+		return self.__parameters
+		
+	@property
+	def topology(self):
+		"""The description of the network in a file
+			The layers, as [name, neurons, activation function, sensor, outputs],
+			and the layout of the parameter buffer
+		"""
+		topology = {
+			"format_version": FORMAT_VERSION,
+			"type_of_network": self.__type_of_network,
+			"time_interval": self.__time_interval,
+			"integrator": self.__integrator,
+			"dtype": self.__dtype.name,
+			"layers": [[layer[0], layer[1], type(layer[2]).__name__, layer[3], list(layer[4])]
+					   for layer in self._order_of_initialization],
+			"number_of_parameters": self.__parameters.shape[0],
+			"size": self.__buffer.shape[0]
+		}
+		
+		return topology
 		
 	@property
 	def time_interval(self):
@@ -667,18 +1321,186 @@ class ArtificialNeuralNetwork(object):
 		"""
 		return self.__time_interval
 		
+	@property
+	def integrator(self):
+		""" The integrator of the Dynamic Layers
+		"""
+		return self.__integrator
+		
+	@property
+	def dtype(self):
+		""" The floating point type of the network
+		"""
+		return self.__dtype
+		
+	@property
+	def optimized(self):
+		""" Whether the iterations use the optimized plan
+		"""
+		return self.__optimized
+		
+	@property
+	def profiling(self):
+		""" Whether the layers are profiled in the iterations
+			The layers of the execution plan are wrapped by a profile
+			while profiling, and the iterations are not changed otherwise
+		"""
+		return self.__profile is not None
+		
+	@profiling.setter
+	def profiling(self, profiling):
+		if(profiling is True):
+			self.__profile = NetworkProfile()
+		else:
+			self.__profile = None
+			
+		self.__plan.profile(self.__profile)
+		
+	@property
+	def profile(self):
+		""" The profile of the layers while profiling
+			Its table() method returns the statistics of each layer
+		"""
+		return self.__profile
+		
 	@property
 	def output_matrix(self):
 		""" Output matrix
 			Shows the outputs of every layer
 		"""
 		
-		return self.__state
+		output_matrix = {}
+		for layer in self._order_of_execution:
+			output_matrix[layer] = np.array(self.__plan.layer_output(layer))
+			
+		return output_matrix
 		
-	
+	@property
+	def state(self):
+		""" The state of the network
+			The output of every layer in the previous iteration, concatenated
+			in the order of execution, the input of the next iteration. For the
+			integrators other than legacy, followed by the state of the neurons
+		"""
+		return self.__plan.state
+		
+	@property
+	def sensor_names(self):
+		""" The names of the sensors
+			Specifies the order of the arguments of forward_array
+		"""
+		return list(self.__plan.sensors)
+		
+	@property
+	def hardware_names(self):
+		""" The names of the hardware layers
+			Specifies the order of the outputs of forward_array
+		"""
+		return list(self.__plan.hardware)
+
+
+# The format of a file of save_parameters_to_file
+def _file_format(file_name):
+	"""
+	Private function to return the format of a file,
+	"npz", "npy" or "pickle", from its first bytes
+	"""
+	with open(file_name, 'rb') as f:
+		magic = f.read(6)
+		
+	if(magic.startswith(b"PK\x03\x04")):
+		return "npz"
+	elif(magic == b"\x93NUMPY"):
+		return "npy"
+	else:
+		return "pickle"
+		
+# Read the topology and the parameter buffer of a file
+def _read_network_file(file_name, mmap_mode=None):
+	"""
+	Private function to read the topology and the parameter
+	buffer saved by save_parameters_to_file, without pickle
+	"""
+	# numpy.savez appends the extension
+	if(not os.path.exists(file_name) and os.path.exists(file_name + ".npz")):
+		file_name = file_name + ".npz"
+		
+	file_format = _file_format(file_name)
+	if(file_format == "pickle"):
+		raise ValueError("The file is a pickle of a previous version, load it with allow_pickle=True if it is trusted")
+		
+	if(file_format == "npz"):
+		if(mmap_mode is not None):
+			raise ValueError("Only the raw .npy files can be memory mapped")
 			
+		with np.load(file_name, allow_pickle=False) as data:
+			topology = json.loads(data["topology"].item())
+			buffer = data["parameters"]
+	else:
+		with open(os.path.splitext(file_name)[0] + ".json", 'r') as f:
+			topology = json.load(f)
+		buffer = np.load(file_name, mmap_mode=mmap_mode, allow_pickle=False)
+		
+	if(topology.get("format_version", FORMAT_VERSION + 1) > FORMAT_VERSION):
+		raise ValueError("The file is of a newer format version, " + str(topology.get("format_version")))
+		
+	# The networks before the integrators and the dtype
+	topology.setdefault("integrator", "legacy")
+	topology.setdefault("dtype", "float64")
+		
+	return topology, buffer
 	
-				
+# Generate a network from a file
+def load_network(file_name, mmap_mode=None, custom_activations=None):
+	"""
+	Generate a Neural Network from a file saved by
+	save_parameters_to_file
+	
+	Parameters
+	----------
+	file_name: string
+		The path of the file
 		
+	mmap_mode(optional): string
+		The mmap_mode of numpy.load, for a raw .npy file.
+		Specified in load_weights_from_file
 		
-
+	custom_activations(optional): dictionary
+		The classes of the activation functions that are not
+		in activation_functions.py, keyed by their name
+		
+	Returns
+	-------
+	nn: ArtificialNeuralNetwork
+		The network of the file, with its parameters
+		
+	Raises
+	------
+	ValueError
+		If an activation function is unknown, or the file
+		is not of a correct format
+		
+	Notes
+	-----
+	The activation functions are constructed with their
+	default parameters, their beta and theta are part of
+	the parameter buffer
+	"""
+	topology, buffer = _read_network_file(file_name, mmap_mode)
+	
+	if(custom_activations is None):
+		custom_activations = {}
+		
+	layer_vector = []
+	for name, neurons, activation, sensor, outputs in topology["layers"]:
+		activation_class = custom_activations.get(activation, getattr(activation_functions, activation, None))
+		if(activation_class is None):
+			raise ValueError("Unknown activation function " + activation + ", pass it in custom_activations")
+			
+		layer_vector.append(Layer(name, neurons, activation_class(), sensor, outputs))
+		
+	nn = ArtificialNeuralNetwork(layer_vector, topology["type_of_network"], topology["time_interval"],
+								 topology["integrator"], np.dtype(str(topology["dtype"])))
+	nn._load_buffer(topology, buffer, mmap_mode is not None)
+	
+	return nn
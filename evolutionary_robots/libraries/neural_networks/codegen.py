@@ -0,0 +1,461 @@
+"""Docstring for the codegen.py module
+
+This module generates the source of a standalone Python
+module for an Artificial Neural Network. The generated
+module depends only on numpy. It embeds the parameters of
+the network, and a forward function specialized to its
+topology, with one statement for each layer and no
+dictionaries or graph walk
+
+"""
+
+import base64
+import numpy as np
+from activation_functions import _TANH_NUMERATOR, _TANH_DENOMINATOR, _TANH_CLIP
+
+# The expression of each activation function, of the weighted
+# input z with the beta B{i} and theta T{i} of layer i
+_ACTIVATIONS = {
+	"IdentityActivation": "{z}",
+	"LinearActivation": "B{i} * ({z} - T{i})",
+	"StepActivation": "np.greater_equal({z} - T{i}, 0).astype(DTYPE)",
+	"SigmoidActivation": "1 / (1 + np.exp(-(B{i} * ({z} - T{i}))))",
+	"TanhActivation": "np.tanh(B{i} * ({z} - T{i}))",
+	"ReluActivation": "np.maximum(B{i} * ({z} - T{i}), 0)",
+	"MaximumActivation": "np.equal({z}, np.max({z}, axis=-1, keepdims=True)).astype(DTYPE)",
+	"FastTanhActivation": "_rational_tanh(B{i} * ({z} - T{i}))",
+	"FastSigmoidActivation": "0.5 * _rational_tanh(0.5 * (B{i} * ({z} - T{i}))) + 0.5"
+}
+
+# The stages of the Runge Kutta method, the fraction of the
+# time interval of the potentials of the next stage
+_RUNGE_KUTTA = [0.5, 0.5, 1.0, None]
+
+def generate_module(layers, input_connections, input_layers, sensor_map, sensors,
+					hardware, type_of_network, integrator, time_interval, dtype):
+	"""
+	Generate the source of a standalone module of a network
+
+	Parameters
+	----------
+	layers: array_like
+		The (name, layer object) of each layer, in the order
+		of execution
+
+	input_connections: dictionary
+		The names of the layers that provide input to each
+		layer and hardware layer, keyed by name
+
+	input_layers: array_like
+		The names of the layers that take input only from
+		sensors
+
+	sensor_map: dictionary
+		The sensor of each layer, "" for none, keyed by name
+
+	sensors: array_like
+		The names of the sensors, in the order of the arguments
+		of forward
+
+	hardware: array_like
+		The names of the hardware layers, in the order of the
+		outputs of forward
+
+	type_of_network: string
+		"STATIC" or "DYNAMIC"
+
+	integrator: string
+		The integrator of the Dynamic Layers
+
+	time_interval: float
+		The time interval of an iteration
+
+	dtype: data-type
+		The floating point type of the network
+
+	Returns
+	-------
+	source: string
+		The source of the module
+
+	Raises
+	------
+	ValueError
+		If a layer has an activation function that is not
+		of activation_functions.py
+
+	Notes
+	-----
+	The generated module has a Network class, whose forward
+	method takes the sensor inputs in the order of SENSORS
+	and returns the outputs in the order of HARDWARE. The state
+	of a Dynamic Network is the list of the outputs of each
+	layer in the previous iteration, in the order of LAYERS,
+	and the potentials of the integrated layers
+	"""
+	generator = _Generator(layers, input_connections, input_layers, sensor_map, sensors,
+						   hardware, type_of_network, integrator, time_interval, dtype)
+
+	return generator.source()
+
+class _Generator(object):
+	"""
+	Private class that collects the constants and the
+	statements of a generated module
+	"""
+
+	def __init__(self, layers, input_connections, input_layers, sensor_map, sensors,
+				 hardware, type_of_network, integrator, time_interval, dtype):
+		"""
+		Initialization function of the _Generator class
+		"""
+		self.layers = layers
+		self.index = dict((name, index) for index, (name, layer) in enumerate(layers))
+		self.input_connections = input_connections
+		self.input_layers = set(input_layers)
+		self.sensor_map = sensor_map
+		self.sensors = list(sensors)
+		self.hardware = list(hardware)
+		self.dynamic = (type_of_network == "DYNAMIC")
+		self.integrator = integrator if self.dynamic else "legacy"
+		self.time_interval = time_interval
+		self.dtype = np.dtype(dtype).newbyteorder("<")
+		self.type_of_network = type_of_network
+
+		# The names and values of the embedded arrays
+		self.constants = []
+
+		for name, layer in layers:
+			activation = type(layer.activation_function).__name__
+			if(activation not in _ACTIVATIONS):
+				raise ValueError("The activation function " + activation + " of " + name + " cannot be exported")
+
+	def source(self):
+		"""
+		Return the source of the module
+		"""
+		forward = self.forward()
+		lines = self.header() + [""] + self.parameters() + [""]
+
+		if(any(type(layer.activation_function).__name__.startswith("Fast") for name, layer in self.layers)):
+			lines = lines + self.rational_tanh() + [""]
+
+		lines = lines + self.network(forward)
+
+		return "\n".join(lines) + "\n"
+
+	def header(self):
+		"""
+		The docstring, imports and names of the module
+		"""
+		description = []
+		for name, layer in self.layers:
+			details = [str(layer.weight_dim[0]), type(layer.activation_function).__name__]
+			if(self.sensor_map[name] != ""):
+				details.append("sensor " + self.sensor_map[name])
+			description.append("\t" + name + "(" + ", ".join(details) + ")")
+
+		lines = ['"""Network generated by ArtificialNeuralNetwork.export_module', '',
+				 'A ' + self.type_of_network + ' network of the layers, in the order of execution']
+		lines = lines + description
+		lines = lines + ['', 'Usage, batch_shape=(B, ) for a batch of inputs', '\tnetwork = Network()',
+						 '\t' + ", ".join(_identifier(name) for name in self.hardware) + " = network.forward(" +
+						 ", ".join(_identifier(name) for name in self.sensors) + ")", '',
+						 'The sensor inputs are in the order of SENSORS, and the', 'outputs in the order of HARDWARE',
+						 '"""', '', 'import base64', 'import numpy as np', '',
+						 'DTYPE = np.dtype(' + repr(self.dtype.str) + ')',
+						 'LAYERS = ' + repr([str(name) for name, layer in self.layers]),
+						 'SENSORS = ' + repr([str(name) for name in self.sensors]),
+						 'HARDWARE = ' + repr([str(name) for name in self.hardware]),
+						 'TIME_INTERVAL = ' + repr(self.time_interval)]
+
+		return lines
+
+	def parameters(self):
+		"""
+		The embedded parameters, a single base64 encoded buffer
+		and a view of it for each array
+		"""
+		buffer = np.concatenate([np.ravel(value) for name, value in self.constants] + [np.zeros((0, ))])
+		encoded = base64.b64encode(buffer.astype(self.dtype).tobytes()).decode("ascii")
+
+		lines = ['# The parameters of the network', '_PARAMETERS = np.frombuffer(base64.b64decode(']
+		for start in range(0, len(encoded), 76):
+			lines.append('\tb"' + encoded[start:start + 76] + '"')
+		if(len(encoded) == 0):
+			lines.append('\tb""')
+		lines.append('), dtype=DTYPE)')
+		lines.append('')
+
+		offset = 0
+		for name, value in self.constants:
+			size = int(np.size(value))
+			view = '_PARAMETERS[' + str(offset) + ':' + str(offset + size) + ']'
+			if(np.ndim(value) == 2):
+				view = view + '.reshape(' + repr(tuple(int(dimension) for dimension in np.shape(value))) + ')'
+			lines.append(name + ' = ' + view)
+			offset = offset + size
+
+		return lines
+
+	def rational_tanh(self):
+		"""
+		The rational approximation of tanh of activation_functions.py
+		"""
+		return ['def _rational_tanh(x):',
+				'\t""" The rational approximation of tanh of FastTanhActivation """',
+				'\tx = np.clip(x, ' + repr(-_TANH_CLIP) + ', ' + repr(_TANH_CLIP) + ')',
+				'\tsquare = x * x',
+				'\tnumerator = ' + _horner("square", _TANH_NUMERATOR),
+				'\tdenominator = ' + _horner("square", _TANH_DENOMINATOR),
+				'\treturn x * numerator / denominator']
+
+	def network(self, forward):
+		"""
+		The Network class, with the state and forward function
+		"""
+		sensors = ", ".join(["self"] + ["S" + str(index) for index in range(len(self.sensors))])
+
+		lines = ['class Network(object):',
+				 '\t""" The network, a single controller or a batch of batch_shape """', '',
+				 '\tdef __init__(self, batch_shape=()):',
+				 '\t\tself.reset(batch_shape)', '',
+				 '\tdef reset(self, batch_shape=()):',
+				 '\t\t""" Reset the state of the network to zero, for inputs of batch_shape """',
+				 '\t\tself.batch_shape = tuple(batch_shape)']
+
+		if(self.dynamic):
+			state = []
+			for index, (name, layer) in enumerate(self.layers):
+				zeros = 'np.zeros(self.batch_shape + (' + str(layer.weight_dim[0]) + ', ), dtype=DTYPE)'
+				if(self.integrated(name)):
+					state.append('A' + str(index) + ' + ' + zeros)
+				else:
+					state.append(zeros)
+			lines.append('\t\tself.state = [' + ", ".join(state) + ']')
+			lines.append('\t\tself.potentials = [' + ", ".join('np.zeros(self.batch_shape + (' + str(layer.weight_dim[0]) +
+																  ', ), dtype=DTYPE)' for name, layer in self.layers
+																  if self.integrated(name)) + ']')
+
+		lines = lines + ['', '\tdef forward(' + sensors + '):',
+						 '\t\t""" The outputs of the hardware layers for one iteration """']
+		lines = lines + ['\t\t' + line for line in forward]
+
+		return lines
+
+	def integrated(self, name):
+		"""
+		Whether a layer is integrated with an integrator other
+		than legacy
+		"""
+		return self.integrator != "legacy" and name not in self.input_layers
+
+	def constant(self, name, value):
+		"""
+		Add an embedded array, once for each name, and
+		return its name
+		"""
+		if(name not in [constant for constant, array in self.constants]):
+			self.constants.append((name, np.array(value)))
+
+		return name
+
+	def forward(self):
+		"""
+		The statements of the forward function
+		"""
+		lines = ['S' + str(index) + ' = np.asarray(S' + str(index) + ', dtype=DTYPE)' for index in range(len(self.sensors))]
+
+		if(self.dynamic):
+			lines.append('[' + ", ".join('p' + str(index) for index in range(len(self.layers))) + '] = self.state')
+			integrated = [str(index) for index, (name, layer) in enumerate(self.layers) if self.integrated(name)]
+			if(integrated):
+				lines.append('[' + ", ".join('u' + index for index in integrated) + '] = self.potentials')
+
+		# The input layers and the layers that are not integrated
+		for index, (name, layer) in enumerate(self.layers):
+			if(not self.integrated(name)):
+				lines.append('# ' + name)
+				lines = lines + self.layer(index, name, layer)
+
+		if(self.integrator == "rk4"):
+			lines = lines + self.runge_kutta()
+		elif(self.integrator != "legacy"):
+			for index, (name, layer) in enumerate(self.layers):
+				if(self.integrated(name)):
+					lines.append('# ' + name)
+					lines = lines + self.integrate(index, name, layer)
+
+		if(self.dynamic):
+			lines.append('self.state = [' + ", ".join('o' + str(index) for index in range(len(self.layers))) + ']')
+			if(integrated):
+				lines.append('self.potentials = [' + ", ".join('u' + index for index in integrated) + ']')
+
+		outputs = []
+		for name in self.hardware:
+			outputs.append(" + ".join('o' + str(self.index[connection]) for connection in self.input_connections[name]))
+		lines.append('return [' + ", ".join(outputs) + ']')
+
+		return lines
+
+	def input_vector(self, name, prefix, stage_outputs=()):
+		"""
+		The expression of the input of a layer, from the
+		outputs of the current iteration(o) for a Static Network,
+		or the states of the previous iteration(p) otherwise. The
+		layers of stage_outputs give the outputs of a stage(q)
+		"""
+		sources = []
+		for connection in self.input_connections[name]:
+			index = self.index[connection]
+			sources.append(('q' if index in stage_outputs else prefix) + str(index))
+
+		if(len(sources) == 1):
+			return sources[0]
+
+		return 'np.concatenate((' + ", ".join(sources) + '), axis=-1)'
+
+	def sensor_input(self, index, name, layer):
+		"""
+		The expression of the weighted sensor input of a layer,
+		empty for a layer without a sensor
+		"""
+		if(self.sensor_map[name] == ""):
+			return ''
+
+		gain = self.constant('G' + str(index), layer.gain)
+		return ' + ' + gain + ' * S' + str(self.sensors.index(self.sensor_map[name]))
+
+	def activation(self, index, layer, z):
+		"""
+		The expression of the activation function of a layer
+		"""
+		activation_function = layer.activation_function
+		template = _ACTIVATIONS[type(activation_function).__name__]
+
+		neurons = (layer.weight_dim[0], )
+		if("B{i}" in template):
+			self.constant('B' + str(index), np.broadcast_to(activation_function.beta, neurons))
+		if("T{i}" in template):
+			self.constant('T' + str(index), np.broadcast_to(activation_function.theta, neurons))
+
+		return template.format(z=z, i=index)
+
+	def layer(self, index, name, layer):
+		"""
+		The statements of a layer that is not integrated
+		"""
+		output = 'o' + str(index)
+
+		# The weighted input of an input layer is zero
+		if(name in self.input_layers):
+			zeros = np.zeros((layer.weight_dim[0], ), dtype=layer.dtype)
+			constant = self.constant('C' + str(index), layer.forward_propagate(zeros, zeros))
+			return [output + ' = ' + constant + self.sensor_input(index, name, layer)]
+
+		weight = self.constant('W' + str(index), layer.weight_matrix)
+		if(self.dynamic):
+			input_vector = self.input_vector(name, 'p')
+			time_weight = self.constant('TW' + str(index), layer.time_weight)
+			return ['z = ' + time_weight + ' * (np.dot(' + input_vector + ', ' + weight + '.T)' +
+					self.sensor_input(index, name, layer) + ')',
+					output + ' = ' + self.activation(index, layer, 'z')]
+
+		input_vector = self.input_vector(name, 'o')
+		return ['z = np.dot(' + input_vector + ', ' + weight + '.T)',
+				output + ' = ' + self.activation(index, layer, 'z') + self.sensor_input(index, name, layer)]
+
+	def synaptic_input(self, index, name, layer, stage_outputs=()):
+		"""
+		The statement of the synaptic input of an integrated layer
+		"""
+		weight = self.constant('W' + str(index), layer.weight_matrix)
+
+		return ('i' + str(index) + ' = np.dot(' + self.input_vector(name, 'p', stage_outputs) + ', ' + weight + '.T)' +
+				self.sensor_input(index, name, layer))
+
+	def integrate(self, index, name, layer):
+		"""
+		The statements of a layer integrated with the euler
+		or exponential integrator
+		"""
+		potential = 'u' + str(index)
+		current_input = 'i' + str(index)
+		step = np.divide(self.time_interval, layer.time_constant)
+		self.constant('A' + str(index), layer.activate(np.zeros((layer.weight_dim[0], ), dtype=layer.dtype)))
+
+		lines = [self.synaptic_input(index, name, layer)]
+		if(self.integrator == "euler"):
+			constant = self.constant('STEP' + str(index), step)
+			lines.append(potential + ' = ' + potential + ' + ' + constant + ' * (' + current_input + ' - ' + potential + ')')
+		else:
+			constant = self.constant('DECAY' + str(index), np.exp(-step))
+			lines.append(potential + ' = ' + current_input + ' + (' + potential + ' - ' + current_input + ') * ' + constant)
+
+		lines.append('o' + str(index) + ' = ' + self.activation(index, layer, potential))
+
+		return lines
+
+	def runge_kutta(self):
+		"""
+		The statements of the integrated layers with the Runge
+		Kutta method of fourth order, the stages written out
+		"""
+		integrated = [(index, name, layer) for index, (name, layer) in enumerate(self.layers) if self.integrated(name)]
+		for index, name, layer in integrated:
+			self.constant('TC' + str(index), layer.time_constant)
+			self.constant('A' + str(index), layer.activate(np.zeros((layer.weight_dim[0], ), dtype=layer.dtype)))
+
+		lines = []
+		for stage, fraction in enumerate(_RUNGE_KUTTA):
+			lines.append('# Stage ' + str(stage + 1) + ' of Runge Kutta')
+
+			# The first stage takes the states, the others the stage outputs(q)
+			stage_outputs = ()
+			if(stage > 0):
+				stage_outputs = set(index for index, name, layer in integrated)
+
+			for index, name, layer in integrated:
+				potential = 'u' + str(index) if stage == 0 else 'v' + str(index)
+				derivative = 'd' + str(stage + 1) + '_' + str(index)
+				lines.append(self.synaptic_input(index, name, layer, stage_outputs))
+				lines.append(derivative + ' = (i' + str(index) + ' - ' + potential + ') / TC' + str(index))
+
+			for index, name, layer in integrated:
+				if(fraction is not None):
+					lines.append('v' + str(index) + ' = u' + str(index) + ' + ' + repr(fraction) + ' * ' +
+								 repr(self.time_interval) + ' * d' + str(stage + 1) + '_' + str(index))
+					lines.append('q' + str(index) + ' = ' + self.activation(index, layer, 'v' + str(index)))
+
+		for index, name, layer in integrated:
+			increments = " + ".join(str(weight) + ' * d' + str(stage) + '_' + str(index) if weight != 1
+									else 'd' + str(stage) + '_' + str(index)
+									for stage, weight in [(1, 1), (2, 2), (3, 2), (4, 1)])
+			lines.append('# ' + name)
+			lines.append('u' + str(index) + ' = u' + str(index) + ' + (' + increments + ') * ' +
+						 repr(self.time_interval / 6))
+			lines.append('o' + str(index) + ' = ' + self.activation(index, layer, 'u' + str(index)))
+
+		return lines
+
+def _horner(x, coefficients):
+	"""
+	Private function to return the expression of a polynomial
+	of x by Horner's method, of the highest power first
+	"""
+	expression = x + ' * ' + repr(coefficients[0]) + ' + ' + repr(coefficients[1])
+	for coefficient in coefficients[2:]:
+		expression = '(' + expression + ') * ' + x + ' + ' + repr(coefficient)
+
+	return expression
+
+def _identifier(name):
+	"""
+	Private function to return a Python identifier for
+	a name, for the usage in the docstring
+	"""
+	identifier = "".join(character if character.isalnum() else "_" for character in name)
+	if(identifier == "" or identifier[0].isdigit()):
+		identifier = "_" + identifier
+
+	return identifier
@@ -8,8 +8,103 @@ a Neural Network.
 # Import numpy
 import numpy as np
 from activation_functions import ActivationFunction
+from copy import copy
 import warnings
 
+# Helper functions for the parameter buffers ##################################
+def _activation_vector(activation_function, output_dim):
+	"""
+	Private function to return the beta and theta of an
+	activation function for each of output_dim neurons
+	"""
+	beta = np.ones((output_dim, )) * getattr(activation_function, 'beta', 1)
+	theta = np.ones((output_dim, )) * getattr(activation_function, 'theta', 0)
+
+	return np.concatenate([beta, theta])
+
+def _copy_parameters(parameter_buffer, parameter_vector, layer_name):
+	"""
+	Private function to copy a parameter vector into the
+	parameter buffer of a layer. Raises a ValueError if it
+	is shorter and warns if it is longer than the buffer
+	"""
+	try:
+		parameter_vector = np.asarray(parameter_vector, dtype=parameter_buffer.dtype).reshape(-1)
+	except (TypeError, ValueError):
+		raise ValueError("The parameter_vector of " + layer_name + " is not a vector of numbers")
+
+	if(parameter_vector.shape[0] < parameter_buffer.shape[0]):
+		raise ValueError("The parameter_vector of " + layer_name + " consists of elements less than required")
+
+	np.copyto(parameter_buffer, parameter_vector[:parameter_buffer.shape[0]])
+
+	# The user has specified parameters different than required
+	if(parameter_vector.shape[0] != parameter_buffer.shape[0]):
+		warnings.warn("The number of parameters entered do not match the parameter vector of " + layer_name)
+
+# Integrators of the Dynamic Layer ###########################################
+INTEGRATORS = ("legacy", "euler", "exponential", "rk4")
+
+def _integrate(integrator, state, current_input, time_constant, time_interval):
+	"""
+	Private function to integrate the state of the neurons
+	time_constant * dy/dt = -y + current_input over a time
+	interval, with the input held over the interval
+	"""
+	step = np.divide(time_interval, time_constant)
+	
+	if(integrator == "euler"):
+		return state + step * (current_input - state)
+	elif(integrator == "exponential"):
+		return current_input + (state - current_input) * np.exp(-step)
+	else:
+		# The four stages of Runge Kutta, for a constant input
+		return state + (current_input - state) * step * (1 - step / 2 * (1 - step / 3 * (1 - step / 4)))
+
+# Helper functions for a population of parameters ############################
+def _population_product(input_vector, weight_matrix):
+	"""
+	Private function to multiply a population of inputs of
+	dimensions (P, ..., input_dim) with a population of
+	weight matrices of dimensions (P, output_dim, input_dim)
+	in a single batched matmul
+	"""
+	population_size = weight_matrix.shape[0]
+	batch_shape = input_vector.shape[1:-1]
+
+	# Flatten the batch, one matrix product for each individual
+	input_matrix = input_vector.reshape(population_size, -1, input_vector.shape[-1])
+	output_matrix = np.matmul(input_matrix, weight_matrix.transpose(0, 2, 1))
+
+	return output_matrix.reshape((population_size, ) + batch_shape + (weight_matrix.shape[1], ))
+
+def _activate(activation_function, x, out=None):
+	"""
+	Private function to calculate the activation of x, into
+	the out buffer for the activation functions that support it
+	"""
+	if(out is not None and getattr(activation_function, 'supports_out', False)):
+		return activation_function.calculate_activation(x, out=out)
+
+	return activation_function.calculate_activation(x)
+
+def _population_activation(activation_function, x, beta, theta, out=None):
+	"""
+	Private function to calculate the activation of x with
+	a beta and theta of dimensions (P, output_dim) for each
+	individual. A copy of the activation function is used,
+	the parameters of the layer are not changed
+	"""
+	# Insert the batch dimensions between the population and neurons
+	shape = (beta.shape[0], ) + (1, ) * (x.ndim - 2) + (beta.shape[1], )
+
+	activation_function = copy(activation_function)
+	activation_function.beta = beta.reshape(shape)
+	activation_function.theta = theta.reshape(shape)
+
+	return _activate(activation_function, x, out)
+
+
 # Simple Layer, simple feed forward connection #################################
 class StaticLayer(object):
 	"""
@@ -51,12 +146,18 @@ class StaticLayer(object):
 	layer_name: string
 		Specifies the name of the layer 
 		
+	dtype(optional): data-type
+		The floating point type of the parameters, float64 by
+		default. The ArtificialNeuralNetwork passes its own
 		
 	Methods
 	-------
 	forward_propagate(input_vector)
 		Calculate the output of the Layer when input_vector is passed
 		
+	forward_population(input_vector, sensor_input, parameter_matrix)
+		Calculate the output of the Layer for a population of parameters
+		
 	update_parameters(parameter_vector)
 		Update the parameters based on a vector passed as argument
 		
@@ -71,7 +172,7 @@ class StaticLayer(object):
 	get_activation_parameters()
 		Get the parameters of activation function
 	"""
-	def __init__(self, input_dim, output_dim, activation_function, layer_name):
+	def __init__(self, input_dim, output_dim, activation_function, layer_name, dtype=np.float64):
 		"""
 		Initialization function of StaticLayer class		
 		...
@@ -94,19 +195,20 @@ class StaticLayer(object):
 		# Initialize the weight and bias dimensions
 		self.__weight_dim = (output_dim, input_dim)
 		
-		# Initialize the weight matrix
-		self.weight_matrix = np.random.rand(*self.weight_dim)
-		
-		# Set the gain of the sensors values that are going to be input
-		# as an associative layer or input layer
-		self._gain = np.ones((output_dim, ))
-		
 		# Set the activation function
 		self.__activation_function = activation_function
 		# Also check if the activation function is an instance of the ActivationFunction
 		if(not hasattr(self.__activation_function, 'calculate_activation')):
 			raise TypeError("The activation class needs to contain a method calculate_activation for " + self.__layer_name)
 		
+		# Initialize the weight matrix and the activation parameters
+		parameter_vector = np.concatenate([np.random.rand(*self.weight_dim).flatten(),
+										   _activation_vector(activation_function, output_dim)]).astype(dtype)
+		
+		# Set the gain of the sensors values that are going to be input
+		# as an associative layer or input layer
+		self.share_parameters(parameter_vector, np.ones((output_dim, ), dtype=dtype))
+		
 	def forward_propagate(self, input_vector, sensor_input):
 		"""
 		Generate the output of the Layer when input_vector
@@ -135,6 +237,8 @@ class StaticLayer(object):
 		The input_vector has dimensions (input_dim, )
 		The output_vector has dimensions (output_dim, )
 		The sensor_input should have dimensions (output_dim, )
+		A batch of inputs of dimensions (B, input_dim) generates
+		a batch of outputs of dimensions (B, output_dim)
 		The weight_matrix has dimensions (output_dim, input_dim)
 		Each of the columns of the weight_matrix tune for a single input node
 		Each of the rows of the weight_matrix tune for a single output node
@@ -144,18 +248,15 @@ class StaticLayer(object):
 		"""
 		
 		try:
-			# Convert the input vector to numpy array
-			input_vector = np.array(input_vector)
-			sensor_input = np.array(sensor_input)
-			
 			# Output vector is obtained by dotting weight and input, then adding with bias
-			output_vector = np.dot(self.weight_matrix, input_vector)
+			# The input is on the left so that the leading batch dimension is kept
+			output_vector = np.dot(input_vector, self.__weight_matrix.T)
 			
-			# Activate the output
-			output_vector = self.__activation_function.calculate_activation(output_vector)
+			# Activate the output, in the buffer of the product
+			output_vector = _activate(self.__activation_function, output_vector, output_vector)
 			
 			# Add the sensor input
-			output_vector = output_vector + np.multiply(self.gain, sensor_input)
+			output_vector = output_vector + np.multiply(self._gain, sensor_input)
 			
 			# Output 
 			return output_vector
@@ -164,6 +265,146 @@ class StaticLayer(object):
 			raise ValueError("Please check dimensions of " + self.__layer_name)
 
 		
+	# Function to calculate the output for a population of parameters
+	def forward_population(self, input_vector, sensor_input, parameter_matrix):
+		"""
+		Generate the output of the Layer for each parameter
+		vector of a population, without loading them
+		
+		Parameters
+		----------
+		input_vector: array_like
+			The input of each individual, of dimensions
+			(P, input_dim) or (P, B, input_dim)
+			
+		sensor_input: array_like
+			The sensor input to be added
+			
+		parameter_matrix: array_like
+			The parameter vector of each individual, of dimensions
+			(P, number_of_parameters), in the layout of update_parameters
+			
+		Returns
+		-------
+		output_vector: array_like
+			The output of each individual, of dimensions
+			(P, output_dim) or (P, B, output_dim)
+			
+		Raises
+		------
+		ValueError
+			If the dimensions of the inputs or parameters are not correct
+			
+		Notes
+		-----
+		The weight matrices of dimensions (P, output_dim, input_dim)
+		are views of the parameter_matrix, and the output of all
+		the individuals is a single batched matrix product
+		"""
+		try:
+			parameter_matrix = np.asarray(parameter_matrix)
+			population_size = parameter_matrix.shape[0]
+			weight_interval = self.weight_dim[0] * self.weight_dim[1]
+			activation_interval = self.weight_dim[0]
+			
+			# Views of the parameters of each individual
+			weight_matrix = parameter_matrix[:, :weight_interval].reshape((population_size, ) + self.weight_dim)
+			beta = parameter_matrix[:, weight_interval:weight_interval + activation_interval]
+			theta = parameter_matrix[:, weight_interval + activation_interval:weight_interval + 2 * activation_interval]
+			
+			output_vector = _population_product(np.asarray(input_vector), weight_matrix)
+			output_vector = _population_activation(self.__activation_function, output_vector, beta, theta, output_vector)
+			
+			# Add the sensor input
+			return output_vector + np.multiply(self.gain, sensor_input)
+			
+		except ValueError:
+			raise ValueError("Please check dimensions of " + self.__layer_name)
+		
+	# Function to store the parameters in given arrays
+	def share_parameters(self, parameter_vector, gain):
+		"""
+		Use the arrays as the storage of the parameters and the
+		gain of the layer. The weight matrix and the activation
+		parameters become views of parameter_vector
+		
+		Parameters
+		----------
+		parameter_vector: array_like
+			A 1D array of the length of return_parameters(), with
+			the values of the parameters in its layout
+			
+		gain: array_like
+			A 1D array of dimensions (output_dim, ) with the gain
+			
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		None
+		
+		Notes
+		-----
+		The contents of the arrays are not changed, the
+		ArtificialNeuralNetwork uses slices of its own buffer
+		"""
+		self.__parameters = parameter_vector
+		self._gain = gain
+		
+		# Get the interval at which the weight and activation seperate
+		weight_interval = self.weight_dim[0] * self.weight_dim[1]
+		
+		# Get the interval at which activatation parameters seperate
+		activation_interval = self.weight_dim[0]
+		
+		self.__weight_matrix = parameter_vector[:weight_interval].reshape(self.weight_dim)
+		self.__activation_parameters = parameter_vector[weight_interval:weight_interval + 2 * activation_interval]
+		self._share_activation_parameters()
+		
+	def _share_activation_parameters(self):
+		"""
+		Private function to set the views of the parameters
+		as the parameters of the activation function
+		"""
+		activation_interval = self.weight_dim[0]
+		self.__activation_function.beta = self.__activation_parameters[:activation_interval]
+		self.__activation_function.theta = self.__activation_parameters[activation_interval:]
+		
+	# Copies and pickles do not keep views
+	def __setstate__(self, state):
+		""" Restore the state and the views of the parameters """
+		self.__dict__.update(state)
+		
+		# The layers pickled by the previous versions keep the
+		# weight matrix and the activation parameters separately
+		if("_StaticLayer__parameters" not in state):
+			self.__activation_function = copy(self.__activation_function)
+			self.__parameters = np.concatenate([np.ravel(self.__weight_matrix),
+												_activation_vector(self.__activation_function, self.weight_dim[0])])
+			self._gain = np.array(self._gain, dtype=self.__parameters.dtype)
+			
+		self.share_parameters(self.__parameters, self._gain)
+		
+	# A layer of the same dimensions and activation function
+	def replicate(self):
+		"""
+		Return a layer of the same dimensions with its own
+		copy of the activation function, still sharing the
+		parameters until share_parameters is called with a
+		new parameter vector and gain
+		"""
+		layer = copy(self)
+		layer.__activation_function = copy(self.__activation_function)
+		
+		return layer
+		
+	# A Static Layer has no state
+	def reset(self):
+		""" Reset the state of the layer, a Static Layer has none """
+		pass
+	
 	# Function to update the parameters
 	def update_parameters(self, parameter_vector):
 		"""
@@ -193,39 +434,11 @@ class StaticLayer(object):
 			
 		Notes
 		-----
-		The Exception will not always take place for parameter vectors shorter than required
-		The layer will generate output or not also cannot be said so, therefore, a warning is enough
+		The parameters are copied into the parameter buffer of the layer,
+		the extra elements of a longer parameter array are ignored
 		"""
-		# Convert to numpy array
-		parameter_vector = np.array(parameter_vector)
-	
-		# Interval counter maintains the current layer index
-		interval_counter = 0
-		
-		# Get the interval at which the weight and activation seperate
-		weight_interval = self.weight_dim[0] * self.weight_dim[1]
-		
-		# Get the interval at which activatation parameters seperate
-		activation_interval = self.weight_dim[0]
-		
-		# Seperate the weights and activation parameters and then reshape them
-		# Numpy raises a None Type Exception, as it cannot reshape a None object
-		# If such an excpetion occurs, raise a value error as our parameter_vector
-		# is shorter than required
-		try:
-			self.weight_matrix = parameter_vector[interval_counter:interval_counter + weight_interval].reshape(self.weight_dim)
-			interval_counter = interval_counter + weight_interval
-			
-			self.set_activation_parameters(parameter_vector[interval_counter:interval_counter+activation_interval], parameter_vector[interval_counter+activation_interval: interval_counter+2*activation_interval])
-			interval_counter = interval_counter + 2 * activation_interval
-			
-		except:
-			raise ValueError("The parameter_vector of " + self.__layer_name + " consists of elements less than required")
-			
-		# The interval counter should contain the number of elements in parameter_vector
-		# Otherwise the user has specified parameters different than required
-		if(len(parameter_vector) != interval_counter):
-			warnings.warn("The number of parameters entered do not match the parameter vector of " + self.__layer_name)
+		_copy_parameters(self.__parameters, parameter_vector, self.__layer_name)
+		self._share_activation_parameters()
 			
 	# Function to return the parameters
 	def return_parameters(self):
@@ -248,29 +461,14 @@ class StaticLayer(object):
 		
 		Notes
 		-----
-		The numpy flatten function works in row major order.
+		The vector is the parameter buffer of the layer, not a copy.
 		The parameter vector follows the layout as
 		[w_11, w_21, w_12, w_22, w_13, w_23, a_1g, a_2g, a_3g, a_1b, a_2b, a_3b, w_11, w_21, w_31, a_1g, ...]
 		Here, w_ij implies the weight between ith input node and jth output node
 		a_ib is the bias activation parameter of ith output node and a_ig is the gain activation parameter of 
 		ith output node.
 		"""
-		# Initialize the output vector
-		# Determine an individual layer's weight matrix in row major form and activation parameters
-		# Then concatenate it with the previous output vector
-		output = np.array([])
-		
-		# The vector we get from flattening the weight matrix
-		# flatten() works in row major order
-		weight_vector = self.weight_matrix.flatten()
-		
-		# The vector of activation parameters
-		activation_vector = self.get_activation_parameters()
-		
-		# The output vector is concatenated form of weight_vector and activation_vector
-		output = np.concatenate([output, weight_vector, activation_vector])
-		
-		return output
+		return self.__parameters
 	
 	# Setters and Getters	
 	@property
@@ -283,10 +481,10 @@ class StaticLayer(object):
 		
 	@weight_matrix.setter
 	def weight_matrix(self, weight_matrix):
-		if(weight_matrix.shape != self.weight_dim):
+		if(np.shape(weight_matrix) != self.weight_dim):
 			raise ValueError("The dimensions of weight matrix do not match for " + self.__layer_name)
 		
-		self.__weight_matrix = weight_matrix
+		self.__weight_matrix[...] = weight_matrix
 		
 	# Function to return the layer name
 	@property
@@ -299,6 +497,18 @@ class StaticLayer(object):
 	def weight_dim(self):
 		""" The dimensions of the weight matrix """
 		return self.__weight_dim
+		
+	# Function to return the floating point type
+	@property
+	def dtype(self):
+		""" The floating point type of the parameters """
+		return self.__parameters.dtype
+		
+	# Function to return the activation function
+	@property
+	def activation_function(self):
+		""" The activation function of the Layer """
+		return self.__activation_function
 
 	# For changing the gain values
 	@property
@@ -312,27 +522,23 @@ class StaticLayer(object):
 		
 	@gain.setter
 	def gain(self, gain):
-		if(self._gain.shape != self.__weight_dim[0]):
+		if(np.shape(gain) != self._gain.shape):
 			raise ValueError("The dimensions of gain are not correct for " + self.__layer_name)
 		
-		self._gain = gain
+		self._gain[...] = gain
 		
 	# Function to set the activation parameters
 	def set_activation_parameters(self, beta, theta):
 		""" Function to set the parameters of activation function """
-		self.__activation_function.beta = beta
-		self.__activation_function.theta = theta
+		activation_interval = self.weight_dim[0]
+		self.__activation_parameters[:activation_interval] = beta
+		self.__activation_parameters[activation_interval:] = theta
+		self._share_activation_parameters()
 	
 	# Function to return the activation parameters(tuple)	
 	def get_activation_parameters(self):
 		""" Function to get the parameters of activation function """
-		try:
-			return np.concatenate([self.__activation_function.beta, self.__activation_function.theta])
-			
-		except ValueError:
-			beta = np.ones((self.weight_dim[0], )) * self.__activation_function.beta
-			theta = np.ones((self.weight_dim[0], )) * self.__activation_function.theta
-			return np.concatenate([beta, theta])
+		return self.__activation_parameters
 		
 
 # Dynamic Layer ################################################################
@@ -371,7 +577,18 @@ class DynamicLayer(object):
 	layer_name: string
 		The name of the layer
 		This attribute cannot be changed
-	
+		
+	time_interval: float
+		The time interval of an iteration
+		This attribute cannot be changed
+		
+	integrator: string
+		The integrator of the state of the neurons
+		This attribute can be changed
+		
+	state: array_like
+		The state of the neurons
+		
 	Parameters
 	----------
 	input_dim: integer
@@ -383,14 +600,47 @@ class DynamicLayer(object):
 	activation_function: ActivationFunction class
 		SPecifies the activation function to be used
 		
+	time_interval: float
+		The time interval of an iteration
+		
+	time_constant: array_like
+		The initial time constants of the neurons
+		
 	layer_name: string
 		The name of the layer
 		
+	integrator(optional): string
+		"legacy", "euler", "exponential" or "rk4"
+		
+		legacy is the update of the previous versions, the time
+		constants weigh the activation. The others integrate
+		time_constant * dy/dt = -y + W * x + gain * sensor_input
+		over the time interval, with the output f(y). euler is
+		the forward Euler method, exponential is exact for the
+		input of the iteration and rk4 is the Runge Kutta method
+		of fourth order
+		
+	dtype(optional): data-type
+		The floating point type of the parameters and the state,
+		float64 by default. The ArtificialNeuralNetwork passes its own
+		
 	Methods
 	-------
 	forward_propagate(input_vector)
 		Calculates the output based on the input_vector
 		
+	forward_population(input_vector, sensor_input, parameter_matrix)
+		Calculates the output for a population of parameters
+		
+	reset()
+		Reset the state of the neurons to zero
+		
+	synaptic_input(input_vector, sensor_input, parameter_matrix)
+		The weighted input of the neurons
+		
+	activate(state, parameter_matrix)
+		The output of the neurons for a state
+		
 	update_parameters(parameter_vector)
 		Updates the parameters of the layer according to 
 		the parameter_vector argument
@@ -408,7 +658,7 @@ class DynamicLayer(object):
 		
 	"""
 	def __init__(self, input_dim, output_dim, activation_function, 
-				 time_interval, time_constant, layer_name):
+				 time_interval, time_constant, layer_name, integrator="legacy", dtype=np.float64):
 		"""
 		Initialization function of DynamicLayer class		
 		...
@@ -423,7 +673,8 @@ class DynamicLayer(object):
 		
 		Raises
 		------
-		None
+		ValueError
+			If the integrator is not known
 		"""
 		# Name of the layer
 		self.__layer_name = layer_name
@@ -432,16 +683,10 @@ class DynamicLayer(object):
 		self.__weight_dim = (output_dim, input_dim)
 		self.__time_dim = (output_dim, )
 		
-		# Initialize the weight and bias
-		self.__weight_matrix = np.random.rand(*self.weight_dim)
-		
-		# Initialize the gain vector
-		self._gain = np.ones((output_dim, ))
-		
 		# Generate the weights for the weighted average
 		self.__time_interval = time_interval
-		self.__time_constant = time_constant
-		self.__time_weight = np.array(self.time_constant)
+		self.__time_weight = np.array(time_constant, dtype=dtype)
+		self.integrator = integrator
 		
 		# A check for the dimension of time constant list
 		if(self.__time_weight.shape != self.__time_dim):
@@ -453,8 +698,15 @@ class DynamicLayer(object):
 		if(not hasattr(self.__activation_function, 'calculate_activation')):
 			raise TypeError("The activation function needs to has an attribute calculate_activation for " + self.__layer_name)
 		
-		# Set the previous state output, zero for initial
-		self.__previous_output = np.zeros(output_dim)
+		# Initialize the time constants, weight and activation parameters
+		parameter_vector = np.concatenate([self.__time_weight, np.random.rand(*self.weight_dim).flatten(),
+										   _activation_vector(activation_function, output_dim)]).astype(dtype)
+		
+		# Initialize the gain vector
+		self.share_parameters(parameter_vector, np.ones((output_dim, ), dtype=dtype))
+		
+		# Set the state of the neurons, zero for initial
+		self.__state = np.zeros(output_dim, dtype=dtype)
 		
 	# Function to calculate the output of the layer
 	def forward_propagate(self, input_vector, sensor_input):
@@ -485,51 +737,184 @@ class DynamicLayer(object):
 		The input_vector is of dimensions (input_dim, )
 		The output_vector is of dimensions (output_dim, )
 		The weight_matrix is of dimensions (output_dim, input_dim)
+		A batch of inputs of dimensions (B, input_dim) generates
+		a batch of outputs of dimensions (B, output_dim), the layer
+		keeps a separate state for each sample of the batch
 		
 		Each of the columns of the weight_matrix tune for a single input node
 		Each of the rows of the weight_matrix tune for a single output node
 		
-		The mathematics working behind is:
+		The mathematics working behind, for the legacy integrator, is:
 		n_i[k] = n_i[k-1] + time_weight * (g * x_i[k] + sum_j{w * a_j[k-1]})
+		a_i[k] = f(time_weight * (g * x_i[k] + sum_j{w * a_j[k-1]}))
+		
+		For the other integrators, with the time interval dt:
+		tc_i * dn_i/dt = -n_i + g * x_i[k] + sum_j{w * a_j[k-1]}
 		a_i[k] = f(n_i[k])
 		"""
 		try:
-			# Convert to numpy array
-			input_vector = np.array(input_vector)
+			current_activation = self.synaptic_input(input_vector, sensor_input)
 			
-			# Get the current activation
-			current_activation = np.dot(self.weight_matrix, input_vector)
-			current_activation = current_activation + np.multiply(self.gain, sensor_input)
-			current_activation = np.multiply(self.__time_weight, current_activation)
+			# A new batch size starts from a zero state
+			if(self.__state.shape != current_activation.shape):
+				self.__state = np.zeros(current_activation.shape, dtype=self.dtype)
 			
-			# Generate the current output
-			current_output = self.__previous_output + current_activation
+			if(self.__integrator == "legacy"):
+				# The synaptic input is a new array, it is weighted and activated in place
+				np.multiply(self.__time_weight, current_activation, current_activation)
+				
+				# Save the current output, the activation is of the current activation
+				self.__state = self.__state + current_activation
+				return self.activate(current_activation, out=current_activation)
+				
+			self.__state = _integrate(self.__integrator, self.__state, current_activation,
+									  self.__time_constant, self.__time_interval)
+			return self.activate(self.__state)
 			
-			# Save it
-			self.__previous_output = current_output
+		except:
+			raise ValueError("Please check dimensions of " + self.__layer_name)
 			
-			# Calculate activation and return
-			current_output = self.__activation_function.calculate_activation(current_activation)
-			return current_output
+		
+	# Function to calculate the output for a population of parameters
+	def forward_population(self, input_vector, sensor_input, parameter_matrix):
+		"""
+		Generate the output of the Layer for each parameter
+		vector of a population, without loading them
+		
+		Parameters
+		----------
+		input_vector: array_like
+			The input of each individual, of dimensions
+			(P, input_dim) or (P, B, input_dim)
 			
-		except:
+		sensor_input: array_like
+			The values of the sensor that are to be added
+			
+		parameter_matrix: array_like
+			The parameter vector of each individual, of dimensions
+			(P, number_of_parameters), in the layout of update_parameters
+			
+		Returns
+		-------
+		current_output: array_like
+			The output of each individual, of dimensions
+			(P, output_dim) or (P, B, output_dim)
+			
+		Raises
+		------
+		ValueError
+			If the dimensions of the inputs or parameters are not correct
+			
+		Notes
+		-----
+		The weight matrices of dimensions (P, output_dim, input_dim)
+		are views of the parameter_matrix, and the output of all
+		the individuals is a single batched matrix product.
+		The legacy integrator uses the time weights of
+		forward_propagate, the others the time constants of each
+		individual and keep the state of each individual
+		"""
+		try:
+			parameter_matrix = np.asarray(parameter_matrix)
+			current_activation = self.synaptic_input(input_vector, sensor_input, parameter_matrix)
+			
+			if(self.__integrator == "legacy"):
+				current_activation = np.multiply(self.__time_weight, current_activation)
+				return self.activate(current_activation, parameter_matrix)
+				
+			# The state of each individual
+			if(self.__state.shape != current_activation.shape):
+				self.__state = np.zeros(current_activation.shape, dtype=self.dtype)
+				
+			time_constant = self.time_constants(parameter_matrix, current_activation.ndim)
+			self.__state = _integrate(self.__integrator, self.__state, current_activation,
+									  time_constant, self.__time_interval)
+			
+			return self.activate(self.__state, parameter_matrix)
+			
+		except ValueError:
 			raise ValueError("Please check dimensions of " + self.__layer_name)
 			
+	# The views of the parameters of each individual of a population
+	def _population_parameters(self, parameter_matrix):
+		"""
+		Private function to return the time constants, weight
+		matrices, beta and theta of each individual, as views
+		of a parameter matrix of dimensions (P, number_of_parameters)
+		"""
+		population_size = parameter_matrix.shape[0]
+		time_interval = self.time_dim[0]
+		weight_interval = self.weight_dim[0] * self.weight_dim[1]
+		activation_interval = self.weight_dim[0]
 		
-	# Function to update the parameters of the layer
-	def update_parameters(self, parameter_vector):
+		time_constant = parameter_matrix[:, :time_interval]
+		counter = time_interval
+		weight_matrix = parameter_matrix[:, counter:counter + weight_interval].reshape((population_size, ) + self.weight_dim)
+		counter = counter + weight_interval
+		beta = parameter_matrix[:, counter:counter + activation_interval]
+		theta = parameter_matrix[:, counter + activation_interval:counter + 2 * activation_interval]
+		
+		return time_constant, weight_matrix, beta, theta
+		
+	# The weighted input of the neurons
+	def synaptic_input(self, input_vector, sensor_input, parameter_matrix=None):
 		"""
-		Load the parameters of the Dynamic Layer in the form of
-		an array / vector
+		The input of the neurons, W * x + gain * sensor_input, for
+		the parameters of the layer, or of each individual of a
+		population with a parameter_matrix of dimensions
+		(P, number_of_parameters)
+		"""
+		if(parameter_matrix is None):
+			current_input = np.dot(input_vector, self.__weight_matrix.T)
+		else:
+			current_input = _population_product(np.asarray(input_vector), self._population_parameters(parameter_matrix)[1])
+			
+		return current_input + np.multiply(self._gain, sensor_input)
+		
+	# The time constants of the neurons
+	def time_constants(self, parameter_matrix=None, dimensions=2):
+		"""
+		The time constants of the layer, or of each individual of a
+		population, shaped for a state of the given number of
+		dimensions (P, ..., output_dim)
+		"""
+		if(parameter_matrix is None):
+			return self.__time_constant
+			
+		time_constant = self._population_parameters(parameter_matrix)[0]
+		shape = (time_constant.shape[0], ) + (1, ) * (dimensions - 2) + (time_constant.shape[1], )
+		
+		return time_constant.reshape(shape)
+		
+	# The output of the neurons
+	def activate(self, state, parameter_matrix=None, out=None):
+		"""
+		The output of the neurons for a state, with the activation
+		parameters of the layer, or of each individual of a population.
+		It is calculated into the out buffer, if it is given(it may be
+		the state) and the activation function supports it
+		"""
+		if(parameter_matrix is None):
+			return _activate(self.__activation_function, state, out)
+			
+		time_constant, weight_matrix, beta, theta = self._population_parameters(parameter_matrix)
+		return _population_activation(self.__activation_function, state, beta, theta, out)
+		
+	# Function to store the parameters in given arrays
+	def share_parameters(self, parameter_vector, gain):
+		"""
+		Use the arrays as the storage of the parameters and the
+		gain of the layer. The time constants, weight matrix and
+		activation parameters become views of parameter_vector
 		
 		Parameters
 		----------
 		parameter_vector: array_like
-			The parameter vector follows the layout as
-			[tc_1, tc_2, tc_3, w_11, w_21, w_12, w_22, w_13, w_23, a_1g, a_2g, a_3g, a_1b, a_2b, a_3b, w_11, w_21, w_31, b_1, ...]
-			Here, w_ij implies the weight between ith input node and jth output node.
-			a_ib is the bias activation parameter of ith output node and a_ig is the gain activation parameter of ith output node.
-			tc_i is the time constant of ith neuron of the current layer 
+			A 1D array of the length of return_parameters(), with
+			the values of the parameters in its layout
+			
+		gain: array_like
+			A 1D array of dimensions (output_dim, ) with the gain
 			
 		Returns
 		-------
@@ -537,22 +922,15 @@ class DynamicLayer(object):
 		
 		Raises
 		------
-		ValueException
-			The parameter array is shorter than required
-			
-		Warning
-			The parameter array is greater than required
-			
+		None
+		
 		Notes
 		-----
-		The Exception will not always take place for parameter vectors shorter than required
-		The layer will generate output or not also cannot be said so, therefore, a warning is enough
+		The contents of the arrays are not changed, the
+		ArtificialNeuralNetwork uses slices of its own buffer
 		"""
-		# Convert to numpy array
-		parameter_vector = np.array(parameter_vector)
-	
-		# Interval counter maintains the current layer index
-		interval_counter = 0
+		self.__parameters = parameter_vector
+		self._gain = gain
 		
 		# Get the interval at which time constants seperate
 		time_interval = self.time_dim[0]
@@ -563,28 +941,94 @@ class DynamicLayer(object):
 		# Get the interval at which activation function parameters seperate
 		activation_interval = self.weight_dim[0]
 		
-		# Seperate the weights and then reshape them
-		# Numpy raises a None Type Exception, as it cannot reshape a None object
-		# If such an excpetion occurs, raise a value error as our parameter_vector
-		# is shorter than required
-		try:
-			self.__time_constant = parameter_vector[interval_counter:interval_counter + time_interval].reshape(self.__time_dim[0], )
-			interval_counter = interval_counter + time_interval
+		self.__time_constant = parameter_vector[:time_interval]
+		self.__weight_matrix = parameter_vector[time_interval:time_interval + weight_interval].reshape(self.weight_dim)
+		self.__activation_parameters = parameter_vector[time_interval + weight_interval:
+														time_interval + weight_interval + 2 * activation_interval]
+		self._share_activation_parameters()
+		
+	def _share_activation_parameters(self):
+		"""
+		Private function to set the views of the parameters
+		as the parameters of the activation function
+		"""
+		activation_interval = self.weight_dim[0]
+		self.__activation_function.beta = self.__activation_parameters[:activation_interval]
+		self.__activation_function.theta = self.__activation_parameters[activation_interval:]
+		
+	# Copies and pickles do not keep views
+	def __setstate__(self, state):
+		""" Restore the state and the views of the parameters """
+		self.__dict__.update(state)
+		
+		# The layers pickled by the previous versions keep the time
+		# constants, weight matrix and activation parameters separately,
+		# and the state as the previous output of the legacy update
+		if("_DynamicLayer__parameters" not in state):
+			self.__activation_function = copy(self.__activation_function)
+			self.__parameters = np.concatenate([np.ravel(self.__time_constant), np.ravel(self.__weight_matrix),
+												_activation_vector(self.__activation_function, self.weight_dim[0])])
+			self._gain = np.array(self._gain, dtype=self.__parameters.dtype)
+			self.__time_weight = np.array(self.__time_weight, dtype=self.__parameters.dtype)
+			self.__state = np.array(self.__dict__.pop("_DynamicLayer__previous_output"), dtype=self.__parameters.dtype)
+			self.__integrator = "legacy"
 			
-			self.__weight_matrix = parameter_vector[interval_counter:interval_counter + weight_interval].reshape(self.__weight_dim)
-			interval_counter = interval_counter + weight_interval
+		self.share_parameters(self.__parameters, self._gain)
+		
+	# A layer of the same dimensions and activation function
+	def replicate(self):
+		"""
+		Return a layer of the same dimensions with its own
+		copy of the activation function and a zero state, still
+		sharing the parameters until share_parameters is called
+		with a new parameter vector and gain
+		"""
+		layer = copy(self)
+		layer.__activation_function = copy(self.__activation_function)
+		layer.__time_weight = np.array(self.__time_weight)
+		layer.reset()
+		
+		return layer
+		
+	# Reset the state of the layer
+	def reset(self):
+		""" Reset the state of the layer to zero """
+		self.__state = np.zeros(self.weight_dim[0], dtype=self.dtype)
+		
+	# Function to update the parameters of the layer
+	def update_parameters(self, parameter_vector):
+		"""
+		Load the parameters of the Dynamic Layer in the form of
+		an array / vector
+		
+		Parameters
+		----------
+		parameter_vector: array_like
+			The parameter vector follows the layout as
+			[tc_1, tc_2, tc_3, w_11, w_21, w_12, w_22, w_13, w_23, a_1g, a_2g, a_3g, a_1b, a_2b, a_3b, w_11, w_21, w_31, b_1, ...]
+			Here, w_ij implies the weight between ith input node and jth output node.
+			a_ib is the bias activation parameter of ith output node and a_ig is the gain activation parameter of ith output node.
+			tc_i is the time constant of ith neuron of the current layer
 			
-			self.set_activation_parameters(parameter_vector[interval_counter:interval_counter + activation_interval], 
-											parameter_vector[interval_counter + activation_interval: interval_counter + 2 * activation_interval])
-			interval_counter = interval_counter + 2 * activation_interval
+		Returns
+		-------
+		None
+		
+		Raises
+		------
+		ValueException
+			The parameter array is shorter than required
 			
-		except:
-			raise ValueError("The parameter_vector for " + self.__layer_name + " consists of elements less than required")
+		Warning
+			The parameter array is greater than required
 			
-		# The interval counter should contain the number of elements in parameter_vector
-		# Otherwise the user has specified parameters not equal to the ones required
-		if(len(parameter_vector) != interval_counter):
-			warnings.warn("The number of parameters entered do not match the parameter vector of " + self.__layer_name)
+		Notes
+		-----
+		The parameters are copied into the parameter buffer of the layer,
+		the extra elements of a longer parameter array are ignored
+		"""
+		_copy_parameters(self.__parameters, parameter_vector, self.__layer_name)
+		self._share_activation_parameters()
 		
 	# Function to return the parameters of a layer
 	def return_parameters(self):
@@ -607,32 +1051,14 @@ class DynamicLayer(object):
 		
 		Notes
 		-----
-		The numpy flatten function works in row major order.
+		The vector is the parameter buffer of the layer, not a copy.
 		The parameter vector follows the layout as
 		[tc_1, tc_2, tc_3, w_11, w_21, w_12, w_22, w_13, w_23, a_1g, a_2g, a_3g, a_1b, a_2b, a_3b, w_11, w_21, w_31, b_1, ...]
 		Here, w_ij implies the weight between ith input node and jth output node
 		a_ib is the bias activation parameter of ith output node and a_ig is the gain activation parameter of ith output node.
 		tc_i is the time constant of ith neuron of the current layer
 		"""
-		# Initialize the output vector
-		# Determine an individual layer's weight matrix in row major form and then activation function parameters
-		# Then concatenate it with the previous output vector
-		output = np.array([])
-		
-		# The vector we get from flattening time constants
-		time_vector = self.time_constant.flatten()
-	
-		# The vector we get from flattening the weight matrix
-		# flatten() works in row major order
-		weight_vector = self.weight_matrix.flatten()
-		
-		# The vector of activation parameters
-		activation_vector = self.get_activation_parameters()
-		
-		# The output vector is concatenated form of time_vector, weight_vector, bias_vector and activation_vector
-		output = np.concatenate([output, time_vector, weight_vector, activation_vector])
-		
-		return output
+		return self.__parameters
 		
 	# Function to return the weight matrix
 	@property
@@ -645,10 +1071,10 @@ class DynamicLayer(object):
 		
 	# Function to set the weight matrix
 	@weight_matrix.setter
-	def set_weight_matrix(self, weight_matrix):
-		if(weight_matrix.shape != self.weight_dim):
+	def weight_matrix(self, weight_matrix):
+		if(np.shape(weight_matrix) != self.weight_dim):
 			raise ValueError("The dimensions of the weight matrix do not match for " + self.__layer_name)
-		self.__weight_matrix = weight_matrix
+		self.__weight_matrix[...] = weight_matrix
 		
 	# Function to return the layer name
 	@property
@@ -662,12 +1088,65 @@ class DynamicLayer(object):
 		""" The dimensions of weight matrix """
 		return self.__weight_dim
 		
+	# Function to return the floating point type
+	@property
+	def dtype(self):
+		""" The floating point type of the parameters """
+		return self.__parameters.dtype
+		
+	# Function to return the activation function
+	@property
+	def activation_function(self):
+		""" The activation function of the Layer """
+		return self.__activation_function
+		
+	# Function to return the weights of the legacy integrator
+	@property
+	def time_weight(self):
+		""" The weights of the activation of the legacy integrator
+			A copy of the time constants when they were last set
+		"""
+		return self.__time_weight
+		
 	# Function to return the time constant dimension
 	@property
 	def time_dim(self):
 		""" The dimensions of time constant array """
 		return self.__time_dim
 	
+	# Function to return the time interval
+	@property
+	def time_interval(self):
+		""" The time interval of an iteration """
+		return self.__time_interval
+		
+	# The integrator of the state
+	@property
+	def integrator(self):
+		""" The integrator of the state of the neurons
+			"legacy", "euler", "exponential" or "rk4"
+		"""
+		return self.__integrator
+		
+	@integrator.setter
+	def integrator(self, integrator):
+		if(integrator not in INTEGRATORS):
+			raise ValueError("The integrator of " + self.__layer_name + " should be one of " + ", ".join(INTEGRATORS))
+			
+		self.__integrator = integrator
+		
+	# The state of the neurons
+	@property
+	def state(self):
+		""" The state of the neurons
+			Of dimensions (output_dim, ), or (B, output_dim) for a batch
+		"""
+		return self.__state
+		
+	@state.setter
+	def state(self, state):
+		self.__state = np.array(state, dtype=self.dtype)
+		
 	# Function to return the time constant list
 	@property
 	def time_constant(self):
@@ -680,13 +1159,13 @@ class DynamicLayer(object):
 	# Function to set the time constant list
 	@time_constant.setter
 	def time_constant(self, time_constant):
-		self.time_constant = np.array(time_constant)
-		
-		if(self.time_constant.shape != self.time_dim):
+		if(np.shape(time_constant) != self.time_dim):
 			raise ValueError("The dimension of time constant list is not correct for " + self.__layer_name)
 			
+		self.__time_constant[...] = time_constant
+			
 		# Calculate the weights based on the time constants and the time interval!
-		self.__time_weight = self.time_constant
+		self.__time_weight = np.array(self.__time_constant)
 		
 	# For changing the gain values
 	@property
@@ -696,24 +1175,20 @@ class DynamicLayer(object):
 		
 	@gain.setter
 	def gain(self, gain):
-		if(self.gain.shape != self.__bias_dim):
+		if(np.shape(gain) != self._gain.shape):
 			raise ValueError("The dimensions of gain are not correct for " + self.__layer_name)
 		
-		self._gain = gain
+		self._gain[...] = gain
 		
 	# Function to set the activation parameters
 	def set_activation_parameters(self, beta, theta):
 		""" Function to set the parameters of activation function """
-		self.__activation_function.beta = beta
-		self.__activation_function.theta = theta
+		activation_interval = self.weight_dim[0]
+		self.__activation_parameters[:activation_interval] = beta
+		self.__activation_parameters[activation_interval:] = theta
+		self._share_activation_parameters()
 	
 	# Function to return the activation parameters(tuple)	
 	def get_activation_parameters(self):
 		""" Function to get the parameters of activation function """
-		try:
-			return np.concatenate([self.__activation_function.beta, self.__activation_function.theta])
-			
-		except ValueError:
-			beta = np.ones((self.weight_dim[0], )) * self.__activation_function.beta
-			theta = np.ones((self.weight_dim[0], )) * self.__activation_function.theta
-			return np.concatenate([beta, theta])
+		return self.__activation_parameters
@@ -0,0 +1,1070 @@
+"""Docstring for the plan.py module
+
+This module implements the execution plan of an
+Artificial Neural Network. The plan is compiled once,
+after the computational graph is generated, and replaces
+the name based lookups of every iteration with integer
+indices, precomputed gathers and preallocated buffers.
+The plan of a Static Network can be optimized, fusing and
+folding its layers into fewer blocks
+
+"""
+
+import numpy as np
+from copy import copy
+from layers import _integrate, _activate
+from activation_functions import IdentityActivation, LinearActivation, StepActivation, \
+								 SigmoidActivation, TanhActivation, ReluActivation, \
+								 FastSigmoidActivation, FastTanhActivation
+
+# The activation functions that act on each neuron separately
+# and can be evaluated for sibling layers together
+_ELEMENTWISE = (IdentityActivation, LinearActivation, StepActivation,
+				SigmoidActivation, TanhActivation, ReluActivation,
+				FastSigmoidActivation, FastTanhActivation)
+
+# The activation functions that are affine maps
+_AFFINE = (IdentityActivation, LinearActivation)
+
+class ExecutionPlan(object):
+	"""
+	The Execution Plan Class
+	A flat representation of the computational graph of
+	an ArtificialNeuralNetwork
+
+	The outputs of all the layers are kept in a single
+	buffer, each layer owning a contiguous slice of it in
+	the order of execution. The input of each layer is
+	gathered from this buffer(or the state buffer, for
+	Dynamic Networks) with a precomputed index array into
+	a preallocated input buffer. Inputs that lie in consecutive
+	slices of the buffer are passed as views, without a gather
+
+	...
+
+	Parameters
+	----------
+	layer_map: dictionary
+		The layer objects of the network, keyed by name
+
+	order_of_initialization: array_like
+		The list of interface.Layer objects of the network
+
+	order_of_execution: array_like
+		The names of the layers in the order of execution
+
+	input_connections: dictionary
+		The names of the layers that provide input to each
+		layer, keyed by name
+
+	input_layers: array_like
+		The names of the layers that take input only from
+		sensors
+
+	output_layers: array_like
+		The names of the hardware layers
+
+	type_of_network: string
+		"STATIC" or "DYNAMIC"
+
+	integrator(optional): string
+		The integrator of the Dynamic Layers, "legacy", "euler",
+		"exponential" or "rk4"
+
+	time_interval(optional): float
+		The time interval of an iteration
+
+	dtype(optional): data-type
+		The floating point type of the buffers. The sensor inputs
+		and parameters are converted to it
+
+	Attributes
+	----------
+	sensors: list
+		The names of the sensors, in the order the sensor
+		inputs are passed to execute()
+
+	hardware: list
+		The names of the hardware layers, in the order the
+		outputs are returned by execute()
+
+	layer_index: dictionary
+		The integer index of each layer, keyed by name
+
+	outputs: array_like
+		The output of every layer in the previous iteration,
+		concatenated in the order of execution. Of dimensions
+		(B, total) for a batch
+
+	states: array_like
+		The state of a Dynamic Network, the outputs that are
+		the input of the next iteration. The outputs for a
+		Static Network
+
+	potentials: array_like
+		The state of the neurons of the integrated layers, in
+		the layout of the outputs. None for the legacy integrator
+
+	state: array_like
+		The states, followed by the potentials for the
+		integrators other than legacy
+
+	Methods
+	-------
+	execute(sensor_inputs)
+		Calculate the output of the network for one iteration
+
+	rollout(sensor_inputs, state, keep_trajectory)
+		Calculate the output of the network for T iterations
+
+	layer_output(layer_name)
+		The slice of the output buffer owned by a layer
+
+	replicate(layer_map)
+		A plan of the same graph for other layers
+
+	reset()
+		Set the state of the plan to zero
+
+	optimize(buffer)
+		Generate an optimized program for a Static Network
+
+	profile(profiler)
+		Wrap the layers of the program with a profiler
+	"""
+
+	def __init__(self, layer_map, order_of_initialization, order_of_execution,
+				 input_connections, input_layers, output_layers, type_of_network,
+				 integrator="legacy", time_interval=0.01, dtype=np.float64):
+		"""
+		Initialization function of ExecutionPlan class
+		...
+
+		Parameters
+		----------
+		Specified in the class docstring
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		ValueError
+			If the layers providing output to the same hardware
+			layer have different dimensions
+		"""
+		neuron_map = dict((layer[0], layer[1]) for layer in order_of_initialization)
+		sensor_map = dict((layer[0], layer[3]) for layer in order_of_initialization)
+
+		# Integer indices and the slice of each layer
+		self.__layer_index = {}
+		self.__slices = []
+		offset = 0
+		for index, layer in enumerate(order_of_execution):
+			self.__layer_index[layer] = index
+			self.__slices.append(slice(offset, offset + neuron_map[layer]))
+			offset = offset + neuron_map[layer]
+
+		self.__size = offset
+		self.__input_connections = input_connections
+		self.__input_layers = input_layers
+		self.__dynamic = (type_of_network == "DYNAMIC")
+		self.__time_interval = time_interval
+		self.__dtype = np.dtype(dtype)
+
+		# The Dynamic Layers are integrated by the plan, except for legacy
+		if(self.__dynamic):
+			self.__integrator = integrator
+		else:
+			self.__integrator = "legacy"
+
+		# The sensors in the order of initialization
+		self.__sensors = []
+		sensor_index = {}
+		for layer in order_of_initialization:
+			if(layer[3] != "" and layer[3] not in sensor_index):
+				sensor_index[layer[3]] = len(self.__sensors)
+				self.__sensors.append(layer[3])
+		input_set = set(input_layers)
+
+		# The steps of the plan, one for each layer. The input of
+		# each layer is a gather, a view(start, stop) or zeros
+		# Layers that are integrated by the plan are marked
+		self.__steps = []
+		for index, layer in enumerate(order_of_execution):
+			gather = None
+			view = None
+
+			# Input layers get a constant vector of zeros
+			if(layer not in input_set):
+				gather = np.concatenate([np.arange(self.__slices[self.__layer_index[connection]].start,
+												   self.__slices[self.__layer_index[connection]].stop)
+										 for connection in input_connections[layer]]).astype(np.intp)
+
+				# Inputs from consecutive slices are a view, nothing to gather
+				if(np.all(np.diff(gather) == 1)):
+					view = (gather[0], gather[-1] + 1)
+					gather = None
+
+			if(sensor_map[layer] != ""):
+				sensor = sensor_index[sensor_map[layer]]
+			else:
+				sensor = -1
+
+			integrated = (self.__integrator != "legacy" and layer not in input_set)
+			self.__steps.append((layer_map[layer], gather, view, neuron_map[layer], sensor, integrated))
+
+		# The slices of the layers that sum into each hardware layer
+		self.__hardware = list(output_layers)
+		self.__hardware_slices = []
+		for hardware in self.__hardware:
+			slices = [self.__slices[self.__layer_index[connection]]
+					  for connection in input_connections[hardware]]
+
+			for hardware_slice in slices:
+				if(hardware_slice.stop - hardware_slice.start != slices[0].stop - slices[0].start):
+					raise ValueError("The layers providing output to " + hardware + " should have the same dimensions")
+
+			self.__hardware_slices.append(slices)
+
+		# The optimized program is generated by optimize()
+		self.__optimized_steps = None
+		self.__optimized_outputs = None
+
+		# The layers of the program are profiled by profile()
+		self.__profiler = None
+
+		# The buffers of single input vectors
+		self._allocate(())
+
+	# Allocate the buffers for a batch shape
+	def _allocate(self, batch_shape):
+		"""
+		Private function to allocate the output, state, input
+		and hardware buffers for inputs with the leading
+		dimensions batch_shape. The state starts from zero
+		"""
+		self.__batch_shape = batch_shape
+
+		# The output buffer, and the state buffer of the previous
+		# iteration that Dynamic Networks take their input from
+		self.__outputs = np.zeros(batch_shape + (self.__size, ), dtype=self.__dtype)
+		if(self.__dynamic):
+			self.__states = np.zeros(batch_shape + (self.__size, ), dtype=self.__dtype)
+		else:
+			self.__states = self.__outputs
+
+		# The state of the neurons, and the stages of Runge Kutta
+		self.__potentials = None
+		if(self.__integrator != "legacy"):
+			self.__potentials = np.zeros(batch_shape + (self.__size, ), dtype=self.__dtype)
+		if(self.__integrator == "rk4"):
+			self.__initial_potentials = np.zeros(batch_shape + (self.__size, ), dtype=self.__dtype)
+			self.__increments = np.zeros(batch_shape + (self.__size, ), dtype=self.__dtype)
+
+		# The states of the integrated layers are the output of the potentials
+		self.__consistent = (self.__integrator == "legacy")
+
+		self.__hardware_buffers = []
+		for slices in self.__hardware_slices:
+			if(len(slices) > 1):
+				self.__hardware_buffers.append(np.zeros(batch_shape + (slices[0].stop - slices[0].start, ), dtype=self.__dtype))
+			else:
+				self.__hardware_buffers.append(None)
+
+		self._link()
+
+	# Generate the program of the plan
+	def _link(self):
+		"""
+		Private function to generate the program, the steps
+		with their input buffers and views of the state buffer
+		"""
+		self.__program = self._program(self.__steps, self.__slices)
+
+		self.__optimized_program = None
+		if(self.__optimized_steps is not None):
+			self.__optimized_program = self._program(self.__optimized_steps, self.__optimized_outputs)
+
+	def _program(self, steps, output_indices):
+		"""
+		Private function to generate the program of a list of
+		steps, writing to the output indices of each step
+		"""
+		batch_shape = self.__batch_shape
+
+		program = []
+		for (layer, gather, view, neurons, sensor, integrated), output_index in zip(steps, output_indices):
+			if(self.__profiler is not None):
+				layer = self.__profiler.wrap(layer, layer.layer_name)
+
+			if(gather is not None):
+				input_vector = np.zeros(batch_shape + (gather.shape[0], ), dtype=self.__dtype)
+			elif(view is not None):
+				input_vector = self.__states[..., view[0]:view[1]]
+			else:
+				input_vector = np.zeros((neurons, ), dtype=self.__dtype)
+
+			program.append((layer, gather, input_vector, sensor,
+							np.zeros((neurons, ), dtype=self.__dtype), (Ellipsis, output_index), integrated))
+
+		return program
+
+	# A plan of the same graph for other layers
+	def replicate(self, layer_map):
+		"""
+		Return a plan of the same graph that executes the
+		layers of layer_map, keyed by name. The steps, gathers
+		and slices are shared, the buffers are its own
+		"""
+		plan = ExecutionPlan.__new__(ExecutionPlan)
+		plan.__dict__.update(self.__dict__)
+		plan.__steps = [(layer_map[step[0].layer_name], ) + step[1:] for step in self.__steps]
+
+		# The blocks of an optimized program are of the previous layers
+		plan.__optimized_steps = None
+		plan.__profiler = None
+		plan._allocate(())
+
+		return plan
+
+	# Start from a zero state
+	def reset(self):
+		""" Set the state of the plan to zero """
+		self._allocate(self.__batch_shape)
+
+	# Profile the layers of the program
+	def profile(self, profiler):
+		"""
+		Generate the program with the layers wrapped by a
+		profiler, or with the layers themselves for None
+
+		Parameters
+		----------
+		profiler: object
+			A profiler.NetworkProfile, whose iterations are counted
+			by execute and rollout, or None
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		None
+		"""
+		self.__profiler = profiler
+		self._link()
+
+	# Optimize the program of a Static Network
+	def optimize(self, buffer):
+		"""
+		Generate an optimized program, that is executed for the
+		iterations of a single network
+
+		Parameters
+		----------
+		buffer: array_like
+			The parameter buffer of the network. The blocks are
+			generated again from the layers when it changes
+
+		Returns
+		-------
+		None
+
+		Raises
+		------
+		ValueError
+			If the network is a Dynamic Network
+
+		Notes
+		-----
+		The layers that do not reach a hardware layer are dropped.
+		Sibling layers, that take the same input and have the same
+		activation function, are fused into a block with a single
+		weight matrix. A chain of blocks with Linear and Identity
+		activation functions, whose outputs are only the input of
+		the next block, is folded into a single affine map
+
+		The parameters of the layers are not changed, and the
+		outputs of the folded and dropped layers are not calculated.
+		Calling optimize again generates the program for the
+		current layers and buffer
+		"""
+		if(self.__dynamic):
+			raise ValueError("Only the plan of a Static Network can be optimized")
+
+		names = [step[0].layer_name for step in self.__steps]
+		connections = self.__input_connections
+
+		# The layers that reach a hardware layer
+		live = set()
+		pending = [connection for hardware in self.__hardware for connection in connections[hardware]]
+		while(pending):
+			name = pending.pop()
+			if(name not in live):
+				live.add(name)
+				pending.extend(connections.get(name, []))
+
+		# The live layers and hardware layers that take input from each layer
+		consumers = dict((name, set()) for name in names)
+		for name in [name for name in names if name in live] + self.__hardware:
+			for connection in connections.get(name, []):
+				consumers[connection].add(name)
+
+		# Each node is a list of stages, each stage a list of sibling steps
+		nodes = []
+		siblings = {}
+		for index, (layer, gather, view, neurons, sensor, integrated) in enumerate(self.__steps):
+			if(names[index] not in live):
+				continue
+
+			key = None
+			activation_type = type(layer.activation_function)
+			if(self._input_indices(index) is not None and sensor == -1 and activation_type in _ELEMENTWISE):
+				key = (self._input_indices(index).tobytes(), activation_type)
+
+			if(key in siblings):
+				siblings[key].append(index)
+			else:
+				nodes.append([[index]])
+				if(key is not None):
+					siblings[key] = nodes[-1][0]
+
+		# Fold the chains of affine nodes, the later node takes the place
+		folded = True
+		while(folded):
+			folded = False
+			for position, node in enumerate(nodes):
+				for following in nodes[position + 1:]:
+					if(self._foldable(node, following, names, consumers)):
+						following[0:0] = node
+						del nodes[position]
+						folded = True
+						break
+				if(folded):
+					break
+
+		self.__optimized_steps = []
+		self.__optimized_outputs = []
+		self.__blocks = []
+		for node in nodes:
+			head = self.__steps[node[0][0]]
+			neurons = sum(self.__steps[index][3] for index in node[0])
+
+			if(len(node) == 1 and len(node[0]) == 1):
+				self.__optimized_steps.append(head)
+			else:
+				stages = [[self.__steps[index][0] for index in stage] for stage in node]
+				block = _Block(stages, self._input_indices(node[0][0]) is not None, head[4] != -1)
+				self.__blocks.append(block)
+				self.__optimized_steps.append((block, head[1], head[2], neurons, head[4], False))
+
+			self.__optimized_outputs.append(self._output_index(node[-1]))
+
+		self.__buffer = buffer
+		self.__snapshot = np.array(buffer)
+		self._link()
+
+	def _input_indices(self, index):
+		"""
+		Private function to return the indices of the state
+		buffer that a step takes as input, None for input layers
+		"""
+		layer, gather, view, neurons, sensor, integrated = self.__steps[index]
+		if(gather is not None):
+			return gather
+		if(view is not None):
+			return np.arange(view[0], view[1])
+
+		return None
+
+	def _output_index(self, stage):
+		"""
+		Private function to return the indices of the output
+		buffer of a stage, a slice when they are consecutive
+		"""
+		output_index = np.concatenate([np.arange(self.__slices[index].start, self.__slices[index].stop)
+									   for index in stage])
+		if(np.all(np.diff(output_index) == 1)):
+			return slice(output_index[0], output_index[-1] + 1)
+
+		return output_index
+
+	def _foldable(self, node, following, names, consumers):
+		"""
+		Private function to check if a node folds into the
+		following node, both affine, with the outputs of the
+		node being exactly the input of the following node
+		"""
+		for stage in node + following:
+			if(type(self.__steps[stage[0]][0].activation_function) not in _AFFINE):
+				return False
+
+		if(any(self.__steps[index][4] != -1 for index in following[0])):
+			return False
+
+		readers = set(names[index] for index in following[0])
+		if(any(not consumers[names[index]] <= readers for index in node[-1])):
+			return False
+
+		input_indices = self._input_indices(following[0][0])
+		output_indices = np.arange(self.__size)[self._output_index(node[-1])]
+
+		return input_indices is not None and np.array_equal(input_indices, output_indices)
+
+	def _refresh(self):
+		"""
+		Private function to generate the blocks again when
+		the parameter buffer has changed
+		"""
+		if(not np.array_equal(self.__buffer, self.__snapshot)):
+			for block in self.__blocks:
+				block.refresh()
+			np.copyto(self.__snapshot, self.__buffer)
+
+	# Copies and pickles do not keep views
+	def __getstate__(self):
+		"""
+		The state of the plan without the program, whose
+		views of the state buffer would become copies
+		"""
+		state = self.__dict__.copy()
+		del state["_ExecutionPlan__program"]
+		del state["_ExecutionPlan__optimized_program"]
+		return state
+
+	def __setstate__(self, state):
+		"""
+		Restore the state of the plan and generate the
+		program again
+		"""
+		self.__dict__.update(state)
+		self._link()
+
+	# Execute the plan
+	def execute(self, sensor_inputs, parameters=None):
+		"""
+		Calculate the output of the network for one iteration
+
+		Parameters
+		----------
+		sensor_inputs: array_like
+			The input of each sensor, in the order of sensors.
+			None is taken as a vector of zeros
+
+		parameters(optional): array_like
+			The parameters of a population of P networks, a list
+			with the (P, number_of_parameters) matrix of each layer
+			in the order of execution(None for the input layers).
+			The layers are evaluated with forward_population
+
+		Returns
+		-------
+		hardware_outputs: list
+			The output of each hardware layer, in the order of
+			hardware
+
+		Raises
+		------
+		ValueError
+			If the number of sensor inputs is not correct, or
+			the sensor inputs or parameters have different batch
+			shapes
+
+		Notes
+		-----
+		The returned arrays are views of the buffers of the
+		plan, and are overwritten by the next iteration. Copy
+		them to keep them
+
+		The sensor inputs and parameters are converted to the
+		dtype of the plan, so the iteration is not upcast.
+		Sensor inputs of dimensions (B, n) are a batch, the
+		outputs are then of dimensions (B, m). Sensor inputs
+		without the batch dimension are used for every sample.
+		A change of the batch shape starts the state of a
+		Dynamic Network from zero
+
+		With parameters, the population is the first batch
+		dimension and the outputs are of dimensions (P, m),
+		or (P, B, m) for a batch of sensor inputs
+		"""
+		sensor_inputs = self._convert(sensor_inputs)
+		if(parameters is not None):
+			parameters = self._convert(parameters)
+
+		self._prepare(sensor_inputs, parameters)
+
+		if(self.__profiler is not None):
+			self.__profiler.iterations = self.__profiler.iterations + 1
+
+		return self._step(sensor_inputs, parameters)
+
+	def _convert(self, arrays):
+		"""
+		Private function to convert a list of arrays to the
+		dtype of the plan. The list is returned as it is if
+		they already are, without a call to numpy for each array
+		"""
+		dtype = self.__dtype
+		for array in arrays:
+			if(array is not None and (type(array) is not np.ndarray or array.dtype != dtype)):
+				return [None if array is None else np.asarray(array, dtype=dtype) for array in arrays]
+
+		return arrays
+
+	def _prepare(self, sensor_inputs, parameters=None):
+		"""
+		Private function to check the sensor inputs of an
+		iteration and allocate the buffers for their batch shape
+		"""
+		if(len(sensor_inputs) != len(self.__sensors)):
+			raise ValueError("The network takes input from " + str(len(self.__sensors)) + " sensors")
+
+		batch_shape = self._batch_shape(sensor_inputs)
+		if(parameters is not None):
+			batch_shape = self._population_shape(parameters) + batch_shape
+
+		if(batch_shape != self.__batch_shape):
+			self._allocate(batch_shape)
+
+	def _step(self, sensor_inputs, parameters=None):
+		"""
+		Private function to execute the program for one
+		iteration, on buffers allocated by _prepare
+		"""
+		outputs = self.__outputs
+		states = self.__states
+
+		# The optimized program is of a single network
+		program = self.__program
+		if(parameters is None and self.__optimized_program is not None):
+			program = self.__optimized_program
+			self._refresh()
+
+		for index, (layer, gather, input_vector, sensor, zeros, output_index, integrated) in enumerate(program):
+			if(integrated):
+				continue
+
+			if(gather is not None):
+				np.take(states, gather, axis=-1, out=input_vector)
+
+			sensor_input = zeros
+			if(sensor != -1 and sensor_inputs[sensor] is not None):
+				sensor_input = sensor_inputs[sensor]
+
+			if(parameters is None or parameters[index] is None):
+				outputs[output_index] = layer.forward_propagate(input_vector, sensor_input)
+			else:
+				outputs[output_index] = layer.forward_population(input_vector, sensor_input, parameters[index])
+
+		if(not self.__consistent):
+			self._activate(parameters, states)
+			self.__consistent = True
+
+		if(self.__integrator == "rk4"):
+			self._runge_kutta(sensor_inputs, parameters)
+		elif(self.__integrator != "legacy"):
+			potentials = self.__potentials
+			for index, layer, output_index, current_input, time_constant, parameter_matrix in \
+					self._synaptic_inputs(sensor_inputs, parameters):
+				potentials[output_index] = _integrate(self.__integrator, potentials[output_index], current_input,
+													  time_constant, self.__time_interval)
+				outputs[output_index] = layer.activate(potentials[output_index], parameter_matrix)
+
+		# The outputs become the state of the next iteration
+		if(self.__dynamic):
+			np.copyto(states, outputs)
+
+		hardware_outputs = []
+		for slices, buffer in zip(self.__hardware_slices, self.__hardware_buffers):
+			if(buffer is None):
+				hardware_outputs.append(outputs[..., slices[0]])
+			else:
+				np.copyto(buffer, outputs[..., slices[0]])
+				for hardware_slice in slices[1:]:
+					np.add(buffer, outputs[..., hardware_slice], out=buffer)
+				hardware_outputs.append(buffer)
+
+		return hardware_outputs
+
+	def _synaptic_inputs(self, sensor_inputs, parameters):
+		"""
+		Private function to generate the input of each integrated
+		layer, from the outputs in the state buffer, along with
+		its time constants and parameters
+		"""
+		for index, (layer, gather, input_vector, sensor, zeros, output_index, integrated) in enumerate(self.__program):
+			if(not integrated):
+				continue
+
+			if(gather is not None):
+				np.take(self.__states, gather, axis=-1, out=input_vector)
+
+			sensor_input = zeros
+			if(sensor != -1 and sensor_inputs[sensor] is not None):
+				sensor_input = sensor_inputs[sensor]
+
+			parameter_matrix = None
+			if(parameters is not None):
+				parameter_matrix = parameters[index]
+
+			current_input = layer.synaptic_input(input_vector, sensor_input, parameter_matrix)
+			time_constant = layer.time_constants(parameter_matrix, current_input.ndim)
+
+			yield index, layer, output_index, current_input, time_constant, parameter_matrix
+
+	def _runge_kutta(self, sensor_inputs, parameters):
+		"""
+		Private function to integrate the potentials of all the
+		integrated layers together, with the Runge Kutta method
+		of fourth order. The outputs of the other layers and the
+		sensor inputs are held over the time interval
+		"""
+		potentials = self.__potentials
+		initial_potentials = self.__initial_potentials
+		increments = self.__increments
+		time_interval = self.__time_interval
+
+		np.copyto(initial_potentials, potentials)
+		increments.fill(0)
+
+		for stage, (weight, fraction) in enumerate([(1, 0.5), (2, 0.5), (2, 1.0), (1, None)]):
+			# The outputs of the stage are the input of the layers
+			if(stage > 0):
+				self._activate(parameters, self.__states)
+
+			for index, layer, output_index, current_input, time_constant, parameter_matrix in \
+					self._synaptic_inputs(sensor_inputs, parameters):
+				derivative = (current_input - potentials[output_index]) / time_constant
+				increments[output_index] += weight * derivative
+				if(fraction is not None):
+					potentials[output_index] = initial_potentials[output_index] + fraction * time_interval * derivative
+
+		np.multiply(increments, time_interval / 6, out=potentials)
+		np.add(initial_potentials, potentials, out=potentials)
+		self._activate(parameters, self.__outputs)
+
+	def _activate(self, parameters, buffer):
+		"""
+		Private function to write the output of the potentials of
+		the integrated layers into a buffer
+		"""
+		for index, (layer, gather, input_vector, sensor, zeros, output_index, integrated) in enumerate(self.__program):
+			if(integrated):
+				parameter_matrix = None
+				if(parameters is not None):
+					parameter_matrix = parameters[index]
+
+				buffer[output_index] = layer.activate(self.__potentials[output_index], parameter_matrix)
+
+	# Execute the plan for a number of iterations
+	def rollout(self, sensor_inputs, state=None, keep_trajectory=True):
+		"""
+		Calculate the output of the network for T iterations
+
+		Parameters
+		----------
+		sensor_inputs: array_like
+			The input of each sensor for each iteration, arrays
+			of dimensions (T, n) or (T, B, n) in the order of
+			sensors. None is taken as a vector of zeros
+
+		state(optional): array_like
+			The state to start from, in the format of the state
+			attribute, of dimensions (total, ) or (B, total), with
+			twice the total for the integrators other than legacy.
+			By default the state of the previous iteration is kept
+
+		keep_trajectory(optional): boolean
+			Return the outputs of every iteration, or only of the
+			last iteration
+
+		Returns
+		-------
+		hardware_outputs: list
+			The outputs of each hardware layer, in the order of
+			hardware. Of dimensions (T, m) or (T, B, m), or (m, )
+			or (B, m) without the trajectory
+
+		Raises
+		------
+		ValueError
+			If the sensor inputs do not have the same number of
+			iterations, or the state is not of the correct
+			dimensions
+
+		Notes
+		-----
+		The inputs are checked and the buffers are allocated once,
+		the iterations then run the program on the same buffers.
+		The state after the last iteration is the state attribute
+		"""
+		sensor_inputs = self._convert(sensor_inputs)
+
+		iterations = set(sensor_input.shape[0] for sensor_input in sensor_inputs if sensor_input is not None)
+		if(len(iterations) != 1):
+			raise ValueError("The sensor inputs should have the same number of iterations")
+		iterations = iterations.pop()
+
+		first_inputs = [None if sensor_input is None else sensor_input[0] for sensor_input in sensor_inputs]
+		self._prepare(first_inputs)
+
+		if(state is not None):
+			state_size = self.__size
+			if(self.__potentials is not None):
+				state_size = 2 * self.__size
+
+			if(np.shape(state)[-1:] != (state_size, )):
+				raise ValueError("The state should be of " + str(state_size) + " elements")
+
+			# A batch of states for inputs without the batch dimension
+			if(np.shape(state)[:-1] != self.__batch_shape):
+				if(self.__batch_shape != ()):
+					raise ValueError("The state and the sensor inputs should have the same batch dimensions")
+				self._allocate(np.shape(state)[:-1])
+
+			state = np.asarray(state)
+			np.copyto(self.__states, state[..., :self.__size])
+			if(self.__potentials is not None):
+				np.copyto(self.__potentials, state[..., self.__size:])
+
+		if(self.__profiler is not None):
+			self.__profiler.iterations = self.__profiler.iterations + iterations
+
+		trajectories = None
+		for iteration in range(iterations):
+			hardware_outputs = self._step([None if sensor_input is None else sensor_input[iteration]
+										   for sensor_input in sensor_inputs])
+
+			if(keep_trajectory is True):
+				if(trajectories is None):
+					trajectories = [np.empty((iterations, ) + output.shape, dtype=output.dtype)
+									for output in hardware_outputs]
+				for trajectory, output in zip(trajectories, hardware_outputs):
+					trajectory[iteration] = output
+
+		if(keep_trajectory is True):
+			return trajectories
+
+		return [np.array(output) for output in hardware_outputs]
+
+	def _population_shape(self, parameters):
+		"""
+		Private function to return the population size
+		shared by the parameters, as a batch shape
+		"""
+		population_shape = None
+		for parameter_matrix in parameters:
+			if(parameter_matrix is None):
+				continue
+
+			shape = np.shape(parameter_matrix)[:1]
+			if(population_shape is not None and shape != population_shape):
+				raise ValueError("The parameters of each layer should be of the same population")
+			population_shape = shape
+
+		if(population_shape is None):
+			raise ValueError("The network has no parameters to evaluate")
+
+		return population_shape
+
+	def _batch_shape(self, sensor_inputs):
+		"""
+		Private function to return the leading dimensions
+		shared by the sensor inputs, converted by _convert
+		"""
+		batch_shape = ()
+		for sensor_input in sensor_inputs:
+			if(sensor_input is None):
+				continue
+
+			shape = sensor_input.shape
+			if(len(shape) < 2):
+				continue
+
+			if(batch_shape != () and shape[:-1] != batch_shape):
+				raise ValueError("The sensor inputs should have the same batch dimensions")
+			batch_shape = shape[:-1]
+
+		return batch_shape
+
+	# The output of a single layer
+	def layer_output(self, layer_name):
+		"""
+		The slice of the output buffer owned by a layer
+
+		Parameters
+		----------
+		layer_name: string
+			The name of the layer
+
+		Returns
+		-------
+		output: array_like
+			A view of the output of the layer in the previous
+			iteration
+
+		Raises
+		------
+		KeyError
+			If there is no layer of that name
+		"""
+		return self.__outputs[..., self.__slices[self.__layer_index[layer_name]]]
+
+	# Getters and Setters
+	@property
+	def sensors(self):
+		""" The names of the sensors, in order """
+		return self.__sensors
+
+	@property
+	def hardware(self):
+		""" The names of the hardware layers, in order """
+		return self.__hardware
+
+	@property
+	def layer_index(self):
+		""" The integer index of each layer """
+		return self.__layer_index
+
+	@property
+	def dtype(self):
+		""" The floating point type of the buffers """
+		return self.__dtype
+
+	@property
+	def outputs(self):
+		""" The output buffer of the plan """
+		return self.__outputs
+
+	@property
+	def states(self):
+		""" The state buffer of the plan, the input of the next iteration """
+		return self.__states
+
+	@property
+	def optimized(self):
+		""" Whether the plan has an optimized program """
+		return self.__optimized_steps is not None
+
+	@property
+	def potentials(self):
+		""" The state of the neurons of the integrated layers """
+		return self.__potentials
+
+	@property
+	def state(self):
+		""" The state of the plan
+			The states, followed by the potentials for the integrators other than legacy
+		"""
+		if(self.__potentials is None):
+			return np.array(self.__states)
+
+		return np.concatenate([self.__states, self.__potentials], axis=-1)
+
+
+class _Block(object):
+	"""
+	A block of an optimized plan, evaluated in place of the
+	layers of its stages. A single stage of sibling Static
+	Layers is evaluated with one block matrix. A chain of stages
+	with Linear and Identity activation functions is folded into
+	the affine map
+
+	output = M . input + S . sensor + c
+
+	Parameters
+	----------
+	stages: array_like
+		The list of the sibling layers of each stage, in order
+
+	has_input: boolean
+		False if the first stage is an input layer, whose input
+		is zero
+
+	has_sensor: boolean
+		True if the first stage is a layer with sensor input
+	"""
+
+	def __init__(self, stages, has_input, has_sensor):
+		"""
+		Initialization function of the _Block class
+		"""
+		self.__stages = stages
+		self.__has_input = has_input
+		self.__has_sensor = has_sensor
+		self.refresh()
+
+	# Generate the block from the parameters of the layers
+	def refresh(self):
+		""" Generate the block matrices from the current parameters of the layers """
+		if(len(self.__stages) == 1):
+			layers = self.__stages[0]
+			self.__weight_matrix = np.concatenate([layer.weight_matrix for layer in layers])
+			self.__activation_function = copy(layers[0].activation_function)
+			self.__activation_function.beta = np.concatenate([layer.activation_function.beta for layer in layers])
+			self.__activation_function.theta = np.concatenate([layer.activation_function.theta for layer in layers])
+			return
+
+		self.__activation_function = None
+		for number, layers in enumerate(self.__stages):
+			weight_matrix = np.concatenate([layer.weight_matrix for layer in layers])
+			if(number == 0):
+				matrix = weight_matrix
+				offset = np.zeros((weight_matrix.shape[0], ), dtype=weight_matrix.dtype)
+			else:
+				matrix = np.dot(weight_matrix, matrix)
+				offset = np.dot(weight_matrix, offset)
+				if(sensor_matrix is not None):
+					sensor_matrix = np.dot(weight_matrix, sensor_matrix)
+
+			if(type(layers[0].activation_function) is LinearActivation):
+				beta = np.concatenate([layer.activation_function.beta for layer in layers])
+				theta = np.concatenate([layer.activation_function.theta for layer in layers])
+				matrix = beta[:, np.newaxis] * matrix
+				offset = beta * (offset - theta)
+				if(number > 0 and sensor_matrix is not None):
+					sensor_matrix = beta[:, np.newaxis] * sensor_matrix
+
+			# The sensor input is added after the activation
+			if(number == 0):
+				sensor_matrix = np.diag(layers[0].gain) if self.__has_sensor else None
+
+		self.__weight_matrix = matrix if self.__has_input else None
+		self.__offset = offset
+		self.__sensor_matrix = sensor_matrix
+
+	@property
+	def layer_name(self):
+		""" The names of the layers of the block, joined with + """
+		return "+".join(layer.layer_name for layers in self.__stages for layer in layers)
+
+	@property
+	def weight_dim(self):
+		""" The dimensions of the matrices of the block, the inputs and the sensor inputs are the columns """
+		output_dim = sum(layer.weight_dim[0] for layer in self.__stages[-1])
+		input_dim = 0
+		if(self.__weight_matrix is not None):
+			input_dim = input_dim + self.__weight_matrix.shape[1]
+		if(self.__activation_function is None and self.__sensor_matrix is not None):
+			input_dim = input_dim + self.__sensor_matrix.shape[1]
+
+		return (output_dim, input_dim)
+
+	# The output of the block
+	def forward_propagate(self, input_vector, sensor_input):
+		""" The output of the last stage, for the input of the first stage """
+		if(self.__activation_function is not None):
+			output_vector = np.dot(input_vector, self.__weight_matrix.T)
+			return _activate(self.__activation_function, output_vector, output_vector)
+
+		output_vector = self.__offset
+		if(self.__weight_matrix is not None):
+			output_vector = output_vector + np.dot(input_vector, self.__weight_matrix.T)
+		if(self.__sensor_matrix is not None):
+			output_vector = output_vector + np.dot(sensor_input, self.__sensor_matrix.T)
+
+		return output_vector
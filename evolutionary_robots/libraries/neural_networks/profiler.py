@@ -0,0 +1,232 @@
+"""Docstring for the profiler.py module
+
+This module implements the profile of the iterations of an
+Artificial Neural Network. While a network is profiled, the
+layers in the program of its execution plan are replaced by
+profiled layers, that record the time, the estimated floating
+point operations and the bytes allocated by each call. The
+program of a network that is not profiled holds the layers
+themselves, and its iterations are not changed
+
+"""
+
+from timeit import default_timer
+
+class LayerProfile(object):
+	"""
+	The statistics of a single layer, or of a block of
+	layers of an optimized plan
+
+	...
+
+	Attributes
+	----------
+	calls: integer
+		The number of calls of the layer
+
+	seconds: float
+		The total wall time of the calls
+
+	flops: integer
+		The estimated floating point operations of the calls,
+		2 * input_dim * output_dim for the weight matrix and one
+		for each output of an activation, for each sample
+
+	bytes: integer
+		The bytes of the new arrays returned by the calls
+	"""
+
+	def __init__(self):
+		"""
+		Initialization function of the LayerProfile class
+		"""
+		self.calls = 0
+		self.seconds = 0.0
+		self.flops = 0
+		self.bytes = 0
+
+class NetworkProfile(object):
+	"""
+	The profile of the iterations of an Artificial Neural
+	Network, generated by setting its profiling attribute
+
+	...
+
+	Attributes
+	----------
+	layers: dictionary
+		The LayerProfile of each layer, keyed by name. The
+		blocks of an optimized plan are keyed by the names of
+		their layers, joined with "+"
+
+	iterations: integer
+		The number of iterations of the network, the population
+		or batch of an iteration counts once
+
+	seconds: float
+		The total time of the layers
+
+	Methods
+	-------
+	table()
+		The statistics of each layer as a table
+
+	reset()
+		Clear the statistics
+	"""
+
+	def __init__(self):
+		"""
+		Initialization function of the NetworkProfile class
+		"""
+		self.layers = {}
+		self.iterations = 0
+
+	# Clear the statistics
+	def reset(self):
+		""" Clear the statistics of every layer """
+		self.layers = {}
+		self.iterations = 0
+
+	# Wrap a layer of the program
+	def wrap(self, layer, name):
+		"""
+		Return a profiled layer that calls layer and records
+		its statistics under name
+		"""
+		if(name not in self.layers):
+			self.layers[name] = LayerProfile()
+
+		return _ProfiledLayer(layer, self.layers[name])
+
+	@property
+	def seconds(self):
+		""" The total time of the layers """
+		return sum(profile.seconds for profile in self.layers.values())
+
+	# The statistics as a table
+	def table(self):
+		"""
+		The statistics of each layer as a table, in the order
+		of the time spent in the layer. The layers replaced by
+		the blocks of an optimized plan are not called, and are
+		left out
+
+		Parameters
+		----------
+		None
+
+		Returns
+		-------
+		table: string
+			A row for each layer with its calls, total time, share
+			of the time, time per call, FLOPs per iteration and bytes
+			allocated per iteration, and a row of the totals
+		"""
+		iterations = max(self.iterations, 1)
+		total = self.seconds
+
+		lines = ["{: <24} {: >8} {: >11} {: >7} {: >11} {: >14} {: >14}".format(
+				 "Layer", "Calls", "Total ms", "Time %", "us/Call", "FLOPs/Iter", "Bytes/Iter")]
+
+		rows = sorted([(name, profile) for name, profile in self.layers.items() if profile.calls > 0],
+					  key=lambda item: (-item[1].seconds, item[0]))
+		rows.append(("Total", _total(self.layers.values())))
+		for name, profile in rows:
+			lines.append("{: <24} {: >8} {: >11.3f} {: >7.1f} {: >11.2f} {: >14.0f} {: >14.0f}".format(
+						 name, profile.calls, profile.seconds * 1e3,
+						 100.0 * profile.seconds / total if total > 0 else 0.0,
+						 profile.seconds * 1e6 / max(profile.calls, 1),
+						 float(profile.flops) / iterations, float(profile.bytes) / iterations))
+
+		lines.append("Iterations: " + str(self.iterations))
+
+		return "\n".join(lines)
+
+class _ProfiledLayer(object):
+	"""
+	Private class of a layer in the program of a profiled
+	plan. The methods of the iterations are timed, the other
+	attributes are those of the layer
+	"""
+
+	def __init__(self, layer, profile):
+		"""
+		Initialization function of the _ProfiledLayer class
+		"""
+		self.__layer = layer
+		self.__profile = profile
+
+		# The operations of the weight matrix, for each sample
+		input_dim = layer.weight_dim[1] if len(layer.weight_dim) > 1 else 0
+		self.__matrix_flops = 2 * layer.weight_dim[0] * input_dim
+
+	def __getattr__(self, name):
+		""" The attributes of the layer """
+		return getattr(self.__layer, name)
+
+	def _record(self, start, output_vector, matrix_flops, output_flops, call=True):
+		"""
+		Private function to add a call that started at start
+		and returned output_vector, with the operations of each
+		sample and of each output
+		"""
+		seconds = default_timer() - start
+
+		profile = self.__profile
+		profile.seconds = profile.seconds + seconds
+		if(call):
+			profile.calls = profile.calls + 1
+
+		# The number of samples, of the batch and population
+		neurons = output_vector.shape[-1] if output_vector.ndim > 0 else 1
+		samples = output_vector.size // max(neurons, 1)
+		profile.flops = profile.flops + samples * (matrix_flops + output_flops * neurons)
+
+		if(output_vector.flags.owndata):
+			profile.bytes = profile.bytes + output_vector.nbytes
+
+	def forward_propagate(self, input_vector, sensor_input):
+		""" The forward_propagate of the layer, timed """
+		start = default_timer()
+		output_vector = self.__layer.forward_propagate(input_vector, sensor_input)
+		self._record(start, output_vector, self.__matrix_flops, 1)
+
+		return output_vector
+
+	def forward_population(self, input_vector, sensor_input, parameter_matrix):
+		""" The forward_population of the layer, timed """
+		start = default_timer()
+		output_vector = self.__layer.forward_population(input_vector, sensor_input, parameter_matrix)
+		self._record(start, output_vector, self.__matrix_flops, 1)
+
+		return output_vector
+
+	def synaptic_input(self, input_vector, sensor_input, parameter_matrix=None):
+		""" The synaptic_input of the layer, timed """
+		start = default_timer()
+		current_input = self.__layer.synaptic_input(input_vector, sensor_input, parameter_matrix)
+		self._record(start, current_input, self.__matrix_flops, 0)
+
+		return current_input
+
+	def activate(self, state, parameter_matrix=None):
+		""" The activate of the layer, timed, the calls are counted by synaptic_input """
+		start = default_timer()
+		output_vector = self.__layer.activate(state, parameter_matrix)
+		self._record(start, output_vector, 0, 1, call=False)
+
+		return output_vector
+
+def _total(profiles):
+	"""
+	Private function to return the sum of the layer profiles
+	"""
+	total = LayerProfile()
+	for profile in profiles:
+		total.calls = total.calls + profile.calls
+		total.seconds = total.seconds + profile.seconds
+		total.flops = total.flops + profile.flops
+		total.bytes = total.bytes + profile.bytes
+
+	return total
@@ -51,6 +51,56 @@ class TestActivationFunctions(unittest.TestCase):
 		Max = activation_functions.MaximumActivation()
 		np.testing.assert_almost_equal(Max.calculate_activation(self.input_vector), np.array([1, 0, 0]))
 		
+		# The maximum of each vector of a batch
+		batch = np.array([[1, 0, -0.1], [-1, -0.5, -2]])
+		np.testing.assert_almost_equal(Max.calculate_activation(batch), np.array([[1, 0, 0], [0, 1, 0]]))
+		
+	def test_batch(self):
+		Tanh = activation_functions.TanhActivation(np.array([1, 2, 3]), 0)
+		batch = np.array([self.input_vector, -self.input_vector])
+		np.testing.assert_almost_equal(Tanh.calculate_activation(batch)[1], -Tanh.calculate_activation(self.input_vector))
+		
+	def test_out(self):
+		for name in ["LinearActivation", "StepActivation", "SigmoidActivation", "TanhActivation",
+					 "ReluActivation", "MaximumActivation"]:
+			activation = getattr(activation_functions, name)(2, 0.5)
+			expected = activation.calculate_activation(self.input_vector)
+			
+			# The input is not changed, unless it is the out buffer
+			x = np.array(self.input_vector)
+			out = np.zeros(3)
+			self.assertTrue(activation.calculate_activation(x, out=out) is out)
+			np.testing.assert_almost_equal(out, expected)
+			np.testing.assert_almost_equal(x, self.input_vector)
+			
+			activation.calculate_activation(x, out=x)
+			np.testing.assert_almost_equal(x, expected)
+			
+		# The output is of the floating point type of the input
+		Relu = activation_functions.ReluActivation()
+		self.assertEqual(Relu.calculate_activation(np.ones(3, dtype=np.float32)).dtype, np.float32)
+		self.assertEqual(Relu.calculate_activation(np.ones(3, dtype=int)).dtype, np.float64)
+		
+	def test_scalar(self):
+		# A scalar input is not cast to a smaller floating point type
+		Linear = activation_functions.LinearActivation()
+		self.assertEqual(Linear.calculate_activation(1000.123), 1000.123)
+		self.assertEqual(Linear.calculate_activation(np.float32(2.5)).dtype, np.float32)
+		
+		Sigmoid = activation_functions.SigmoidActivation()
+		self.assertEqual(Sigmoid.calculate_activation(1.0).dtype, np.float64)
+		np.testing.assert_almost_equal(Sigmoid.calculate_activation(1.0), 0.73105858)
+		
+	def test_fast(self):
+		x = np.linspace(-10, 10, 10001)
+		Tanh = activation_functions.FastTanhActivation(2, 1)
+		Sigmoid = activation_functions.FastSigmoidActivation(2, 1)
+		
+		error = np.max(np.abs(Tanh.calculate_activation(x) - np.tanh(2 * (x - 1))))
+		self.assertTrue(error < activation_functions.FAST_TANH_ERROR)
+		error = np.max(np.abs(Sigmoid.calculate_activation(x) - 1 / (1 + np.exp(-2 * (x - 1)))))
+		self.assertTrue(error < activation_functions.FAST_SIGMOID_ERROR)
+		
 if __name__ == "__main__":
 	unittest.main()
 
@@ -4,10 +4,15 @@ sys.path.append('./../')
 
 # Tests for ctrnn
 
-from neural_networks.ann import ArtificialNeuralNetwork 
+from neural_networks.ann import ArtificialNeuralNetwork, load_network
 from neural_networks.interface import Layer
-from neural_networks.activation_functions import LinearActivation, IdentityActivation
+from neural_networks.activation_functions import LinearActivation, IdentityActivation, TanhActivation, ActivationFunction
 import unittest
+from copy import deepcopy
+import tempfile
+import shutil
+import os
+import imp
 import numpy as np
 
 # Unit Test Artificial Neural Network class
@@ -55,13 +60,412 @@ class TestANN(unittest.TestCase):
 		hiddenLayer2 = Layer("hiddenLayer2", 1, self.activation_function, "", ["hiddenLayer1", "outputLayer"])		# Hidden Layer 2
 		outputLayer = Layer("outputLayer", 1, self.activation_function, "", ["MOTOR"])					# Output Layer
 
-		with self.assertRaises(Exception) as context:
+		with self.assertRaises(ValueError) as context:
 			nn = ArtificialNeuralNetwork([
 							inputLayer, 		# Layer 0 (Input Layer)
 							hiddenLayer1, 		# Layer 1 (Hidden Layer)
 							hiddenLayer2, 		# Layer 2 (Hidden Layer)
 							outputLayer		# Layer 3 (Output Layer)
 							 ], "STATIC")
+							 
+		# The layers of the cycle are reported
+		self.assertIn("hiddenLayer2 -> hiddenLayer1 -> hiddenLayer2", str(context.exception))
+		
+	def test_order_of_execution(self):
+		# A chain of layers, initialized in the reverse order
+		layers = [Layer("layer0", 1, self.identity, "SENSOR", ["layer1"])]
+		for index in range(1, 4):
+			layers.append(Layer("layer" + str(index), 1, self.activation_function, "", ["layer" + str(index + 1)]))
+		layers.append(Layer("layer4", 1, self.activation_function, "", ["MOTOR"]))
+		nn = ArtificialNeuralNetwork(layers[::-1], "STATIC")
+		
+		self.assertEqual(nn._order_of_execution, ["layer0", "layer1", "layer2", "layer3", "layer4"])
+
+	def test_forward_array(self):
+		# The obstacle avoidance controller, 8 inputs and 2 outputs
+		inputLayer = Layer("inputLayer", 8, self.identity, "INFRARED", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 2, self.activation_function, "", ["MOTORS"])
+		nn = ArtificialNeuralNetwork([inputLayer, outputLayer], "STATIC")
+		
+		self.assertEqual(nn.sensor_names, ["INFRARED"])
+		self.assertEqual(nn.hardware_names, ["MOTORS"])
+		
+		infrared = np.linspace(0, 1, 8)
+		output = nn.forward_propagate({"INFRARED": infrared})
+		motors, = nn.forward_array(infrared)
+		np.testing.assert_almost_equal(motors, output["MOTORS"])
+		np.testing.assert_almost_equal(nn.output_matrix["inputLayer"], infrared)
+		
+		with self.assertRaises(ValueError):
+			nn.forward_array(infrared, infrared)
+			
+	def test_plan(self):
+		# Two layers summing into the same hardware, and a recurrence
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer1", "hiddenLayer2"])
+		hiddenLayer1 = Layer("hiddenLayer1", 1, self.activation_function, "", ["hiddenLayer2", "MOTOR"])
+		hiddenLayer2 = Layer("hiddenLayer2", 1, self.activation_function, "", ["hiddenLayer1", "MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer1, hiddenLayer2], "DYNAMIC")
+		
+		parameter_vector = [[], [1, 1, 1, 1, 1, 0], [1, 1, 1, 1, 1, 0]]
+		nn.load_parameters_from_vector(parameter_vector)
+		
+		input_dict = {"SENSOR": np.array([1.0, 1.0])}
+		
+		# The hidden layers see the state of the previous iteration
+		output = nn.forward_propagate(input_dict)
+		np.testing.assert_almost_equal(output["MOTOR"], np.array([0.0]))
+		output = nn.forward_propagate(input_dict)
+		np.testing.assert_almost_equal(output["MOTOR"], np.array([4.0]))
+		np.testing.assert_almost_equal(nn.output_matrix["hiddenLayer1"], np.array([2.0]))
+
+	def test_batch(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 2, self.activation_function, "", ["hiddenLayer", "outputLayer"])
+		outputLayer = Layer("outputLayer", 1, self.activation_function, "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], "DYNAMIC")
+		
+		parameter_vector = [[], [1, 1, 0.5, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 1, 1, 0, 0], [1, 1, -1, 1, 0]]
+		nn.load_parameters_from_vector(parameter_vector)
+		
+		# A batch gives the same outputs as each of its samples
+		samples = [deepcopy(nn) for sample in range(3)]
+		batch = np.array([[1.0, 0.0], [0.5, 2.0], [-1.0, 1.0]])
+		outputs = [nn.forward_propagate({"SENSOR": batch})["MOTOR"] for step in range(3)]
+		self.assertEqual(outputs[0].shape, (3, 1))
+		
+		for sample in range(3):
+			for step in range(3):
+				output = samples[sample].forward_propagate({"SENSOR": batch[sample]})
+				np.testing.assert_almost_equal(output["MOTOR"], outputs[step][sample])
+				
+		with self.assertRaises(ValueError):
+			nn.forward_array(np.zeros((2, 2)))
+			nn.forward_array(np.zeros((3, 2)), np.zeros((2, 2)))
+
+	def test_population(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 2, LinearActivation(), "", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		
+		for type_of_network in ["STATIC", "DYNAMIC"]:
+			nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], type_of_network)
+			lengths = [len(parameters) for parameters in nn.return_parameters_as_vector().values()]
+			population = [np.zeros((4, 0))] + [np.random.uniform(-1, 1, (4, length)) for length in sorted(lengths, reverse=True)]
+			
+			individuals = [deepcopy(nn) for individual in range(4)]
+			
+			# A batch of 3 inputs for each of the 4 individuals
+			batch = np.array([[1.0, 0.0], [0.5, 2.0], [-1.0, 1.0]])
+			for step in range(2):
+				output = nn.forward_population({"SENSOR": batch}, population)
+				self.assertEqual(output["MOTOR"].shape, (4, 3, 1))
+				
+				# The same as loading each individual
+				for individual in range(4):
+					individuals[individual].load_parameters_from_vector([parameters[individual] for parameters in population])
+					np.testing.assert_almost_equal(individuals[individual].forward_propagate({"SENSOR": batch})["MOTOR"],
+												   output["MOTOR"][individual])
+
+	def test_parameter_buffer(self):
+		# Both layers share an activation function
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 2, self.activation_function, "", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, self.activation_function, "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], "STATIC")
+		
+		parameter_vector = [[], [1, 0, 0, 1, 2, 2, 0, 0], [1, -1, 1, 1]]
+		nn.load_parameters_from_vector(parameter_vector)
+		np.testing.assert_almost_equal(nn.parameters, np.concatenate(parameter_vector[1:]))
+		
+		input_dict = {"SENSOR": np.array([1.0, 2.0])}
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"], np.array([-3.0]))
+		
+		# A single copy into the buffer changes the layers
+		nn.load_parameters(np.array([0, 1, 1, 0, 1, 1, 0, 0, 1, 1, 1, 0]))
+		np.testing.assert_almost_equal(nn.return_parameters_as_vector()["outputLayer"], np.array([1, 1, 1, 0]))
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"], np.array([3.0]))
+		
+		# Copies have their own buffer
+		copied_nn = deepcopy(nn)
+		copied_nn.load_parameters(np.zeros((12, )))
+		np.testing.assert_almost_equal(copied_nn.forward_propagate(input_dict)["MOTOR"], np.array([0.0]))
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"], np.array([3.0]))
+		
+		with self.assertRaises(ValueError):
+			nn.load_parameters(np.zeros((11, )))
+			
+	def test_save_load(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, outputLayer], "DYNAMIC")
+		nn.load_parameters(np.array([0.5, 1, -1, 2, 0.5]))
+		
+		input_dict = {"SENSOR": np.array([1.0, 2.0])}
+		directory = tempfile.mkdtemp()
+		try:
+			# A .npz archive, loaded into an existing network
+			nn.save_parameters_to_file(os.path.join(directory, "network"))
+			loaded_nn = ArtificialNeuralNetwork([inputLayer, outputLayer], "DYNAMIC")
+			loaded_nn.load_weights_from_file(os.path.join(directory, "network"))
+			np.testing.assert_almost_equal(loaded_nn.parameters, nn.parameters)
+			
+			# A raw file, memory mapped by a new network
+			nn.save_parameters_to_file(os.path.join(directory, "network.npy"))
+			loaded_nn = load_network(os.path.join(directory, "network.npy"), mmap_mode="c")
+			for iteration in range(3):
+				np.testing.assert_almost_equal(loaded_nn.forward_propagate(input_dict)["MOTOR"],
+											   nn.forward_propagate(input_dict)["MOTOR"])
+			
+			# A different network
+			smaller_layer = Layer("outputLayer", 2, LinearActivation(), "", ["MOTOR"])
+			with self.assertRaises(ValueError):
+				ArtificialNeuralNetwork([inputLayer, smaller_layer], "DYNAMIC").load_weights_from_file(
+					os.path.join(directory, "network.npz"))
+		finally:
+			shutil.rmtree(directory)
+			
+	def test_load_legacy(self):
+		# Networks pickled by the previous versions
+		identity = IdentityActivation()
+		hidden_activation = TanhActivation()
+		directory = os.path.dirname(os.path.abspath(__file__))
+		vectors = {"STATIC": [[], [0.5, -0.25, 0.75, 1.0, 2, 1, 0.1, -0.1], [1.5, -0.5, 1, 0.2]],
+				   "DYNAMIC": [[], [0.5, 2, 0.5, -0.25, 0.75, 1.0, 2, 1, 0.1, -0.1], [1, 1.5, -0.5, 1, 0.2]]}
+		input_dict = {"SENSOR": np.array([1.0, 2.0])}
+		
+		for type_of_network in ("STATIC", "DYNAMIC"):
+			inputLayer = Layer("inputLayer", 2, identity, "SENSOR", ["hiddenLayer"])
+			hiddenLayer = Layer("hiddenLayer", 2, hidden_activation, "", ["outputLayer"])
+			outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+			nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], type_of_network)
+			nn.load_parameters_from_vector(vectors[type_of_network])
+			
+			file_name = os.path.join(directory, "legacy_" + type_of_network.lower() + ".pkl")
+			with self.assertRaises(ValueError):
+				ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], type_of_network).load_weights_from_file(file_name)
+			
+			loaded_nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], type_of_network)
+			loaded_nn.load_weights_from_file(file_name, allow_pickle=True)
+			np.testing.assert_almost_equal(loaded_nn.parameters, nn.parameters)
+			for iteration in range(3):
+				np.testing.assert_almost_equal(loaded_nn.forward_propagate(input_dict)["MOTOR"],
+											   nn.forward_propagate(input_dict)["MOTOR"])
+			
+	def test_replicate(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, outputLayer], "DYNAMIC")
+		nn.load_parameters(np.array([0.5, 1, -1, 2, 0.5]))
+		
+		input_dict = {"SENSOR": np.array([1.0, 2.0])}
+		nn.forward_propagate(input_dict)
+		
+		# The replica has the parameters and a zero state
+		replica = nn.replicate()
+		reference = deepcopy(nn)
+		reference.reset()
+		for iteration in range(3):
+			np.testing.assert_almost_equal(replica.forward_propagate(input_dict)["MOTOR"],
+										   reference.forward_propagate(input_dict)["MOTOR"])
+		
+		# Its parameters are its own, and are reused in place
+		replica.load_parameters(np.zeros((5, )))
+		replica.reset()
+		np.testing.assert_almost_equal(replica.output_matrix["inputLayer"], np.array([0.0, 0.0]))
+		np.testing.assert_almost_equal(replica.forward_propagate(input_dict)["MOTOR"], np.array([0.0]))
+		np.testing.assert_almost_equal(nn.parameters, np.array([0.5, 1, -1, 2, 0.5]))
+		
+	def test_rollout(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 2, LinearActivation(), "", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], "DYNAMIC")
+		nn.load_parameters(np.random.uniform(-1, 1, (nn.number_of_parameters, )))
+		
+		inputs = np.random.uniform(0, 1, (10, 2))
+		reference = nn.replicate()
+		expected = np.array([reference.forward_propagate({"SENSOR": sensor_input})["MOTOR"]
+							 for sensor_input in inputs])
+		
+		# The trajectory of T iterations
+		replica = nn.replicate()
+		output, state = replica.rollout({"SENSOR": inputs})
+		np.testing.assert_almost_equal(output["MOTOR"], expected)
+		np.testing.assert_almost_equal(state, reference.state)
+		
+		# Continued from a state, keeping only the last output
+		replica = nn.replicate()
+		output, state = replica.rollout(inputs[:5])
+		output, state = nn.replicate().rollout(inputs[5:], state, keep_trajectory=False)
+		np.testing.assert_almost_equal(output["MOTOR"], expected[-1])
+		
+		# A batch of 3
+		output, state = nn.replicate().rollout(np.stack([inputs] * 3, axis=1))
+		self.assertEqual(output["MOTOR"].shape, (10, 3, 1))
+		np.testing.assert_almost_equal(output["MOTOR"][:, 1], expected)
+		
+		with self.assertRaises(ValueError):
+			nn.rollout({"SENSOR": inputs}, np.zeros((4, )))
+			
+	def test_integrators(self):
+		# A neuron of time constant 0.5 with a constant input of 2
+		layer = Layer("layer", 1, LinearActivation(), "SENSOR", ["layer", "MOTOR"])
+		exact = 2 * (1 - np.exp(-1.0 / 0.5))
+		inputs = {"SENSOR": np.ones((10, 1)) * 2}
+		
+		errors = {}
+		for integrator in ["euler", "exponential", "rk4"]:
+			nn = ArtificialNeuralNetwork([layer], "DYNAMIC", 0.1, integrator)
+			nn.load_parameters(np.array([0.5, 0, 1, 0]))
+			output, state = nn.rollout(inputs)
+			errors[integrator] = abs(output["MOTOR"][-1, 0] - exact)
+			
+		self.assertAlmostEqual(errors["exponential"], 0)
+		self.assertTrue(errors["rk4"] < 1e-4 < errors["euler"])
+		
+		# A rollout continues from the state of the neurons
+		nn = ArtificialNeuralNetwork([layer], "DYNAMIC", 0.1, "rk4")
+		nn.load_parameters(np.array([0.5, 0.5, 1, 0.1]))
+		output, state = nn.rollout({"SENSOR": inputs["SENSOR"][:5]})
+		output, state = nn.replicate().rollout({"SENSOR": inputs["SENSOR"][5:]}, state)
+		nn.reset()
+		expected, state = nn.rollout(inputs)
+		np.testing.assert_almost_equal(output["MOTOR"], expected["MOTOR"][5:])
+		
+		with self.assertRaises(ValueError):
+			ArtificialNeuralNetwork([layer], "DYNAMIC", 0.1, "midpoint")
+			
+	def test_optimize(self):
+		# Sibling layers, a chain of Linear layers and a dead layer
+		layers = [Layer("layer0", 1, self.identity, "SENSOR", ["layer1", "layer2", "layer3", "dead"])]
+		layers.append(Layer("layer1", 1, LinearActivation(), "", ["layer4"]))
+		layers.append(Layer("layer2", 1, LinearActivation(), "", ["layer4"]))
+		layers.append(Layer("layer3", 1, LinearActivation(), "", ["layer4"]))
+		layers.append(Layer("dead", 2, LinearActivation(), "", []))
+		layers.append(Layer("layer4", 1, LinearActivation(), "", ["MOTOR"]))
+		nn = ArtificialNeuralNetwork(layers, "STATIC")
+		reference = ArtificialNeuralNetwork(layers, "STATIC")
+		
+		parameters = np.random.uniform(-1, 1, (nn.number_of_parameters, ))
+		nn.load_parameters(parameters)
+		reference.load_parameters(parameters)
+		nn.optimize()
+		
+		input_dict = {"SENSOR": np.array([0.5])}
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"],
+									   reference.forward_propagate(input_dict)["MOTOR"])
+		
+		# The parameters keep the layout of each layer
+		nn.return_parameters_as_vector()["layer4"][:] = 2
+		reference.return_parameters_as_vector()["layer4"][:] = 2
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"],
+									   reference.forward_propagate(input_dict)["MOTOR"])
+		np.testing.assert_almost_equal(nn.replicate().forward_propagate(input_dict)["MOTOR"],
+									   reference.forward_propagate(input_dict)["MOTOR"])
+		
+		with self.assertRaises(ValueError):
+			ArtificialNeuralNetwork(layers, "DYNAMIC").optimize()
+			
+	def test_dtype(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, outputLayer], "DYNAMIC", dtype=np.float32)
+		nn.load_parameters(np.array([0.5, 1, -1, 2, 0.5]))
+		
+		# The inputs are converted, the outputs and state are not upcast
+		output = nn.forward_propagate({"SENSOR": np.array([1.0, 2.0])})
+		self.assertEqual(nn.parameters.dtype, np.float32)
+		self.assertEqual(output["MOTOR"].dtype, np.float32)
+		self.assertEqual(nn.state.dtype, np.float32)
+		
+		output, state = nn.rollout({"SENSOR": np.ones((3, 4, 2))})
+		self.assertEqual(output["MOTOR"].dtype, np.float32)
+		
+		# A file keeps the dtype of the network
+		directory = tempfile.mkdtemp()
+		try:
+			nn.save_parameters_to_file(os.path.join(directory, "network"))
+			self.assertEqual(load_network(os.path.join(directory, "network")).dtype, np.float32)
+		finally:
+			shutil.rmtree(directory)
+			
+		with self.assertRaises(ValueError):
+			ArtificialNeuralNetwork([inputLayer, outputLayer], "STATIC", dtype=np.int32)
+			
+	def test_export_module(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 3, TanhActivation(), "", ["outputLayer"])
+		recurrentLayer = Layer("hiddenLayer", 3, TanhActivation(), "", ["hiddenLayer", "outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "SENSOR2", ["MOTOR"])
+		
+		directory = tempfile.mkdtemp()
+		try:
+			for type_of_network, integrator in [("STATIC", "legacy"), ("DYNAMIC", "legacy"), ("DYNAMIC", "rk4")]:
+				layers = [inputLayer, hiddenLayer if type_of_network == "STATIC" else recurrentLayer, outputLayer]
+				nn = ArtificialNeuralNetwork(layers, type_of_network, 0.1, integrator)
+				nn.load_parameters(np.random.uniform(0.5, 1, (nn.number_of_parameters, )))
+				nn.export_module(os.path.join(directory, "network"))
+				module = imp.load_source("network_" + type_of_network + "_" + integrator,
+										 os.path.join(directory, "network.py"))
+				self.assertEqual(module.SENSORS, nn.sensor_names)
+				
+				# The module keeps the state of a Dynamic Network
+				network = module.Network()
+				for iteration in range(3):
+					sensor_inputs = [np.random.uniform(-1, 1, (2, )), np.random.uniform(-1, 1, (1, ))]
+					np.testing.assert_almost_equal(network.forward(*sensor_inputs)[0],
+												   nn.forward_array(*sensor_inputs)[0])
+		finally:
+			shutil.rmtree(directory)
+			
+		# A custom activation function cannot be exported
+		class SquareActivation(ActivationFunction):
+			def calculate_activation(self, x, out=None):
+				return np.square(x)
+				
+		nn = ArtificialNeuralNetwork([Layer("layer", 1, SquareActivation(), "SENSOR", ["MOTOR"])], "STATIC")
+		with self.assertRaises(ValueError):
+			nn.export_module("network")
+			
+	def test_profiling(self):
+		inputLayer = Layer("inputLayer", 2, self.identity, "SENSOR", ["hiddenLayer"])
+		hiddenLayer = Layer("hiddenLayer", 3, TanhActivation(), "", ["outputLayer"])
+		outputLayer = Layer("outputLayer", 1, LinearActivation(), "", ["MOTOR"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], "STATIC")
+		reference = nn.replicate()
+		self.assertEqual(nn.profile, None)
+		with self.assertRaises(ValueError):
+			nn.visualize("network", profile=True)
+		
+		# The profiled outputs are not changed
+		nn.profiling = True
+		input_dict = {"SENSOR": np.array([0.5, -0.5])}
+		for iteration in range(4):
+			np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"],
+										   reference.forward_propagate(input_dict)["MOTOR"])
+		nn.rollout({"SENSOR": np.random.uniform(0, 1, (5, 3, 2))})
+		
+		# 2 * 3 * 2 + 3 FLOPs for each sample of the hidden layer
+		profile = nn.profile
+		self.assertEqual(profile.iterations, 9)
+		self.assertEqual(profile.layers["hiddenLayer"].calls, 9)
+		self.assertEqual(profile.layers["hiddenLayer"].flops, 15 * 4 + 15 * 5 * 3)
+		self.assertTrue(profile.layers["hiddenLayer"].seconds > 0)
+		self.assertTrue("hiddenLayer" in profile.table())
+		
+		nn.profiling = False
+		self.assertEqual(nn.profile, None)
+		np.testing.assert_almost_equal(nn.forward_propagate(input_dict)["MOTOR"],
+									   reference.forward_propagate(input_dict)["MOTOR"])
+		
+		# The blocks of an optimized network are profiled
+		hiddenLayer = Layer("hiddenLayer", 3, LinearActivation(), "", ["outputLayer"])
+		nn = ArtificialNeuralNetwork([inputLayer, hiddenLayer, outputLayer], "STATIC")
+		nn.optimize()
+		nn.profiling = True
+		nn.forward_propagate(input_dict)
+		self.assertEqual([name for name, layer_profile in nn.profile.layers.items() if layer_profile.calls > 0],
+						 ["inputLayer+hiddenLayer+outputLayer"])
 
 if __name__ == "__main__":
 	unittest.main()
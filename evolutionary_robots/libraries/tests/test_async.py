@@ -0,0 +1,110 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.encoding import BinaryEncoding
+import numpy as np
+import unittest
+
+try:
+	import asyncio
+	from genetic_algorithm.asynchronous import AsyncEvaluator
+except ImportError:
+	asyncio = None
+
+# Coroutine fitness functions for the tests
+# Defined with exec, so that the file compiles on Python 2
+if(asyncio is not None):
+	exec("""
+async def sum_fitness(chromosome):
+	await asyncio.sleep(0.001)
+	return np.sum(chromosome)
+
+async def slow_fitness(chromosome):
+	if(chromosome[0] > 0.5):
+		await asyncio.sleep(10)
+	return np.sum(chromosome)
+
+shapes = set()
+async def shape_fitness(chromosome):
+	shapes.add(chromosome.shape)
+	return np.sum(chromosome)
+
+async def counting_fitness(chromosome, counter):
+	counter["running"] += 1
+	counter["maximum"] = max(counter["maximum"], counter["running"])
+	await asyncio.sleep(0.005)
+	counter["running"] -= 1
+	return 0.0
+""")
+
+@unittest.skipIf(asyncio is None, "asyncio requires Python 3")
+class TestAsync(unittest.TestCase):
+	# The fitness values should be returned in order
+	def test_evaluate(self):
+		population = np.random.uniform(0, 1, (20, 4))
+		fitness_vector = AsyncEvaluator(sum_fitness, concurrency=4).evaluate(population)
+		np.testing.assert_almost_equal(fitness_vector, np.sum(population, axis=1))
+
+	# No more than concurrency evaluations should run at once
+	def test_concurrency(self):
+		counter = {"running": 0, "maximum": 0}
+		evaluator = AsyncEvaluator(lambda chromosome: counting_fitness(chromosome, counter), concurrency=3)
+		evaluator.evaluate(np.zeros((12, 2)))
+		self.assertEqual(counter["maximum"], 3)
+
+	# Timed out evaluations get the timeout fitness or raise
+	def test_timeout(self):
+		population = np.array([[0.1, 0.2], [0.9, 0.1]])
+		evaluator = AsyncEvaluator(slow_fitness, timeout=0.05, timeout_fitness=-1)
+		np.testing.assert_almost_equal(evaluator.evaluate(population), np.array([0.3, -1]))
+
+		evaluator.timeout_fitness = None
+		with self.assertRaises(asyncio.TimeoutError):
+			evaluator.evaluate(population)
+
+	# Cancelling the run should stop it
+	def test_cancel(self):
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=5)
+		ga.fitness_function = slow_fitness
+
+		loop = asyncio.new_event_loop()
+		future = ga.run_async(loop=loop)
+		loop.call_later(0.1, future.cancel)
+		with self.assertRaises(asyncio.CancelledError):
+			loop.run_until_complete(future)
+		loop.close()
+
+	# Simple runs with a coroutine fitness function
+	def test_run(self):
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=3)
+		ga.fitness_function = sum_fitness
+		best_chromosome = ga.run()
+		self.assertAlmostEqual(ga.best_fitness, np.sum(best_chromosome))
+
+		loop = asyncio.new_event_loop()
+		best_chromosome = loop.run_until_complete(ga.run_async(loop=loop))
+		loop.close()
+		self.assertAlmostEqual(ga.best_fitness, np.sum(best_chromosome))
+
+	# The chromosomes are decoded on every backend
+	def test_encoding(self):
+		shapes.clear()
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=3, chromosome_length=20)
+		ga.encoding = BinaryEncoding()
+		ga.fitness_function = shape_fitness
+		best_chromosome = ga.run()
+		self.assertEqual(shapes, set([(20, )]))
+		self.assertAlmostEqual(ga.best_fitness, np.sum(ga.encoding.decode(best_chromosome, 20)))
+
+		# A synchronous fitness function in the executor
+		shapes.clear()
+		ga.fitness_function = lambda chromosome: shapes.add(chromosome.shape) or np.sum(chromosome)
+		loop = asyncio.new_event_loop()
+		best_chromosome = loop.run_until_complete(ga.run_async(loop=loop))
+		loop.close()
+		self.assertEqual(shapes, set([(20, )]))
+		self.assertAlmostEqual(ga.best_fitness, np.sum(ga.encoding.decode(best_chromosome, 20)))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,48 @@
+import sys
+sys.path.append('./../')
+
+from benchmarks.functions import FUNCTIONS
+from benchmarks.suite import benchmark_list, compare, run_benchmark
+from benchmarks.import_time import measure
+import numpy as np
+import unittest
+
+class TestBenchmarks(unittest.TestCase):
+	# The maximum of every function is 0
+	def test_functions(self):
+		optimum = {"sphere": 0.5, "rastrigin": 0.5, "ackley": 0.5,
+				   "rosenbrock": (1 / 2.048 + 1) / 2}
+		for name, function in FUNCTIONS.items():
+			self.assertAlmostEqual(function(np.ones(10) * optimum[name]), 0)
+			self.assertTrue(function(np.random.uniform(0, 1, 10)) < 0)
+
+	# Regressions beyond the tolerance are reported
+	def test_compare(self):
+		baseline = {"sphere-2": {"generations_per_second": 100, "evaluations_per_second": 5000,
+								 "peak_memory_mb": 50, "best_fitness": -1.0}}
+		results = {"sphere-2": {"generations_per_second": 90, "evaluations_per_second": 3000,
+								"peak_memory_mb": 70, "best_fitness": -1.05}}
+		regressions = compare(results, baseline, tolerance=0.2, quality_tolerance=0.1)
+		self.assertEqual(len(regressions), 2)
+		self.assertTrue("evaluations_per_second" in regressions[0])
+		self.assertTrue("peak_memory_mb" in regressions[1])
+
+	# A single benchmark reports all the metrics
+	def test_run(self):
+		benchmark = benchmark_list((2,))[0]
+		result = run_benchmark(benchmark, population_size=10, number_of_generations=3)
+		self.assertEqual(benchmark["name"], "ackley-2")
+		self.assertTrue(result["evaluations_per_second"] > 0)
+		self.assertTrue(result["peak_memory_mb"] > 0)
+
+	# The optional dependencies are not loaded at import
+	def test_import_time(self):
+		milliseconds, lazy_modules = measure("genetic_algorithm.ga_nn", repeat=1)
+		self.assertTrue(milliseconds > 0)
+		self.assertEqual(lazy_modules, [])
+		
+		milliseconds, lazy_modules = measure("neural_networks.ann", repeat=1)
+		self.assertEqual(lazy_modules, [])
+
+if __name__ == "__main__":
+	unittest.main()
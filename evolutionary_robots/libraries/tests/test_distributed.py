@@ -0,0 +1,101 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.distributed import EvaluationCoordinator, start_local_workers
+import numpy as np
+import os
+import time
+import unittest
+
+# Fitness Functions for the workers
+def sum_fitness(chromosome):
+	return np.sum(chromosome)
+
+def crashing_fitness(chromosome):
+	os._exit(1)
+
+def failing_fitness(chromosome):
+	time.sleep(0.1)
+	if(chromosome[0] < 0):
+		raise ValueError("Negative gene")
+	return np.sum(chromosome)
+
+def slow_fitness(chromosome):
+	time.sleep(1)
+	return np.sum(chromosome)
+
+class TestDistributed(unittest.TestCase):
+	def setUp(self):
+		self.coordinator = EvaluationCoordinator(batch_size=3, heartbeat_timeout=5.0)
+		self.coordinator.start()
+		self.processes = []
+
+	def tearDown(self):
+		self.coordinator.stop()
+		for process in self.processes:
+			process.join(5)
+			if(process.is_alive()):
+				process.terminate()
+
+	# The fitness values should be returned in order
+	def test_evaluate(self):
+		self.processes = start_local_workers(self.coordinator.address, sum_fitness, 3)
+		self.assertTrue(self.coordinator.wait_for_workers(3, 10))
+
+		population = np.random.uniform(0, 1, (10, 4))
+		fitness_vector = self.coordinator.evaluate(population)
+		np.testing.assert_almost_equal(fitness_vector, np.sum(population, axis=1))
+
+	# Batches of a dead worker should go to another worker
+	def test_dead_worker(self):
+		self.processes = start_local_workers(self.coordinator.address, crashing_fitness, 1)
+		self.assertTrue(self.coordinator.wait_for_workers(1, 10))
+		self.processes += start_local_workers(self.coordinator.address, sum_fitness, 1)
+		self.assertTrue(self.coordinator.wait_for_workers(2, 10))
+
+		population = np.random.uniform(0, 1, (12, 4))
+		fitness_vector = self.coordinator.evaluate(population)
+		np.testing.assert_almost_equal(fitness_vector, np.sum(population, axis=1))
+
+	# The batches of a failed evaluation do not leak into the next one
+	def test_error(self):
+		self.processes = start_local_workers(self.coordinator.address, failing_fitness, 1)
+		self.assertTrue(self.coordinator.wait_for_workers(1, 10))
+
+		with self.assertRaises(RuntimeError):
+			self.coordinator.evaluate(-np.ones((12, 4)))
+
+		population = np.random.uniform(0, 1, (12, 4))
+		fitness_vector = self.coordinator.evaluate(population)
+		np.testing.assert_almost_equal(fitness_vector, np.sum(population, axis=1))
+
+	# Without workers, or out of time, the evaluation fails
+	def test_timeout(self):
+		coordinator = EvaluationCoordinator(heartbeat_timeout=0.5)
+		coordinator.start()
+		start = time.time()
+		with self.assertRaises(RuntimeError):
+			coordinator.evaluate(np.zeros((4, 2)))
+		self.assertTrue(time.time() - start < 5)
+		coordinator.stop()
+
+		self.processes = start_local_workers(self.coordinator.address, slow_fitness, 1)
+		self.assertTrue(self.coordinator.wait_for_workers(1, 10))
+		self.coordinator.evaluation_timeout = 0.5
+		with self.assertRaises(RuntimeError):
+			self.coordinator.evaluate(np.zeros((12, 2)))
+
+	# Simple Run with the coordinator as backend
+	def test_run(self):
+		self.processes = start_local_workers(self.coordinator.address, sum_fitness, 2)
+		self.assertTrue(self.coordinator.wait_for_workers(2, 10))
+
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=3)
+		ga.fitness_function = sum_fitness
+		ga.evaluation_backend = self.coordinator
+		best_chromosome = ga.run()
+		self.assertAlmostEqual(ga.best_fitness, np.sum(best_chromosome))
+
+if __name__ == "__main__":
+	unittest.main()
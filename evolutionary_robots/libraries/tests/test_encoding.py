@@ -0,0 +1,110 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.encoding import RealEncoding, BinaryEncoding, IntegerEncoding
+from genetic_algorithm.surrogate import KNNSurrogate
+import numpy as np
+import unittest
+
+class TestEncoding(unittest.TestCase):
+	# Fitness Function for test
+	def fitness_function(self, chromosome):
+		return np.sum(chromosome)
+
+	# Packed bits take a bit per gene
+	def test_binary_size(self):
+		encoding = BinaryEncoding()
+		population = encoding.generate(4, 10 ** 6)
+		self.assertEqual(population.dtype, np.uint8)
+		self.assertEqual(population[0].nbytes, 125000)
+
+		population = encoding.generate(50, 13)
+		self.assertTrue(np.all(population[:, -1] & 0x07 == 0))
+		self.assertEqual(encoding.decode(population[0], 13).shape, (13,))
+
+	# Crossover on packed bits is the same as on unpacked bits
+	def test_binary_crossover(self):
+		encoding = BinaryEncoding()
+		mums = encoding.generate(30, 21)
+		dads = encoding.generate(30, 21)
+		cross_position = np.random.randint(1, 21, 30)
+		sons, daughters = encoding.crossover(mums, dads, cross_position)
+
+		unpacked_sons, unpacked_daughters = RealEncoding().crossover(
+			np.unpackbits(mums, axis=1)[:, :21], np.unpackbits(dads, axis=1)[:, :21], cross_position)
+		np.testing.assert_equal(np.unpackbits(sons, axis=1)[:, :21], unpacked_sons)
+		np.testing.assert_equal(np.unpackbits(daughters, axis=1)[:, :21], unpacked_daughters)
+
+	# Mutation flips bits, not the padding
+	def test_binary_mutation(self):
+		encoding = BinaryEncoding()
+		population = np.zeros((100, 13), np.uint8)
+		encoding.mutate(population, 100, 0.1)
+		bits = np.unpackbits(population, axis=1)
+		self.assertTrue(0.07 < np.mean(bits[:, :100]) < 0.13)
+		self.assertEqual(np.sum(bits[:, 100:]), 0)
+
+	# Integers stay within the bounds
+	def test_integer(self):
+		encoding = IntegerEncoding(-3, 3)
+		self.assertEqual(encoding.dtype, np.int8)
+		population = encoding.generate(100, 20)
+		encoding.mutate(population, 20, 0.5)
+		self.assertTrue(population.min() >= -3 and population.max() <= 3)
+		self.assertEqual(len(np.unique(population)), 7)
+
+		with self.assertRaises(ValueError):
+			IntegerEncoding(3, 1)
+
+		# Stored compactly, decoded without wrapping around
+		encoding = IntegerEncoding(0, 255)
+		population = np.full((1, 4), 255, encoding.dtype)
+		genes = encoding.decode(population[0], 4)
+		self.assertEqual(population.dtype, np.uint8)
+		self.assertEqual(genes.dtype, np.int64)
+		self.assertEqual(np.sum(genes * genes), 4 * 255 ** 2)
+		self.assertEqual(np.min(genes - 256), -1)
+
+	# Simple Runs with the encodings
+	def test_run(self):
+		for encoding, maximum in [(BinaryEncoding(), 21), (IntegerEncoding(0, 9), 9 * 21)]:
+			ga = GeneticAlgorithm(population_size=20, number_of_generations=30,
+								  chromosome_length=21, number_of_elites=2)
+			ga.fitness_function = self.fitness_function
+			ga.encoding = encoding
+			best_chromosome = ga.run()
+			self.assertEqual(ga.population.dtype, encoding.dtype)
+			self.assertAlmostEqual(ga.best_fitness, np.sum(encoding.decode(best_chromosome, 21)))
+			self.assertTrue(ga.best_fitness > 0.6 * maximum)
+
+			# Resume from a saved generation
+			ga.number_of_generations = 31
+			ga.run(start=29)
+			self.assertEqual(ga.population.dtype, encoding.dtype)
+
+		with self.assertRaises(TypeError):
+			ga.encoding = object()
+
+	# Backends and surrogates get the decoded chromosomes
+	def test_backend(self):
+		class Backend(object):
+			shapes = set()
+			def evaluate(self, population):
+				self.shapes.add(population.shape[1:])
+				return np.sum(population, axis=1)
+
+		ga = GeneticAlgorithm(population_size=20, number_of_generations=5,
+							  chromosome_length=20, number_of_elites=2)
+		ga.encoding = BinaryEncoding()
+		ga.evaluation_backend = Backend()
+		ga.surrogate = KNNSurrogate(fraction=0.5)
+		best_chromosome = ga.run()
+		self.assertEqual(Backend.shapes, set([(20, )]))
+		self.assertAlmostEqual(ga.best_fitness, np.sum(ga.encoding.decode(best_chromosome, 20)))
+
+		# The surrogate is fitted on the genes
+		self.assertEqual(ga.surrogate.predict(np.ones((1, 20))).shape, (1, ))
+
+if __name__ == "__main__":
+	unittest.main()
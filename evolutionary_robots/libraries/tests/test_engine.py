@@ -0,0 +1,67 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.engine import PopulationEngine
+import numpy as np
+import unittest
+
+class TestEngine(unittest.TestCase):
+	# Fitness Function for test
+	def fitness_function(self, chromosome):
+		return np.sum(chromosome)
+
+	# The buffers are swapped and reused
+	def test_buffers(self):
+		engine = PopulationEngine(10, 6, number_of_elites=2, mutation_probability=0)
+		engine.load(np.random.uniform(0, 1, (10, 6)))
+		first = engine.population
+		fitness_vector = np.sum(first, axis=1)
+		elites = first[np.argsort(fitness_vector)[-2:]].copy()
+
+		second = engine.step(fitness_vector)
+		self.assertFalse(second is first)
+		self.assertEqual(set(map(tuple, second[8:])), set(map(tuple, elites)))
+
+		# Each allele comes from a parent at the same position
+		for row in second:
+			self.assertTrue(all([value in first[:, column] for column, value in enumerate(row)]))
+
+		third = engine.step(np.sum(second, axis=1))
+		self.assertTrue(third is first)
+
+		with self.assertRaises(ValueError):
+			PopulationEngine(10, 6, number_of_elites=1)
+
+	# Without a usable fitness, the parents are not the elites either
+	def test_uniform_selection(self):
+		engine = PopulationEngine(10, 6, number_of_elites=2, mutation_probability=0)
+		fitness_vector = np.zeros(10)
+		fitness_vector[:2] = 5
+		for repetition in range(5):
+			# Each allele tells the row of its parent
+			engine.load(np.repeat(np.arange(10.0)[:, np.newaxis], 6, axis=1))
+			population = engine.step(fitness_vector)
+			self.assertEqual(set(population[8:, 0]), set([0, 1]))
+			self.assertFalse(np.any(population[:8] < 2))
+
+	# Mutation touches the expected fraction of alleles
+	def test_mutation(self):
+		engine = PopulationEngine(200, 50, mutation_probability=0.1)
+		engine.load(np.ones((200, 50)) * 2)
+		population = engine.step(np.ones(200))
+		mutated = np.mean(population != 2)
+		self.assertTrue(0.08 < mutated < 0.12)
+
+	# Simple Run in place
+	def test_run(self):
+		ga = GeneticAlgorithm(population_size=20, number_of_generations=10, number_of_elites=2)
+		ga.fitness_function = self.fitness_function
+		ga.in_place = True
+		best_chromosome = ga.run()
+		self.assertAlmostEqual(ga.best_fitness, np.sum(best_chromosome))
+		self.assertEqual(ga.population.shape, (20, 5))
+		self.assertEqual(ga.load_chromosome('./log/generation9').shape, (20, 5))
+
+if __name__ == "__main__":
+	unittest.main()
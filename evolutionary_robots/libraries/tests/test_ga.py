@@ -3,6 +3,7 @@ sys.path.append('./../')
 
 from genetic_algorithm.ga import GeneticAlgorithm
 import numpy as np
+import time
 import unittest
 
 class TestGA(unittest.TestCase):
@@ -23,6 +24,19 @@ class TestGA(unittest.TestCase):
 		ga.fitness_function = self.fitness_function
 		ga.run()
 		ga.plot_fitness('plot')
-		
+
+	# The run should stop within the budget
+	def test_budget(self):
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=10)
+		ga.fitness_function = self.fitness_function
+		best_chromosome = ga.run(max_evaluations=35)
+		self.assertEqual(ga.number_of_evaluations, 30)
+		self.assertAlmostEqual(ga.best_fitness, np.sum(best_chromosome))
+		self.assertEqual(ga.load_chromosome('./log/generation3').shape, (10, 5))
+		self.assertTrue(ga.time_to_completion >= 0)
+
+		ga.run(deadline=time.time() - 1)
+		self.assertEqual(ga.number_of_evaluations, 0)
+
 if __name__ == "__main__":
 	unittest.main()
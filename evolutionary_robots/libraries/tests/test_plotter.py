@@ -0,0 +1,91 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.plotter import FitnessPlotter
+import numpy as np
+import time
+import unittest
+
+class TestPlotter(unittest.TestCase):
+	# Fitness Function for test
+	def fitness_function(self, chromosome):
+		return np.sum(chromosome)
+
+	# Rendering gives an in memory image
+	def test_render(self):
+		plotter = FitnessPlotter(size=(400, 300))
+		self.assertEqual(plotter.image, None)
+		plotter.update(1, 3, 2, 1)
+		plotter.update(2, 4, 2.5, 1)
+		image = plotter.render()
+		self.assertEqual(image.shape, (300, 400, 3))
+		self.assertEqual(image.dtype, np.uint8)
+		self.assertEqual(plotter.frame_number, 1)
+
+	# Points within the axes are drawn without a complete draw
+	def test_incremental(self):
+		plotter = FitnessPlotter()
+		plotter.update(1, 1, 0.5, 0)
+		plotter.update(2, 2, 1, 0)
+		plotter.render()
+		self.assertEqual(plotter.full_draws, 1)
+
+		plotter.update(3, 2.2, 1.1, 0.1)
+		image = plotter.render()
+		self.assertEqual(plotter.full_draws, 1)
+		self.assertEqual(plotter.frame_number, 2)
+
+		# Rescaling draws the complete figure
+		plotter.update(100, 50, 20, 0)
+		self.assertFalse(np.array_equal(plotter.render(), image))
+		self.assertEqual(plotter.full_draws, 2)
+
+	# The thread is throttled to the maximum frame rate
+	def test_thread(self):
+		plotter = FitnessPlotter(max_fps=5)
+		plotter.start()
+		start = time.time()
+		for generation in range(20):
+			plotter.update(generation, generation, 0, -generation)
+			time.sleep(0.01)
+		plotter.stop()
+
+		frames = plotter.frame_number
+		self.assertTrue(frames >= 1)
+		self.assertTrue(frames <= (time.time() - start) * 5 + 2)
+		self.assertEqual(plotter.image.shape, (391, 400, 3))
+
+	# Updates during the throttle delay do not stop the thread
+	def test_throttled_updates(self):
+		plotter = FitnessPlotter(max_fps=10)
+		plotter.start()
+		for generation in range(1, 6):
+			# The later updates arrive while the thread sleeps
+			for update in range(3):
+				plotter.update(3 * generation + update, generation, 0, -generation)
+				time.sleep(0.02)
+			time.sleep(0.3)
+			self.assertTrue(plotter.frame_number >= generation + 1)
+
+		# Stopping with nothing pending keeps the last image
+		frames = plotter.frame_number
+		plotter.stop()
+		self.assertEqual(plotter.frame_number, frames)
+		self.assertEqual(plotter.image.shape, (391, 400, 3))
+
+	# The Genetic Algorithm hands over the statistics
+	def test_run(self):
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=5)
+		ga.fitness_function = self.fitness_function
+		ga.plotter = FitnessPlotter()
+		ga.plotter.start()
+		ga.run()
+		ga.plotter.stop()
+		self.assertTrue(ga.plotter.frame_number >= 1)
+
+		with self.assertRaises(TypeError):
+			ga.plotter = object()
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,62 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.racing import RacingEvaluator
+import numpy as np
+import unittest
+
+class TestRacing(unittest.TestCase):
+	# Fitness Functions for test
+	def fitness_function(self, chromosome):
+		return np.sum(chromosome)
+
+	def noisy_fitness_function(self, chromosome):
+		return np.sum(chromosome) + np.random.normal(0, 0.5)
+
+	# Without noise, nothing should be re-evaluated
+	def test_exact(self):
+		racing = RacingEvaluator(self.fitness_function, number_of_elites=2,
+								 initial_evaluations=2, maximum_evaluations=10)
+		population = np.random.uniform(0, 1, (20, 5))
+		np.testing.assert_almost_equal(racing.evaluate(population), np.sum(population, axis=1))
+		self.assertEqual(racing.last_evaluations, 40)
+		self.assertEqual(racing.evaluations_saved, 160)
+
+	# With noise, only the individuals near the boundary are raced
+	def test_noisy(self):
+		np.random.seed(0)
+		racing = RacingEvaluator(self.noisy_fitness_function, number_of_elites=2,
+								 initial_evaluations=3, maximum_evaluations=30)
+		population = np.zeros((20, 5))
+		population[:2] = 0.7
+		population[2:5] = 0.5
+		racing.evaluate(population)
+
+		self.assertTrue(np.all(racing.evaluations >= 3))
+		self.assertTrue(np.all(racing.evaluations <= 30))
+		self.assertTrue(racing.evaluations[:5].mean() > racing.evaluations[5:].mean())
+		self.assertTrue(racing.evaluations_saved > 0)
+		self.assertEqual(racing.evaluations_used + racing.evaluations_saved, 20 * 30)
+		self.assertEqual(set(np.argsort(racing.mean)[-2:]), set([0, 1]))
+
+	# Simple Run with racing as backend
+	def test_run(self):
+		ga = GeneticAlgorithm(population_size=10, number_of_generations=3, number_of_elites=2)
+		ga.fitness_function = self.noisy_fitness_function
+		ga.evaluation_backend = RacingEvaluator(self.noisy_fitness_function, number_of_elites=2)
+		ga.run()
+		self.assertEqual(ga.number_of_evaluations, ga.evaluation_backend.evaluations_used)
+
+	# The evaluations of a race stay within the budget of the run
+	def test_budget(self):
+		for max_evaluations in [15, 30, 35, 100]:
+			ga = GeneticAlgorithm(population_size=10, number_of_generations=20, number_of_elites=2)
+			ga.fitness_function = self.noisy_fitness_function
+			ga.evaluation_backend = RacingEvaluator(self.noisy_fitness_function, number_of_elites=2)
+			ga.run(max_evaluations=max_evaluations)
+			self.assertTrue(10 <= ga.number_of_evaluations <= max_evaluations)
+			self.assertEqual(ga.number_of_evaluations, ga.evaluation_backend.evaluations_used)
+
+if __name__ == "__main__":
+	unittest.main()
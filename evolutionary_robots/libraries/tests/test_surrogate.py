@@ -0,0 +1,89 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.ga import GeneticAlgorithm
+from genetic_algorithm.surrogate import KNNSurrogate
+import numpy as np
+import unittest
+
+class TestSurrogate(unittest.TestCase):
+	# Fitness Function for test
+	def fitness_function(self, chromosome):
+		return -np.sum((chromosome - 0.5) ** 2)
+
+	# The predictions of a smooth function should rank well
+	def test_predict(self):
+		np.random.seed(0)
+		surrogate = KNNSurrogate(number_of_neighbours=3)
+		samples = np.random.uniform(0, 1, (200, 2))
+		surrogate.add_samples(samples, [self.fitness_function(sample) for sample in samples])
+		self.assertEqual(surrogate.number_of_samples, 200)
+
+		# Exact matches are predicted exactly
+		np.testing.assert_almost_equal(surrogate.predict(samples[:5]),
+									   [self.fitness_function(sample) for sample in samples[:5]])
+
+		population = np.random.uniform(0, 1, (50, 2))
+		true_fitness = [self.fitness_function(individual) for individual in population]
+		correlation = surrogate.record_correlation(1, surrogate.predict(population), true_fitness)
+		self.assertTrue(correlation > 0.8)
+
+	# Screening keeps the fraction and the protected indices
+	def test_screen(self):
+		surrogate = KNNSurrogate(fraction=0.3)
+		indices = surrogate.screen(np.arange(10), protected=[0, 1])
+		np.testing.assert_equal(indices, [0, 1, 7, 8, 9])
+		self.assertEqual(surrogate.evaluations_saved, 5)
+
+		with self.assertRaises(ValueError):
+			KNNSurrogate().predict(np.zeros((1, 2)))
+
+	# Retraining only happens at the interval
+	def test_retrain(self):
+		surrogate = KNNSurrogate(retrain_interval=2, maximum_samples=15)
+		for update in range(3):
+			surrogate.add_samples(np.random.uniform(0, 1, (10, 2)), np.zeros(10))
+		self.assertEqual(surrogate.number_of_samples, 15)
+
+	# Simple Run with a surrogate
+	def test_run(self):
+		ga = GeneticAlgorithm(population_size=20, number_of_generations=5, number_of_elites=2)
+		ga.fitness_function = self.fitness_function
+		ga.surrogate = KNNSurrogate(fraction=0.5)
+		ga.run()
+
+		# The first generation is evaluated completely
+		self.assertEqual(ga.number_of_evaluations, 20 + 4 * 10)
+		self.assertEqual(len(ga.surrogate.rank_correlations), 4)
+		report = np.loadtxt('./log/surrogate.txt')
+		self.assertEqual(report.shape, (4, 4))
+
+		with self.assertRaises(TypeError):
+			ga.surrogate = object()
+
+	# The statistics and the elites are of the evaluated chromosomes
+	def test_statistics(self):
+		class OptimisticSurrogate(KNNSurrogate):
+			def predict(self, chromosomes):
+				return np.full(len(chromosomes), 100.0)
+
+		for in_place in [False, True]:
+			ga = GeneticAlgorithm(population_size=20, number_of_generations=5, number_of_elites=2)
+			ga.fitness_function = self.fitness_function
+			ga.surrogate = OptimisticSurrogate(fraction=0.5)
+			ga.in_place = in_place
+			ga.run()
+
+			self.assertTrue(np.all(np.array(ga.max_fitness) <= 0))
+			self.assertTrue(np.all(np.array(ga.avg_fitness) <= 0))
+			for best_chromosome, max_fitness in zip(ga.best_chromosomes, ga.max_fitness):
+				self.assertAlmostEqual(self.fitness_function(best_chromosome), max_fitness)
+
+			# The best of a generation is kept as an elite
+			elites = ga.population[-2:]
+			if(not in_place):
+				elites = ga.elites
+			self.assertAlmostEqual(max(self.fitness_function(elite) for elite in elites), ga.max_fitness[-1])
+
+if __name__ == "__main__":
+	unittest.main()
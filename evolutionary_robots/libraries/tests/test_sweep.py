@@ -0,0 +1,60 @@
+import sys
+sys.path.append('./../')
+
+from genetic_algorithm.sweep import Sweep
+import numpy as np
+import shutil
+import unittest
+
+# Fitness Function for test
+def fitness_function(chromosome):
+	return np.sum(chromosome)
+
+class TestSweep(unittest.TestCase):
+	def tearDown(self):
+		shutil.rmtree('./sweep', ignore_errors=True)
+
+	# Grid and random configurations
+	def test_configurations(self):
+		sweep = Sweep(fitness_function)
+		grid = sweep.grid({"population_size": [10, 20], "mutation_probability": [0.01, 0.1, 0.2]})
+		self.assertEqual(len(grid), 6)
+		self.assertTrue({"population_size": 20, "mutation_probability": 0.1} in grid)
+
+		samples = sweep.random({"population_size": (10, 20), "mutation_probability": (0.0, 0.5),
+								"number_of_elites": [0, 2]}, number_of_samples=5)
+		self.assertEqual(len(samples), 5)
+		for sample in samples:
+			self.assertTrue(10 <= sample["population_size"] <= 20)
+			self.assertTrue(isinstance(sample["population_size"], int))
+			self.assertTrue(0 <= sample["mutation_probability"] <= 0.5)
+
+	# Every trial is run in its own folder
+	def test_run(self):
+		sweep = Sweep(fitness_function, number_of_generations=4, seeds=[0, 1], processes=2)
+		results = sweep.run(sweep.grid({"population_size": [10, 20]}))
+		self.assertEqual(len(results), 4)
+		for row in results:
+			self.assertEqual(row["generations"], 4)
+			self.assertEqual(len(row["max_fitness"]), 4)
+			self.assertTrue(row["anytime_fitness"] <= row["best_fitness"])
+		self.assertEqual(results[3]["evaluations"], 4 * 20)
+
+		sweep.save_results('./sweep/results')
+		self.assertEqual(len(open('./sweep/results.txt').readlines()), 5)
+		self.assertTrue(sweep.best_configuration() in [{"population_size": 10}, {"population_size": 20}])
+
+	# The poor configurations are stopped early
+	def test_successive_halving(self):
+		sweep = Sweep(fitness_function, number_of_generations=9, seeds=[0], processes=3)
+		configurations = sweep.grid({"population_size": [10, 20, 30],
+									 "mutation_probability": [0.01, 0.1, 0.5]})
+		results = sweep.successive_halving(configurations, minimum_generations=1, eta=3)
+
+		generations = sorted([row["generations"] for row in results])
+		self.assertEqual(generations, [1] * 6 + [3] * 2 + [9])
+		for row in results:
+			self.assertEqual(len(row["max_fitness"]), row["generations"])
+
+if __name__ == "__main__":
+	unittest.main()
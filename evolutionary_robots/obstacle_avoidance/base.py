@@ -8,7 +8,6 @@ import glob
 from datetime import datetime
 
 import math
-import cv2
 import numpy as np
 
 import MyAlgorithm as algorithm
@@ -40,6 +39,9 @@ class MyAlgorithm(threading.Thread):
         self.get_latest_file()
         self.define_neural_network = algorithm.define_neural_network
         
+        # The FitnessPlotter of the GUI, if any
+        self.plotter = None
+        
         self.WHEEL_RADIUS = self.motors[0].WHEEL_RADIUS
         self.WHEEL_DISTANCE = self.motors[0].WHEEL_DISTANCE
         
@@ -76,6 +78,7 @@ class MyAlgorithm(threading.Thread):
     	ga.mutation_probability = algorithm.MUTATION_PROBABILITY
     	ga.evaluation_steps = algorithm.EVALUATION_STEPS
     	ga.fitness_function = self.fitness_function
+    	ga.plotter = self.plotter
     	
     	genetic_algorithm = GA(ga, self.log_folder)
     	
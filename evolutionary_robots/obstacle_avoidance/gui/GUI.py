@@ -1,7 +1,8 @@
-from PyQt5.QtCore import pyqtSignal, Qt, QCoreApplication
+from PyQt5.QtCore import pyqtSignal, Qt, QCoreApplication, QRect
 from PyQt5.QtWidgets import QMainWindow
 from gui.form import Ui_TrainWindow, Ui_TestWindow
 from gui.widgets.logoWidget import LogoWidget
+from gui.widgets.plotWidget import PlotWidget
 
 # Test Window
 class TestWindow(QMainWindow, Ui_TestWindow):
@@ -63,6 +64,17 @@ class TrainWindow(QMainWindow, Ui_TrainWindow):
         self.logoLayout.addWidget(self.logo)
         self.logo.setVisible(True)
         self.display_stats = False
+        
+        # The fitness plot is rendered in memory, beside the statistics
+        # The plotter imports matplotlib, only when the window is made
+        from genetic_algorithm.plotter import FitnessPlotter
+        self.plotter = FitnessPlotter()
+        self.plotter.start()
+        self.plot = PlotWidget(self)
+        self.plot.set_plotter(self.plotter)
+        self.plot.setParent(self.centralwidget)
+        self.plot.setGeometry(QRect(470, 20, 400, 391))
+        self.resize(880, 592)
 
         # Attach event handler to trainButton and generationButton
         self.trainButton.clicked.connect(self.trainClicked)
@@ -75,6 +87,7 @@ class TrainWindow(QMainWindow, Ui_TrainWindow):
     def updateGUI(self):
     	if(self.display_stats == True and self.algorithm.start_state == False):
         	self.update_stats()
+        	self.update_plot()
         
     # Event handler function of trainButton
     def trainClicked(self):
@@ -119,10 +132,14 @@ class TrainWindow(QMainWindow, Ui_TrainWindow):
         self.input_generation.setMaximum(self.algorithm.latest_generation)
         self.out_of_generation.setText(_translate("MainWindow", " / " + str(self.algorithm.latest_generation)))
         self.last_generation.setText(_translate("MainWindow", str(self.algorithm.latest_generation)))
+        
+        # The Genetic Algorithm hands the statistics to the plotter
+        self.algorithm.plotter = self.plotter
 
     def getAlgorithm(self):
         return self.algorithm
 
     def closeEvent(self, event):
         self.algorithm.kill()
+        self.plotter.stop()
         event.accept()
@@ -182,5 +182,3 @@ class Ui_TestWindow(object):
         self.bestButton.setText(_translate("MainWindow", "Test Best Chromosome"))
         self.out_of_generation_2.setText(_translate("MainWindow", "/ 0"))
         self.label_2.setText(_translate("MainWindow", "Select the generation to play "))
-
-import resources_rc
@@ -16,7 +16,6 @@
 #  Authors :
 #       Alberto Martin Florido <almartinflorido@gmail.com>
 #
-import resources_rc
 from PyQt5 import QtGui
 from PyQt5.QtCore import pyqtSignal, QPointF, Qt, QPoint
 from PyQt5.QtWidgets import QWidget, QGridLayout
@@ -26,6 +25,10 @@ class LogoWidget(QWidget):
     def __init__(self,winParent):    
         super(LogoWidget, self).__init__()
         self.winParent=winParent
+        
+        # The logo is the only compiled resource, it is registered
+        # when the first logo is shown
+        import resources_rc
         self.qimage=QtGui.QImage()
         self.qimage.load(':images/jderobot.png')
 
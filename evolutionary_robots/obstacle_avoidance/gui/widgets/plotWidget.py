@@ -1,27 +1,49 @@
-import resources_rc
 from PyQt5 import QtGui
 from PyQt5.QtCore import pyqtSignal, QPointF, Qt, QPoint
 from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel
-import cv2
 
 class PlotWidget(QWidget):
     def __init__(self,winParent):    
         super(PlotWidget, self).__init__()
         self.winParent=winParent
+        self.plotter = None
+        self.frame_number = -1
+        self.plotWidget = QLabel(self)
+        self.plotWidget.setFixedSize(400, 391)
+        
+    # The plotter(a FitnessPlotter) renders in memory,
+    # without it the plot is read from the log
+    def set_plotter(self, plotter):
+        self.plotter = plotter
+        
+    def update_image(self):
+        self.show_plot()
         
     def show_plot(self):
-        self.plot = cv2.imread("./log/fitness_plot.png", cv2.IMREAD_COLOR)
+        if(self.plotter is not None):
+            # Nothing to do if no new frame is rendered
+            if(self.plotter.frame_number == self.frame_number):
+                return
+            self.frame_number = self.plotter.frame_number
+            self.plot = self.plotter.image
+        else:
+            # cv2 is only needed to read the plot from the log
+            import cv2
+            self.plot = cv2.imread("./log/fitness_plot.png", cv2.IMREAD_COLOR)
+            if(self.plot is not None):
+                self.plot = cv2.cvtColor(self.plot, cv2.COLOR_BGR2RGB)
+            
         if(self.plot is not None):
-            self.plot = cv2.resize(self.plot, (400, 391))
-            self.plot = cv2.cvtColor(self.plot, cv2.COLOR_BGR2RGB)
-            image = QtGui.QImage(self.plot.data, self.plot.shape[1], self.plot.shape[0], QtGui.QImage.Format_RGB888)
+            if(self.plot.shape[:2] != (391, 400)):
+                import cv2
+                self.plot = cv2.resize(self.plot, (400, 391))
+            image = QtGui.QImage(self.plot.data, self.plot.shape[1], self.plot.shape[0], 
+                                 3 * self.plot.shape[1], QtGui.QImage.Format_RGB888)
             self.pixmap = QtGui.QPixmap.fromImage(image)
             
             self.height = self.pixmap.height()
             self.width = self.pixmap.width()
-            self.plotWidget = QLabel(self)
             self.plotWidget.setPixmap(self.pixmap)
         
         
 
-